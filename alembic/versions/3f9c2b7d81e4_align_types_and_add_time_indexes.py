@@ -0,0 +1,113 @@
+"""Align column types with the ORM models and add (zone_id, timestamp) indexes
+
+Revision ID: 3f9c2b7d81e4
+Revises: 747264af12c9
+Create Date: 2025-08-12 09:14:22.518301
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = '3f9c2b7d81e4'
+down_revision: Union[str, Sequence[str], None] = '747264af12c9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Tables whose zone id column changes from String to Integer
+ZONE_ID_COLUMNS = (('zones', 'id'), ('sensor_readings', 'zone_id'), ('pump_logs', 'zone_id'))
+
+
+def _check_zone_ids() -> None:
+    """Refuse to upgrade if a zone id would not survive the cast to INTEGER."""
+    # A plain CAST turns 'greenhouse-1' into 0 and merges unrelated zones
+    connection = op.get_bind()
+    for table, column in ZONE_ID_COLUMNS:
+        bad = connection.execute(sa.text(
+            f"SELECT DISTINCT {column} FROM {table} "
+            f"WHERE {column} IS NULL OR trim({column}) = '' "
+            f"OR trim({column}) GLOB '*[^0-9]*' LIMIT 10"
+        )).scalars().all()
+        if bad:
+            raise RuntimeError(
+                f"Cannot convert {table}.{column} to INTEGER, non-numeric values: {bad!r}. "
+                "Renumber these zones before upgrading."
+            )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    _check_zone_ids()
+
+    # SQLite cannot ALTER COLUMN, so every type change goes through batch mode
+    # (copy into a temporary table with the new definition and swap it in).
+    with op.batch_alter_table('zones', recreate='always') as batch_op:
+        batch_op.alter_column('id', existing_type=sa.String(), type_=sa.Integer(),
+                              existing_nullable=False, autoincrement=True)
+        batch_op.alter_column('name', existing_type=sa.String(), nullable=False)
+        batch_op.add_column(sa.Column('created_at', sa.DateTime(), nullable=True))
+        batch_op.add_column(sa.Column('last_watered', sa.DateTime(), nullable=True))
+
+    op.create_table('plants',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('zone_id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(), nullable=False),
+    sa.Column('plant_type', sa.String(), nullable=False),
+    sa.Column('planting_date', sa.DateTime(), nullable=True),
+    sa.Column('notes', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+
+    with op.batch_alter_table('sensor_readings', recreate='always') as batch_op:
+        batch_op.alter_column('zone_id', existing_type=sa.String(), type_=sa.Integer(),
+                              nullable=False)
+        batch_op.create_index('ix_sensor_readings_zone_id_timestamp', ['zone_id', 'timestamp'])
+        batch_op.create_index('ix_sensor_readings_timestamp', ['timestamp'])
+
+    with op.batch_alter_table('pump_logs', recreate='always') as batch_op:
+        batch_op.alter_column('zone_id', existing_type=sa.String(), type_=sa.Integer(),
+                              nullable=False)
+        batch_op.alter_column('status', existing_type=sa.Boolean(), type_=sa.String())
+        batch_op.create_index('ix_pump_logs_zone_id_timestamp', ['zone_id', 'timestamp'])
+        batch_op.create_index('ix_pump_logs_timestamp', ['timestamp'])
+
+    # The copy casts booleans to '1'/'0' (or 'true'/'false'); the models expect "ON"/"OFF"
+    op.execute(
+        "UPDATE pump_logs SET status = CASE "
+        "WHEN lower(status) IN ('1', 'true') THEN 'ON' "
+        "WHEN lower(status) IN ('0', 'false') THEN 'OFF' "
+        "ELSE status END"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Turn "ON"/"OFF" back into values the Boolean cast understands
+    op.execute(
+        "UPDATE pump_logs SET status = CASE status "
+        "WHEN 'ON' THEN '1' WHEN 'OFF' THEN '0' ELSE NULL END"
+    )
+    with op.batch_alter_table('pump_logs', recreate='always') as batch_op:
+        batch_op.drop_index('ix_pump_logs_timestamp')
+        batch_op.drop_index('ix_pump_logs_zone_id_timestamp')
+        batch_op.alter_column('status', existing_type=sa.String(), type_=sa.Boolean())
+        batch_op.alter_column('zone_id', existing_type=sa.Integer(), type_=sa.String(),
+                              nullable=True)
+
+    with op.batch_alter_table('sensor_readings', recreate='always') as batch_op:
+        batch_op.drop_index('ix_sensor_readings_timestamp')
+        batch_op.drop_index('ix_sensor_readings_zone_id_timestamp')
+        batch_op.alter_column('zone_id', existing_type=sa.Integer(), type_=sa.String(),
+                              nullable=True)
+
+    op.drop_table('plants')
+
+    with op.batch_alter_table('zones', recreate='always') as batch_op:
+        batch_op.drop_column('last_watered')
+        batch_op.drop_column('created_at')
+        batch_op.alter_column('name', existing_type=sa.String(), nullable=True)
+        batch_op.alter_column('id', existing_type=sa.Integer(), type_=sa.String(),
+                              existing_nullable=False)
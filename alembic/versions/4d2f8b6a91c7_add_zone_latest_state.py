@@ -0,0 +1,38 @@
+"""Add zone_latest_state table for the dashboard read model
+
+Revision ID: 4d2f8b6a91c7
+Revises: e7b14d9a3c60
+Create Date: 2025-09-08 10:12:36.418205
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = '4d2f8b6a91c7'
+down_revision: Union[str, Sequence[str], None] = 'e7b14d9a3c60'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('zone_latest_state',
+    sa.Column('zone_id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('moisture', sa.Float(), nullable=True),
+    sa.Column('ph', sa.Float(), nullable=True),
+    sa.Column('reading_at', sa.DateTime(), nullable=True),
+    sa.Column('pump_on', sa.Boolean(), nullable=False),
+    sa.Column('last_watered', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('zone_id')
+    )
+    # Existing readings and pump states are copied in afterwards with
+    # smart_gardening.db.database.rebuild_zone_latest_state().
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('zone_latest_state')
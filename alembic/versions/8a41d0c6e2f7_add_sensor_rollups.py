@@ -0,0 +1,43 @@
+"""Add sensor_rollups table for 1m/1h/1d moisture and pH aggregates
+
+Revision ID: 8a41d0c6e2f7
+Revises: 3f9c2b7d81e4
+Create Date: 2025-08-19 10:02:47.163920
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = '8a41d0c6e2f7'
+down_revision: Union[str, Sequence[str], None] = '3f9c2b7d81e4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('sensor_rollups',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('resolution', sa.Integer(), nullable=False),
+    sa.Column('zone_id', sa.Integer(), nullable=False),
+    sa.Column('bucket_start', sa.DateTime(), nullable=False),
+    sa.Column('count', sa.Integer(), nullable=False),
+    sa.Column('moisture_min', sa.Float(), nullable=True),
+    sa.Column('moisture_max', sa.Float(), nullable=True),
+    sa.Column('moisture_sum', sa.Float(), nullable=True),
+    sa.Column('ph_min', sa.Float(), nullable=True),
+    sa.Column('ph_max', sa.Float(), nullable=True),
+    sa.Column('ph_sum', sa.Float(), nullable=True),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('resolution', 'zone_id', 'bucket_start', name='uq_sensor_rollups_bucket')
+    )
+    # Existing readings are folded in afterwards with
+    # smart_gardening.db.database.rebuild_rollups().
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('sensor_rollups')
@@ -0,0 +1,27 @@
+"""Index zone_latest_state.updated_at for incremental dashboard refreshes
+
+Revision ID: 9c7e2a5d13f8
+Revises: 4d2f8b6a91c7
+Create Date: 2025-09-10 16:03:51.270448
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = '9c7e2a5d13f8'
+down_revision: Union[str, Sequence[str], None] = '4d2f8b6a91c7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_zone_latest_state_updated_at', 'zone_latest_state', ['updated_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_zone_latest_state_updated_at', table_name='zone_latest_state')
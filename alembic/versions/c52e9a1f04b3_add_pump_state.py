@@ -0,0 +1,34 @@
+"""Add pump_state table for checkpointed controller state
+
+Revision ID: c52e9a1f04b3
+Revises: 8a41d0c6e2f7
+Create Date: 2025-08-26 08:41:09.512774
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = 'c52e9a1f04b3'
+down_revision: Union[str, Sequence[str], None] = '8a41d0c6e2f7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('pump_state',
+    sa.Column('zone_id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('pump_on', sa.Boolean(), nullable=False),
+    sa.Column('pump_start', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('zone_id')
+    )
+    # Zones without a row start with their pump off, as before.
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('pump_state')
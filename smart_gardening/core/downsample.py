@@ -0,0 +1,69 @@
+"""
+Min/max downsampling of time series for charts.
+
+A chart can only show about one point per pixel column, so drawing a year
+of readings means drawing far more points than the chart has room for.
+``minmax_downsample`` splits the time range into equal-width buckets and
+keeps, per bucket, the sample with the lowest low and the one with the
+highest high, in time order. A dry spell or a pump burst is never averaged
+away, and the output size depends only on the bucket count, not on how
+many readings the range holds.
+"""
+
+import numpy as np
+
+
+def minmax_downsample(times, low, high=None, buckets=400):
+    """
+    Reduce a series to at most two points per time bucket.
+
+    :param times: Sample times as a sorted 1-D array (numbers or datetime64)
+    :param low: Value of each sample, or its minimum for pre-aggregated samples
+    :param high: Maximum of each sample for pre-aggregated samples; defaults to ``low``
+    :param buckets: Number of equal-width time buckets (about half the chart width in pixels)
+    :return: (times, values) arrays holding each bucket's minimum and maximum in time order;
+        samples whose value is NaN are dropped
+    """
+    times = np.asarray(times)
+    low = np.asarray(low, dtype=float)
+    aggregated = high is not None
+    high = np.asarray(high, dtype=float) if aggregated else low
+
+    valid = ~(np.isnan(low) | np.isnan(high))
+    times, low, high = times[valid], low[valid], high[valid]
+    if not len(times) or (len(times) <= 2 * buckets and not aggregated):
+        # Already within budget
+        return times, low
+
+    ticks = times.astype('datetime64[us]').astype(np.int64) if times.dtype.kind == 'M' else times.astype(float)
+    span = ticks[-1] - ticks[0]
+    if span > 0:
+        bucket = np.minimum(((ticks - ticks[0]) * buckets // span).astype(np.int64), buckets - 1)
+    else:
+        bucket = np.zeros(len(ticks), dtype=np.int64)
+
+    # First row of every non-empty bucket; times are sorted, so buckets are contiguous
+    starts = np.flatnonzero(np.r_[True, bucket[1:] != bucket[:-1]])
+    lowest = starts + _argreduce(np.minimum, low, starts)
+    highest = starts + _argreduce(np.maximum, high, starts)
+
+    # Emit the two extremes of each bucket in time order; a row holding both
+    # (a single aggregate, or a raw sample) gives its low then its high
+    high_first = highest < lowest
+    rows = np.column_stack([np.minimum(lowest, highest), np.maximum(lowest, highest)]).ravel()
+    is_high = np.column_stack([high_first, ~high_first]).ravel()
+    values = np.where(is_high, high[rows], low[rows])
+    # Drop the second point of a pair that repeats the first
+    repeat = np.zeros(len(rows), dtype=bool)
+    repeat[1::2] = (rows[1::2] == rows[::2]) & (values[1::2] == values[::2])
+    return times[rows[~repeat]], values[~repeat]
+
+
+def _argreduce(reduce, values, starts):
+    """Offset of each group's extreme from the group start, groups beginning at ``starts``"""
+    extreme = reduce.reduceat(values, starts)
+    group = np.repeat(np.arange(len(starts)), np.diff(np.r_[starts, len(values)]))
+    hits = np.flatnonzero(values == extreme[group])
+    # First hit per group
+    first = hits[np.r_[True, group[hits][1:] != group[hits][:-1]]]
+    return first - starts
@@ -0,0 +1,126 @@
+"""
+Per-zone sensor polling schedule.
+
+Each zone has its own next-due time, kept in a binary heap so the next
+zones to read are found in O(log n) without scanning every zone. The poll
+interval depends on the zone's state:
+
+- active: the pump is running, so moisture is changing quickly
+- near: moisture is within ``near_margin`` of the threshold (or below it)
+- idle: everything else
+
+A zone's next due time is computed from its previous due time, so polling
+does not drift; a zone that fell more than one interval behind skips the
+missed reads instead of being read back to back.
+"""
+
+import heapq
+
+import numpy as np
+
+
+class PollScheduler:
+    """Heap of (due time, row) for the zones of a ZoneTable."""
+
+    def __init__(self, size, idle_interval, near_interval, active_interval, near_margin=5.0, start=0.0):
+        """
+        :param size: Number of zones (rows of the ZoneTable)
+        :param idle_interval: Seconds between reads of a zone far from its threshold
+        :param near_interval: Seconds between reads of a zone near or below its threshold
+        :param active_interval: Seconds between reads of a zone whose pump is running
+        :param near_margin: Moisture percentage points above threshold that count as near
+        :param start: Time every zone is first due
+        """
+        self.idle_interval = idle_interval
+        self.near_interval = near_interval
+        self.active_interval = active_interval
+        self.near_margin = near_margin
+
+        self.due = np.full(size, start, dtype=np.float64)
+        # Bumped when a zone is rescheduled early; heap entries with an old generation are stale
+        self._generation = np.zeros(size, dtype=np.int64)
+        self._heap = [(start, row, 0) for row in range(size)]
+        self._pending = np.ones(size, dtype=bool)
+        self.missed = 0
+
+    def __len__(self):
+        """Number of zones currently waiting in the heap"""
+        return int(self._pending.sum())
+
+    def intervals(self, table, rows):
+        """Poll interval for each of ``rows`` given the table's current state."""
+        near = table.moisture[rows] - table.moisture_threshold[rows] <= self.near_margin
+        return np.where(table.pump_on[rows], self.active_interval,
+                        np.where(near, self.near_interval, self.idle_interval))
+
+    def next_due(self):
+        """Earliest due time of a waiting zone, or None if none are waiting."""
+        heap = self._heap
+        while heap and heap[0][2] != self._generation[heap[0][1]]:
+            heapq.heappop(heap)
+        return heap[0][0] if heap else None
+
+    def pop_due(self, now):
+        """Remove and return the rows due at or before ``now``."""
+        heap = self._heap
+        rows = []
+        while heap and heap[0][0] <= now:
+            _, row, generation = heapq.heappop(heap)
+            if generation == self._generation[row]:
+                rows.append(row)
+        rows = np.array(rows, dtype=np.intp)
+        self._pending[rows] = False
+        return rows
+
+    def reschedule(self, table, rows, now):
+        """
+        Put read zones back in the heap at their previous due time plus their interval.
+
+        :param table: ZoneTable with the readings just taken
+        :param rows: Rows returned by pop_due
+        :param now: Current time
+        """
+        if len(rows) == 0:
+            return
+        intervals = self.intervals(table, rows)
+        due = self.due[rows] + intervals
+        late = due <= now
+        self.missed += int(late.sum())
+        due[late] = now + intervals[late]
+        self._push(rows, due)
+
+    def expedite(self, table, rows, now):
+        """
+        Move waiting zones forward when their state calls for faster polling.
+
+        Used after a pump is switched, so a zone that was just started is
+        read at the active interval instead of waiting for its idle slot.
+        """
+        rows = np.asarray(rows, dtype=np.intp)
+        rows = rows[self._pending[rows]]
+        due = now + self.intervals(table, rows)
+        earlier = due < self.due[rows]
+        self._push(rows[earlier], due[earlier])
+
+    def resized(self, keep, size, start):
+        """
+        Schedule for a table rebuilt after zones were added or removed.
+
+        :param keep: Rows of this schedule that became rows 0..len(keep)-1 of the new table
+        :param size: Rows in the new table; rows after the kept ones are new zones
+        :param start: Time the new zones are first due
+        :return: New PollScheduler; kept zones stay due when they were
+        """
+        scheduler = PollScheduler(size, self.idle_interval, self.near_interval, self.active_interval,
+                                  self.near_margin, start=start)
+        scheduler.missed = self.missed
+        keep = np.asarray(keep, dtype=np.intp)
+        scheduler._push(np.arange(len(keep), dtype=np.intp), self.due[keep])
+        return scheduler
+
+    def _push(self, rows, due):
+        self._generation[rows] += 1
+        self.due[rows] = due
+        self._pending[rows] = True
+        for row, when, generation in zip(rows.tolist(), due.tolist(), self._generation[rows].tolist()):
+            heapq.heappush(self._heap, (when, row, generation))
@@ -1,7 +1,44 @@
 from datetime import datetime, timedelta
 
+
+class _TableField:
+    """
+    Zone attribute that lives in a ZoneTable row once the zone is bound to one.
+
+    Unbound zones keep the value on the instance as before.
+    """
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, zone, owner=None):
+        if zone is None:
+            return self
+        table = zone.__dict__.get('_table')
+        if table is None:
+            return zone.__dict__.get(self.name)
+        return table.get_value(self.name, zone.__dict__['_row'])
+
+    def __set__(self, zone, value):
+        table = zone.__dict__.get('_table')
+        if table is None:
+            zone.__dict__[self.name] = value
+        else:
+            table.set_value(self.name, zone.__dict__['_row'], value)
+
+
 class Zone:
-    def __init__(self, id=None, name=None, plant_type=None, moisture_threshold=30, moisture=50, ph_range=(6.0, 7.5), ph=6.5, pump_status="OFF"):
+    # Per-zone state the control loop reads every tick; see core/zone_table.py
+    moisture_threshold = _TableField()
+    ph_range = _TableField()
+    moisture = _TableField()
+    ph = _TableField()
+    pump_status = _TableField()
+    pump_start_time = _TableField()
+    last_watering_time = _TableField()
+    max_runtime_minutes = _TableField()
+
+    def __init__(self, id=None, name=None, plant_type=None, moisture_threshold=30, moisture=50, ph_range=(6.0, 7.5), ph=6.5, pump_status="OFF", clock=None):
         self.id = id
         self.name = name
         self.plant_type = plant_type
@@ -11,9 +48,22 @@ class Zone:
         self.ph = ph
         self.pump_status = pump_status
         self.plants = []
+        self.reading_time = None  # When moisture/ph were measured, for zones read from the database
         self.last_watering_time = None
         self.pump_start_time = None
         self.max_runtime_minutes = 30  #in minutes
+        self.clock = clock  # None reads the wall clock
+
+    @property
+    def table(self):
+        """ZoneTable this zone is a view into, or None"""
+        return self.__dict__.get('_table')
+
+    def _now(self, now):
+        """Time to use for a check: the caller's tick time, else the zone's clock"""
+        if now is not None:
+            return now
+        return self.clock.now() if self.clock is not None else datetime.now()
 
     def update_readings(self, moisture, ph):
         self.moisture = moisture
@@ -23,39 +73,39 @@ class Zone:
         """Check if zone needs watering based on moisture threshold"""
         return self.moisture is not None and self.moisture < self.moisture_threshold
     
-    def can_water(self):
+    def can_water(self, now=None):
         """Check if zone can be watered (no recent watering > 2 hours)"""
         if self.last_watering_time is None:
             return True
-        time_since_last_watering = datetime.now() - self.last_watering_time
+        time_since_last_watering = self._now(now) - self.last_watering_time
         return time_since_last_watering > timedelta(hours=2)
     
-    def should_activate_pump(self):
+    def should_activate_pump(self, now=None):
         """Check if pump should be activated"""
-        return self.needs_watering() and self.can_water()
+        return self.needs_watering() and self.can_water(now)
     
-    def should_deactivate_pump(self):
+    def should_deactivate_pump(self, now=None):
         """Check if pump should be deactivated"""
         moisture_sufficient = self.moisture >= self.moisture_threshold
-        max_runtime_reached = self.is_max_runtime_reached()
+        max_runtime_reached = self.is_max_runtime_reached(now)
         return moisture_sufficient or max_runtime_reached
     
-    def is_max_runtime_reached(self):
+    def is_max_runtime_reached(self, now=None):
         """Check if pump has been running for maximum allowed time"""
         if self.pump_start_time is None:
             return False
-        runtime = datetime.now() - self.pump_start_time
+        runtime = self._now(now) - self.pump_start_time
         return runtime > timedelta(minutes=self.max_runtime_minutes)
     
-    def start_pump(self):
+    def start_pump(self, now=None):
         """Start the pump and record start time"""
         self.pump_status = True
-        self.pump_start_time = datetime.now()
+        self.pump_start_time = self._now(now)
     
-    def stop_pump(self):
+    def stop_pump(self, now=None):
         """Stop the pump and record watering time"""
         self.pump_status = False
-        self.last_watering_time = datetime.now()
+        self.last_watering_time = self._now(now)
         self.pump_start_time = None
 
     def ph_out_of_range(self):
@@ -0,0 +1,200 @@
+"""
+Struct-of-arrays representation of every zone for the control loop.
+
+A ZoneTable keeps the state the automation logic reads each tick in NumPy
+arrays, one element per zone, so activate/deactivate/pH-alarm decisions
+for all zones are computed in a single vectorized pass with one shared
+timestamp. Times are stored as float epoch seconds with NaN for "never".
+
+Zone objects bound to a table become thin views over their row: reading
+or assigning ``zone.moisture`` goes straight to ``table.moisture[row]``,
+so existing per-zone code keeps working alongside the vectorized path.
+"""
+
+from datetime import datetime
+
+import numpy as np
+
+from smart_gardening.core.clock import system_clock
+from smart_gardening.core.zone import Zone
+
+# Minimum time between two waterings of the same zone (Zone.can_water)
+WATERING_COOLDOWN_SECONDS = 2 * 3600
+
+
+def _to_epoch(value):
+    """Convert a datetime (or None) to float epoch seconds (or NaN)."""
+    if value is None:
+        return np.nan
+    if isinstance(value, datetime):
+        return value.timestamp()
+    return float(value)
+
+
+def _from_epoch(value):
+    """Convert float epoch seconds (or NaN) back to a naive local datetime."""
+    if np.isnan(value):
+        return None
+    return datetime.fromtimestamp(value)
+
+
+def _to_float(value):
+    return np.nan if value is None else float(value)
+
+
+def _from_float(value):
+    return None if np.isnan(value) else float(value)
+
+
+def pump_is_on(status):
+    """Normalise a pump status; zones created with the string defaults use "ON"/"OFF"."""
+    return status == "ON" if isinstance(status, str) else bool(status)
+
+
+class ZoneTable:
+    """NumPy-backed state for a fixed set of zones."""
+
+    def __init__(self, size, moisture_threshold=30, ph_range=(6.0, 7.5), max_runtime_minutes=30, flow_rate=10.0,
+                 clock=None):
+        self.clock = clock if clock is not None else system_clock
+        self.moisture_threshold = np.full(size, moisture_threshold, dtype=np.float64)
+        self.ph_min = np.full(size, ph_range[0], dtype=np.float64)
+        self.ph_max = np.full(size, ph_range[1], dtype=np.float64)
+        self.moisture = np.full(size, np.nan, dtype=np.float64)
+        self.ph = np.full(size, np.nan, dtype=np.float64)
+        self.pump_on = np.zeros(size, dtype=bool)
+        self.pump_start = np.full(size, np.nan, dtype=np.float64)
+        self.last_watered = np.full(size, np.nan, dtype=np.float64)
+        self.max_runtime = np.full(size, max_runtime_minutes * 60.0, dtype=np.float64)
+        # Litres per minute drawn by each zone's pump (see core/budget.py)
+        self.flow_rate = np.full(size, flow_rate, dtype=np.float64)
+        self.ids = np.full(size, None, dtype=object)
+        self._zones = [None] * size
+
+    @classmethod
+    def from_zones(cls, zones, clock=None):
+        """
+        Build a table from existing Zone objects and bind each zone to its row.
+
+        Args:
+            zones: List of Zone objects; row i holds zones[i]
+            clock: Clock used when a mask is computed without ``now``
+
+        Returns:
+            ZoneTable: The new table
+        """
+        zones = list(zones)
+        table = cls(len(zones), clock=clock)
+        for row, zone in enumerate(zones):
+            table.ids[row] = zone.id
+            for name in ('moisture_threshold', 'ph_range', 'moisture', 'ph', 'pump_status',
+                         'pump_start_time', 'last_watering_time', 'max_runtime_minutes'):
+                table.set_value(name, row, getattr(zone, name))
+            zone.__dict__['_table'] = table
+            zone.__dict__['_row'] = row
+            table._zones[row] = zone
+        return table
+
+    def __len__(self):
+        return len(self.moisture)
+
+    def zone(self, row):
+        """Return the Zone view for a row, creating a bare one if needed."""
+        zone = self._zones[row]
+        if zone is None:
+            zone = Zone.__new__(Zone)
+            zone.__dict__.update(id=self.ids[row], name=None, plant_type=None, plants=[],
+                                 clock=None, _table=self, _row=row)
+            self._zones[row] = zone
+        return zone
+
+    def __iter__(self):
+        return (self.zone(row) for row in range(len(self)))
+
+    # Row access used by the Zone descriptors
+
+    def get_value(self, name, row):
+        if name == 'moisture_threshold':
+            return float(self.moisture_threshold[row])
+        if name == 'ph_range':
+            return (float(self.ph_min[row]), float(self.ph_max[row]))
+        if name == 'moisture':
+            return _from_float(self.moisture[row])
+        if name == 'ph':
+            return _from_float(self.ph[row])
+        if name == 'pump_status':
+            return bool(self.pump_on[row])
+        if name == 'pump_start_time':
+            return _from_epoch(self.pump_start[row])
+        if name == 'last_watering_time':
+            return _from_epoch(self.last_watered[row])
+        if name == 'max_runtime_minutes':
+            return self.max_runtime[row] / 60.0
+        raise AttributeError(name)
+
+    def set_value(self, name, row, value):
+        if name == 'moisture_threshold':
+            self.moisture_threshold[row] = value
+        elif name == 'ph_range':
+            self.ph_min[row], self.ph_max[row] = value
+        elif name == 'moisture':
+            self.moisture[row] = _to_float(value)
+        elif name == 'ph':
+            self.ph[row] = _to_float(value)
+        elif name == 'pump_status':
+            self.pump_on[row] = pump_is_on(value)
+        elif name == 'pump_start_time':
+            self.pump_start[row] = _to_epoch(value)
+        elif name == 'last_watering_time':
+            self.last_watered[row] = _to_epoch(value)
+        elif name == 'max_runtime_minutes':
+            self.max_runtime[row] = value * 60.0
+        else:
+            raise AttributeError(name)
+
+    def _resolve_now(self, now):
+        """Accept None (the table's clock), a datetime or epoch seconds."""
+        if now is None:
+            return self.clock.time()
+        return _to_epoch(now)
+
+    # Vectorized control logic; each mask matches the Zone method of the same name
+
+    def update_readings(self, moisture, ph):
+        """Replace moisture and pH for every zone at once."""
+        self.moisture[:] = moisture
+        self.ph[:] = ph
+
+    def needs_watering(self):
+        return self.moisture < self.moisture_threshold
+
+    def can_water(self, now=None):
+        now = self._resolve_now(now)
+        return np.isnan(self.last_watered) | (now - self.last_watered > WATERING_COOLDOWN_SECONDS)
+
+    def is_max_runtime_reached(self, now=None):
+        now = self._resolve_now(now)
+        return now - self.pump_start > self.max_runtime
+
+    def ph_out_of_range(self):
+        return (self.ph < self.ph_min) | (self.ph > self.ph_max)
+
+    def activate_mask(self, now=None):
+        """Zones whose pump is off and should be started."""
+        return ~self.pump_on & self.needs_watering() & self.can_water(now)
+
+    def deactivate_mask(self, now=None):
+        """Zones whose pump is on and should be stopped."""
+        moisture_sufficient = self.moisture >= self.moisture_threshold
+        return self.pump_on & (moisture_sufficient | self.is_max_runtime_reached(now))
+
+    def start_pumps(self, mask, now=None):
+        """Start the pumps selected by ``mask`` and record the start time."""
+        self.pump_on[mask] = True
+        self.pump_start[mask] = self._resolve_now(now)
+
+    def stop_pumps(self, mask, now=None):
+        """Stop the pumps selected by ``mask`` and record the watering time."""
+        self.pump_on[mask] = False
+        self.last_watered[mask] = self._resolve_now(now)
+        self.pump_start[mask] = np.nan
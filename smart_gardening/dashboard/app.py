@@ -4,19 +4,18 @@ Smart Gardening Dashboard - Monitor and manage your garden zones
 
 import sys
 import os
-import datetime
-import time
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
 
 import streamlit as st
-from smart_gardening.simulator.simulator import SensorSimulator, get_default_zones
-from smart_gardening.actuators.pump import control_pump
-from smart_gardening.config import ZONES, MOISTURE_THRESHOLDS, PH_RANGES
-from smart_gardening.core.zone import Zone
+from smart_gardening.core.zone_table import pump_is_on
 
-from smart_gardening.db.database import init_db, session, SensorReading, ZoneModel, PlantModel
+from smart_gardening.db.database import init_db
+from smart_gardening.dashboard.data import latest_states, load_zones
 init_db()
 
+# Seconds between refreshes of the zone metrics
+REFRESH_INTERVAL = 30
+
 st.set_page_config(
     page_title="Home - Smart Gardening Dashboard", 
     page_icon="🌱", 
@@ -24,10 +23,6 @@ st.set_page_config(
     initial_sidebar_state="collapsed"
 )
 
-st.markdown("""
-    <meta http-equiv="refresh" content="30">
-""", unsafe_allow_html=True)
-
 st.markdown("""
     <link rel="stylesheet" href="https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.4.0/css/all.min.css">
     <style>
@@ -304,52 +299,42 @@ with btn_col2:
     if st.button("Add Plant to Zone", key="add_plant_btn"):
         st.switch_page("pages/add_plant.py")
 
-def load_zones_from_db():
-    """Load zones from database and convert to Zone objects"""
-    db_zones = session.query(ZoneModel).all()
-    zones = []
-    
-    for db_zone in db_zones:
-        zone = Zone.from_db_model(db_zone)
-        plants = session.query(PlantModel).filter(PlantModel.zone_id == db_zone.id).all()
-        zone.plants = [
-            {
-                'name': plant.name,
-                'type': plant.plant_type,
-                'planting_date': plant.planting_date.strftime('%Y-%m-%d') if plant.planting_date else None,
-                'notes': plant.notes
-            }
-            for plant in plants
-        ]
-        zones.append(zone)
-    
-    return zones
-
+@st.fragment(run_every=REFRESH_INTERVAL)
 def main_dashboard():
-    """Main dashboard function that displays the garden zones"""
-    # Initialize zones if not in session state
-    if "zones" not in st.session_state:
-        db_zones = load_zones_from_db()
-        if not db_zones:
-            default_zones = get_default_zones()
-            for zone in default_zones:
-                db_zone = ZoneModel(**zone.to_dict())
-                session.add(db_zone)
-                session.commit()
-                zone.id = db_zone.id
-            db_zones = load_zones_from_db()
-        st.session_state.zones = db_zones
+    """
+    Main dashboard function that displays the garden zones.
+
+    The dashboard only reads: the collector (``python -m smart_gardening.main``)
+    takes the readings, drives the pumps and records both, so reruns and
+    extra browser tabs never add readings or switch pumps. This fragment
+    reruns on its own every ``REFRESH_INTERVAL`` seconds, leaving the rest
+    of the page alone, and only fetches zone states changed since its last run.
+    """
+    zones = load_zones()
+    if not zones:
+        st.info("No zones yet. Add a zone, or run `python smart_gardening/init_database.py` to create the default zones.")
+        return
 
-    zones = st.session_state.zones
-    simulator = SensorSimulator(zones)
-    simulator.simulate()
+    states = latest_states()
+    measured = {}
+    for zone in zones:
+        state = states.get(zone.id)
+        if state is not None:
+            zone.update_readings(state['moisture'], state['ph'])
+            zone.pump_status = state['pump_on']
+            measured[zone.id] = state['reading_at']
 
     st.markdown("### Garden Zones Overview", unsafe_allow_html=True)
     zone_summary_cols = st.columns(len(zones))
     for i, zone in enumerate(zones):
         with zone_summary_cols[i]:
-            moisture_status = "🟢 Good" if zone.moisture >= MOISTURE_THRESHOLDS.get(zone.id, 30) else "🔴 Low"
-            if zone.ph_out_of_range():
+            if zone.moisture is None:
+                moisture_status = "⚪ No data"
+            else:
+                moisture_status = "🔴 Low" if zone.needs_watering() else "🟢 Good"
+            if zone.ph is None:
+                ph_status = "⚪ No data"
+            elif zone.ph_out_of_range():
                 if zone.ph < zone.ph_range[0]:
                     ph_status = "🔴 Too Acidic"
                 else:
@@ -361,7 +346,8 @@ def main_dashboard():
             <strong>Zone {zone.id} - {zone.name}</strong><br>
             Plant Type: {zone.plant_type}<br>
             Moisture: {moisture_status} <br>
-            pH: {ph_status}
+            pH: {ph_status}<br>
+            Pump: {"ON" if pump_is_on(zone.pump_status) else "OFF"}
             </div>
             """, unsafe_allow_html=True)
 
@@ -372,60 +358,20 @@ def main_dashboard():
     cols = st.columns(len(zones))
 
     for col, zone in zip(cols, zones):
-        moisture = zone.moisture
-        ph = zone.ph
-        threshold = MOISTURE_THRESHOLDS.get(zone.id, 30)
-        pump_status = zone.pump_status
-
-        if moisture < threshold:
-            control_pump(zone.id, True)
-            pump_status = "ON"
-            zone.last_watered = datetime.datetime.now()
-            db_zone = session.query(ZoneModel).filter(ZoneModel.id == zone.id).first()
-            if db_zone:
-                db_zone.last_watered = zone.last_watered
-                session.commit()
-        else:
-            control_pump(zone.id, False)
-            pump_status = "OFF"
-
-        pump_color = "green" if pump_status == "ON" else "red"
-
         with col:
             if st.button(f"Zone {zone.name}", key=f"zone_{zone.id}_header_btn"):
                 st.session_state.selected_zone_id = zone.id
                 st.switch_page("pages/zone_details.py")
             
-            st.metric(label="Moisture Level (%)", value=moisture)
-            st.metric(label="pH Level", value=ph, delta=None)
+            st.metric(label="Moisture Level (%)", value="—" if zone.moisture is None else round(zone.moisture, 1))
+            st.metric(label="pH Level", value="—" if zone.ph is None else round(zone.ph, 2), delta=None)
+            if measured.get(zone.id) is not None:
+                st.caption(f"Measured {measured[zone.id].strftime('%Y-%m-%d %H:%M:%S')} UTC")
 
     st.markdown('</div>', unsafe_allow_html=True)
 
-    # Save sensor readings to database
-    for zone in zones:
-        reading = SensorReading(
-            zone_id=zone.id,
-            moisture=zone.moisture,
-            ph=zone.ph
-        )
-        session.add(reading)
-        session.commit()
-
-# Initialize the dashboard
-if "zones" not in st.session_state:
-    db_zones = load_zones_from_db()
-    if not db_zones:
-        default_zones = get_default_zones()
-        for zone in default_zones:
-            db_zone = ZoneModel(**zone.to_dict())
-            session.add(db_zone)
-            session.commit()
-            zone.id = db_zone.id
-        db_zones = load_zones_from_db()
-    st.session_state.zones = db_zones
-
 # Run the main dashboard
 main_dashboard()
 
 # Auto-refresh indicator
-st.markdown("🔄 **Dashboard refreshes every 30 seconds automatically**")
\ No newline at end of file
+st.markdown(f"🔄 **Zone metrics refresh every {REFRESH_INTERVAL} seconds automatically**")
@@ -0,0 +1,243 @@
+"""
+Cached data access for the dashboard pages.
+
+Every Streamlit rerun used to query the database again for the same zones,
+plants and history. The loaders here keep their results in ``st.cache_data``
+for ``DASHBOARD_CACHE_TTL`` seconds, keyed by zone id and time range:
+
+- zone configuration and plants are also keyed by a version counter that
+  ``add_zone``, ``add_plant`` and ``remove_plant`` bump after their commit,
+  so a change made in the dashboard shows up on the next rerun instead of
+  after the TTL
+- readings, pump state and history are written by the collector, so they
+  only expire with the TTL
+- the main dashboard's live metrics skip the cache: each browser session
+  keeps a ZoneStateFeed that asks only for zone_latest_state rows changed
+  since its previous refresh
+
+The counter lives in this Streamlit server (``st.cache_resource``); changes
+made by other processes, such as ``init_database.py``, appear once the TTL
+has passed.
+"""
+
+import datetime
+import threading
+
+import streamlit as st
+
+from smart_gardening.config import Config
+from smart_gardening.db.database import (
+    PlantModel, ZoneLatestState, ZoneModel, get_chart_series, session_scope,
+    remove_plant as delete_plant,
+)
+from smart_gardening.db.repository import get_zone_states, get_zone_with_plants, load_dashboard_zones
+
+CACHE_TTL = Config().DASHBOARD_CACHE_TTL
+
+# Batches are stamped before they commit, so a refresh re-reads this far back
+# to catch one that committed after a newer batch was already seen
+STATE_OVERLAP = datetime.timedelta(seconds=5)
+
+
+class _Version:
+    """Counter shared by every session of this Streamlit server"""
+
+    def __init__(self):
+        self.value = 0
+        self._lock = threading.Lock()
+
+    def bump(self):
+        with self._lock:
+            self.value += 1
+
+
+@st.cache_resource
+def _version():
+    return _Version()
+
+
+def data_version():
+    """Current version of the zone and plant data written through this module"""
+    return _version().value
+
+
+def bump_version():
+    """Invalidate every cached zone and plant lookup"""
+    _version().bump()
+
+
+def _plant_record(plant):
+    return {
+        'id': plant.id,
+        'name': plant.name,
+        'plant_type': plant.plant_type,
+        'planting_date': plant.planting_date,
+        'notes': plant.notes,
+    }
+
+
+def _zone_record(db_zone):
+    return {
+        'id': db_zone.id,
+        'name': db_zone.name,
+        'plant_type': db_zone.plant_type,
+        'moisture_threshold': db_zone.moisture_threshold,
+        'ph_min': db_zone.ph_min,
+        'ph_max': db_zone.ph_max,
+        'created_at': db_zone.created_at,
+        'last_watered': db_zone.last_watered,
+        'plants': [_plant_record(plant) for plant in db_zone.plants],
+    }
+
+
+@st.cache_data(ttl=CACHE_TTL, show_spinner=False)
+def _dashboard_zones(version):
+    with session_scope() as db_session:
+        return load_dashboard_zones(db_session)
+
+
+@st.cache_data(ttl=CACHE_TTL, show_spinner=False)
+def _zone(zone_id, version):
+    with session_scope() as db_session:
+        db_zone = get_zone_with_plants(zone_id, db_session)
+        return _zone_record(db_zone) if db_zone is not None else None
+
+
+def _state_record(state):
+    return {
+        'moisture': state.moisture,
+        'ph': state.ph,
+        'reading_at': state.reading_at,
+        'pump_on': state.pump_on,
+        'last_watered': state.last_watered,
+    }
+
+
+@st.cache_data(ttl=CACHE_TTL, show_spinner=False)
+def get_latest_state(zone_id):
+    """
+    Latest reading and pump state the collector wrote for a zone.
+
+    Returns:
+        dict: ``moisture``, ``ph``, ``reading_at``, ``pump_on`` and ``last_watered``,
+        or None if nothing was recorded for the zone yet
+    """
+    with session_scope() as db_session:
+        state = db_session.get(ZoneLatestState, zone_id)
+        return _state_record(state) if state is not None else None
+
+
+class ZoneStateFeed:
+    """Latest state of every zone, kept current with delta queries."""
+
+    def __init__(self):
+        self.states = {}
+        self.seen = None
+
+    def refresh(self):
+        """
+        Fetch the zone_latest_state rows written since the previous refresh.
+
+        Returns:
+            dict: zone id -> state dict as returned by ``get_latest_state``
+        """
+        since = None if self.seen is None else self.seen - STATE_OVERLAP
+        with session_scope() as db_session:
+            for state in get_zone_states(since, db_session):
+                self.states[state.zone_id] = _state_record(state)
+                if state.updated_at is not None and (self.seen is None or state.updated_at > self.seen):
+                    self.seen = state.updated_at
+        return self.states
+
+
+def latest_states():
+    """
+    Latest state of every zone for this browser session.
+
+    The first call loads every row; later calls only fetch rows changed since.
+
+    Returns:
+        dict: zone id -> state dict as returned by ``get_latest_state``
+    """
+    if 'zone_state_feed' not in st.session_state:
+        st.session_state.zone_state_feed = ZoneStateFeed()
+    return st.session_state.zone_state_feed.refresh()
+
+
+@st.cache_data(ttl=CACHE_TTL, show_spinner=False)
+def get_chart(zone_id, days, width=600):
+    """
+    Moisture/pH chart series of a zone over the last ``days`` days.
+
+    Returns:
+        dict: As returned by ``get_chart_series``, at most about ``width`` points per series
+    """
+    with session_scope() as db_session:
+        start = datetime.datetime.utcnow() - datetime.timedelta(days=days)
+        return get_chart_series(zone_id, start=start, width=width, db_session=db_session)
+
+
+def load_zones():
+    """
+    Every zone with its latest state and plants, as Zone objects.
+
+    Returns:
+        list: Zone objects ordered by id (see ``load_dashboard_zones``)
+    """
+    return _dashboard_zones(data_version())
+
+
+def get_zone(zone_id):
+    """
+    Configuration and plants of one zone.
+
+    Returns:
+        dict: Zone columns plus ``plants``, a list of plant dicts, or None if the zone does not exist
+    """
+    return _zone(zone_id, data_version())
+
+
+def add_zone(**fields):
+    """
+    Create a zone from ZoneModel column values.
+
+    Returns:
+        int: Id of the new zone
+    """
+    with session_scope() as db_session:
+        zone = ZoneModel(**fields)
+        db_session.add(zone)
+        db_session.flush()
+        zone_id = zone.id
+    bump_version()
+    return zone_id
+
+
+def add_plant(**fields):
+    """
+    Add a plant to a zone from PlantModel column values.
+
+    Returns:
+        int: Id of the new plant
+    """
+    with session_scope() as db_session:
+        plant = PlantModel(**fields)
+        db_session.add(plant)
+        db_session.flush()
+        plant_id = plant.id
+    bump_version()
+    return plant_id
+
+
+def remove_plant(plant_id):
+    """
+    Remove a plant.
+
+    Returns:
+        bool: True if the plant existed and was removed
+    """
+    with session_scope() as db_session:
+        removed = delete_plant(plant_id, db_session)
+    if removed:
+        bump_version()
+    return removed
@@ -1,9 +1,10 @@
 import sys
 import os
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..')))
 
 import streamlit as st
-from db.database import session, ZoneModel, PlantModel
+from smart_gardening.dashboard.data import add_plant, load_zones
 from datetime import date
 
 # Page configuration
@@ -267,7 +268,7 @@ if st.button("← Back to Dashboard", key="back_to_dashboard"):
 st.markdown("---")
 
 try:
-    zones = session.query(ZoneModel).all()
+    zones = load_zones()
     if not zones:
         st.markdown("""
         <div class="error-message">
@@ -285,11 +286,12 @@ except Exception as e:
 
 st.markdown("### Select Zone", unsafe_allow_html=True)
 zone_options = {f"Zone {zone.id} - {zone.name}": zone.id for zone in zones}
+zones_by_id = {zone.id: zone for zone in zones}
 selected_zone_name = st.selectbox("Choose a zone:", list(zone_options.keys()))
 
 if selected_zone_name:
     selected_zone_id = zone_options[selected_zone_name]
-    selected_zone = session.query(ZoneModel).filter(ZoneModel.id == selected_zone_id).first()
+    selected_zone = zones_by_id[selected_zone_id]
     
     st.markdown(f"""
     <div class="zone-info">
@@ -321,7 +323,7 @@ with st.form("add_plant_form"):
 if submit and selected_zone_name:
     if plant_name and plant_type:
         try:
-            new_plant = PlantModel(
+            add_plant(
                 zone_id=selected_zone_id,
                 name=plant_name,
                 plant_type=plant_type,
@@ -329,9 +331,6 @@ if submit and selected_zone_name:
                 notes=notes
             )
             
-            session.add(new_plant)
-            session.commit()
-            
             st.markdown(f"""
             <div class="success-message">
             <i class="fas fa-check-circle" style="color: #35B925; margin-right: 8px;"></i><strong>Plant added successfully!</strong><br>
@@ -375,15 +374,16 @@ if selected_zone_name:
     st.markdown("### Plants in Selected Zone", unsafe_allow_html=True)
     
     try:
-        existing_plants = session.query(PlantModel).filter(PlantModel.zone_id == selected_zone_id).all()
+        # Reload so a plant added above is listed
+        existing_plants = {zone.id: zone for zone in load_zones()}[selected_zone_id].plants
         
         if existing_plants:
             for plant in existing_plants:
                 st.markdown(f"""
                 <div class="zone-info">
-                <strong>{plant.name}</strong> ({plant.plant_type})<br>
-                <em>Planted: {plant.planting_date}</em>
-                {f'<br><em>Notes: {plant.notes}</em>' if plant.notes else ''}
+                <strong>{plant['name']}</strong> ({plant['type']})<br>
+                <em>Planted: {plant['planting_date']}</em>
+                {f"<br><em>Notes: {plant['notes']}</em>" if plant['notes'] else ''}
                 </div>
                 """, unsafe_allow_html=True)
         else:
@@ -1,10 +1,10 @@
 import sys
 import os
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..')))
 
 import streamlit as st
-from db.database import session, ZoneModel
-from core.zone import Zone
+from smart_gardening.dashboard.data import add_zone
 
 st.set_page_config(
     page_title="Add Zone - Smart Gardening Dashboard",
@@ -280,7 +280,7 @@ with st.form("add_zone_form"):
 if submit:
     if zone_name and plant_type:
         try:
-            new_zone = ZoneModel(
+            add_zone(
                 name=zone_name,
                 plant_type=plant_type,
                 moisture_threshold=moisture_threshold,
@@ -288,9 +288,6 @@ if submit:
                 ph_max=ph_max
             )
             
-            session.add(new_zone)
-            session.commit()
-            
             st.markdown(f"""
             <div class="success-message">
             <i class="fas fa-check-circle" style="color: #35B925; margin-right: 8px;"></i><strong>Zone added successfully!</strong><br>
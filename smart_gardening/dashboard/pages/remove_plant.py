@@ -1,9 +1,10 @@
 import sys
 import os
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..')))
 
 import streamlit as st
-from db.database import session, ZoneModel, remove_plant, get_plant_by_id
+from smart_gardening.dashboard.data import get_zone, remove_plant
 
 st.set_page_config(
     page_title="Remove Plant - Smart Gardening Dashboard",
@@ -17,14 +18,17 @@ if not zone_id or not plant_id:
     st.error("No plant selected for removal.")
     st.stop()
 
-zone = session.query(ZoneModel).filter(ZoneModel.id == int(zone_id)).first()
+zone = get_zone(int(zone_id))
 if not zone:
     st.error("Zone not found.")
     st.stop()
 
-plant = get_plant_by_id(int(plant_id))
+plant = next((plant for plant in zone['plants'] if plant['id'] == int(plant_id)), None)
 if not plant:
-    st.error("Plant not found.")
+    st.error("Plant not found in this zone.")
+    if st.button("← Back to Zone Details"):
+        st.query_params["zone_id"] = str(zone_id)
+        st.switch_page("pages/zone_details.py")
     st.stop()
     
 st.markdown("""
@@ -193,21 +197,14 @@ st.markdown("""
 
 st.markdown('<h1 class="title"><i class="fas fa-trash"></i> Remove Plant</h1>', unsafe_allow_html=True)
 
-if plant.zone_id != int(zone_id):
-    st.error("Plant does not belong to this zone.")
-    if st.button("← Back to Zone Details"):
-        st.query_params["zone_id"] = str(zone_id)
-        st.switch_page("pages/zone_details.py")
-    st.stop()
-
 st.markdown("### Plant Information", unsafe_allow_html=True)
 st.markdown(f"""
 <div class="plant-card">
-    <h4>{plant.name}</h4>
-    <p><strong>Type:</strong> {plant.plant_type}</p>
-    <p><strong>Zone:</strong> {zone.name} (Zone {zone.id})</p>
-    <p><strong>Planted:</strong> {plant.planting_date.strftime('%B %d, %Y') if plant.planting_date else 'Unknown'}</p>
-    {f'<p><strong>Notes:</strong> {plant.notes}</p>' if plant.notes else ''}
+    <h4>{plant['name']}</h4>
+    <p><strong>Type:</strong> {plant['plant_type']}</p>
+    <p><strong>Zone:</strong> {zone['name']} (Zone {zone['id']})</p>
+    <p><strong>Planted:</strong> {plant['planting_date'].strftime('%B %d, %Y') if plant['planting_date'] else 'Unknown'}</p>
+    {f"<p><strong>Notes:</strong> {plant['notes']}</p>" if plant['notes'] else ''}
 </div>
 """, unsafe_allow_html=True)
 
@@ -232,7 +229,7 @@ with col2:
 
 with col3:
     if st.button("❌ Remove Plant", key="remove", type="primary"):
-        if remove_plant(plant.id):
+        if remove_plant(plant['id']):
             st.markdown("""
             <div class="success-message">
                 <strong><i class="fas fa-check-circle"></i> Success!</strong> 
@@ -1,10 +1,10 @@
 import sys
 import os
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..')))
 
 import streamlit as st
-from db.database import session, ZoneModel, PlantModel, SensorReading
-from datetime import datetime, timedelta
+from smart_gardening.dashboard.data import get_chart, get_latest_state, get_zone
 
 st.set_page_config(
     page_title="Zone Details - Smart Gardening Dashboard",
@@ -206,7 +206,7 @@ if not st.query_params.get("zone_id"):
     st.query_params["zone_id"] = str(zone_id)
 
 try:
-    zone = session.query(ZoneModel).filter(ZoneModel.id == int(zone_id)).first()
+    zone = get_zone(int(zone_id))
     if not zone:
         st.error("Zone not found.")
         if st.button("← Back to Dashboard"):
@@ -226,8 +226,8 @@ with col1:
 with col2:
     st.markdown(f"""
     <div class="zone-header">
-        <h1>Zone {zone.id} - {zone.name}</h1>
-        <p>Plant Type: {zone.plant_type}</p>
+        <h1>Zone {zone['id']} - {zone['name']}</h1>
+        <p>Plant Type: {zone['plant_type']}</p>
     </div>
     """, unsafe_allow_html=True)
 
@@ -237,54 +237,50 @@ with col1:
     st.markdown("### Zone Configuration", unsafe_allow_html=True)
     st.markdown(f"""
     <div class="metric-card">
-        <p><strong>Moisture Threshold:</strong> {zone.moisture_threshold}%</p>
-        <p><strong>pH Range:</strong> {zone.ph_min} - {zone.ph_max}</p>
-        <p><strong>Created:</strong> {zone.created_at.strftime('%B %d, %Y') if zone.created_at else 'Unknown'}</p>
+        <p><strong>Moisture Threshold:</strong> {zone['moisture_threshold']}%</p>
+        <p><strong>pH Range:</strong> {zone['ph_min']} - {zone['ph_max']}</p>
+        <p><strong>Created:</strong> {zone['created_at'].strftime('%B %d, %Y') if zone['created_at'] else 'Unknown'}</p>
     </div>
     """, unsafe_allow_html=True)
 
 with col2:
     st.markdown("### Current Status", unsafe_allow_html=True)
     
-    latest_reading = session.query(SensorReading).filter(
-        SensorReading.zone_id == zone.id
-    ).order_by(SensorReading.timestamp.desc()).first()
+    # Latest reading and pump state as last written by the collector
+    latest_state = get_latest_state(zone['id'])
+    pump_status = "ON" if latest_state is not None and latest_state['pump_on'] else "OFF"
     
-    if latest_reading:
-        current_moisture = latest_reading.moisture
-        current_ph = latest_reading.ph
-    else:
-        current_moisture = 45
-        current_ph = 6.5
-    
-    pump_status = "ON" if current_moisture < zone.moisture_threshold else "OFF"
-    
-    moisture_status_class = "status-good" if current_moisture >= zone.moisture_threshold else "status-warning"
-    
-    if zone.ph_min <= current_ph <= zone.ph_max:
-        ph_status_class = "status-good"
-        ph_status_text = "🟢 Good"
-    elif current_ph < zone.ph_min:
-        ph_status_class = "status-warning"
-        ph_status_text = "🔴 Too Acidic"
+    if latest_state is not None and latest_state['reading_at'] is not None:
+        current_moisture = latest_state['moisture']
+        current_ph = latest_state['ph']
+        
+        if zone['ph_min'] <= current_ph <= zone['ph_max']:
+            ph_status_text = "🟢 Good"
+        elif current_ph < zone['ph_min']:
+            ph_status_text = "🔴 Too Acidic"
+        else:
+            ph_status_text = "🔵 Too Alkaline"
+        
+        reading_html = f"""
+        <p><strong>Current Moisture:</strong> <span>{current_moisture:.1f}%</span></p>
+        <p><strong>Current pH:</strong> {current_ph:.1f} ({ph_status_text})</p>
+        <p><strong>Measured:</strong> {latest_state['reading_at'].strftime('%Y-%m-%d %H:%M')} UTC</p>
+        """
     else:
-        ph_status_class = "status-warning"
-        ph_status_text = "🔵 Too Alkaline"
-    
+        reading_html = "<p><em>No sensor readings recorded yet.</em></p>"
     
     st.markdown(f"""
     <div class="metric-card">
-        <p><strong>Current Moisture:</strong> <span>{current_moisture:.1f}%</span></p>
-        <p><strong>Current pH:</strong> {current_ph:.1f}</p>
+        {reading_html}
         <p><strong>Pump Status:</strong> <span>{pump_status}</span></p>
-        <p><strong>Last Watered:</strong> {zone.last_watered.strftime('%Y-%m-%d %H:%M') if zone.last_watered is not None else 'Never'}</p>
+        <p><strong>Last Watered:</strong> {zone['last_watered'].strftime('%Y-%m-%d %H:%M') if zone['last_watered'] is not None else 'Never'}</p>
     </div>
     """, unsafe_allow_html=True)
 
 st.markdown("### Plants in This Zone", unsafe_allow_html=True)
 
 
-plants = session.query(PlantModel).filter(PlantModel.zone_id == zone.id).all()
+plants = zone['plants']
 
 if plants:
     for plant in plants:
@@ -293,17 +289,17 @@ if plants:
         with col1:
             st.markdown(f"""
             <div class="metric-card">
-                <h4>{plant.name}</h4>
-                <p><strong>Type:</strong> {plant.plant_type}</p>
-                <p><strong>Planted:</strong> {plant.planting_date.strftime('%B %d, %Y') if plant.planting_date else 'Unknown'}</p>
-                {f'<p><strong>Notes:</strong> {plant.notes}</p>' if plant.notes else ''}
+                <h4>{plant['name']}</h4>
+                <p><strong>Type:</strong> {plant['plant_type']}</p>
+                <p><strong>Planted:</strong> {plant['planting_date'].strftime('%B %d, %Y') if plant['planting_date'] else 'Unknown'}</p>
+                {f"<p><strong>Notes:</strong> {plant['notes']}</p>" if plant['notes'] else ''}
             </div>
             """, unsafe_allow_html=True)
         
         with col2:
-            if st.button("❌", key=f"remove_{plant.id}", type="secondary"):
-                st.session_state.remove_zone_id = zone.id
-                st.session_state.remove_plant_id = plant.id
+            if st.button("❌", key=f"remove_{plant['id']}", type="secondary"):
+                st.session_state.remove_zone_id = zone['id']
+                st.session_state.remove_plant_id = plant['id']
                 st.switch_page("pages/remove_plant.py")
 
 else:
@@ -313,27 +309,21 @@ else:
     </div>
     """, unsafe_allow_html=True)
 
-st.markdown("### Recent Sensor Readings", unsafe_allow_html=True)
+st.markdown("### Sensor History", unsafe_allow_html=True)
 
-recent_readings = session.query(SensorReading).filter(
-    SensorReading.zone_id == zone.id,
-    SensorReading.timestamp >= datetime.now() - timedelta(days=7)
-).order_by(SensorReading.timestamp.desc()).limit(10).all()
+# Chart range label -> days; every range is downsampled to the same point budget
+HISTORY_RANGES = {"24 h": 1, "7 d": 7, "30 d": 30, "1 y": 365}
+# Width of each chart in pixels, about one point per pixel
+CHART_WIDTH = 600
 
-if recent_readings:
-    chart_data = []
-    for reading in recent_readings:
-        chart_data.append({
-            "Date": reading.timestamp.strftime('%Y-%m-%d %H:%M'),
-            "Moisture (%)": reading.moisture,
-            "pH": reading.ph
-        })
-    
+range_label = st.radio("Range", list(HISTORY_RANGES), index=1, horizontal=True, key="history_range")
+chart = get_chart(zone['id'], days=HISTORY_RANGES[range_label], width=CHART_WIDTH)
+
+if len(chart['moisture'][0]) or len(chart['ph'][0]):
     import pandas as pd
     
-    df = pd.DataFrame(chart_data)
-    df['Date'] = pd.to_datetime(df['Date'])
-    df = df.sort_values('Date')
+    moisture_df = pd.DataFrame({'Date': chart['moisture'][0], 'Moisture (%)': chart['moisture'][1]})
+    ph_df = pd.DataFrame({'Date': chart['ph'][0], 'pH': chart['ph'][1]})
     
     tab1, tab2 = st.tabs(["📊 Chart View", "📋 Table View"])
     
@@ -342,19 +332,31 @@ if recent_readings:
         
         with col1:
             st.markdown("#### Moisture Levels Over Time")
-            st.line_chart(df.set_index('Date')['Moisture (%)'])
+            st.line_chart(moisture_df.set_index('Date'))
         
         with col2:
             st.markdown("#### pH Levels Over Time")
-            st.line_chart(df.set_index('Date')['pH'])
+            st.line_chart(ph_df.set_index('Date'))
     
     
     with tab2:
-        st.dataframe(df, use_container_width=True)
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            st.dataframe(moisture_df, use_container_width=True)
+        
+        with col2:
+            st.dataframe(ph_df, use_container_width=True)
+    
+    if chart['resolution']:
+        rollup = {60: "per-minute", 3600: "hourly", 86400: "daily"}.get(chart['resolution'], "")
+        st.caption(f"Lowest and highest value per chart point, from {rollup} rollups. Times in UTC.")
+    else:
+        st.caption("Lowest and highest value per chart point, from raw readings. Times in UTC.")
 else:
     st.markdown("""
     <div class="metric-card">
-        <p><em>No recent sensor readings available.</em></p>
+        <p><em>No sensor readings in this range.</em></p>
     </div>
     """, unsafe_allow_html=True)
 
@@ -363,5 +365,5 @@ col1, col2, col3 = st.columns([1, 1, 1])
 
 with col1:
     if st.button("Add Plant to This Zone"):
-        st.session_state.selected_zone_id = zone.id
+        st.session_state.selected_zone_id = zone['id']
         st.switch_page("pages/add_plant.py") 
\ No newline at end of file
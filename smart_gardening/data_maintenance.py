@@ -7,7 +7,6 @@ Handles data retention and cleanup operations
 import sys
 import os
 import argparse
-from datetime import datetime, timedelta, timezone
 
 # Add the project root to the path
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
@@ -16,18 +15,43 @@ from smart_gardening.db.database import (
     init_db, 
     cleanup_old_sensor_readings, 
     get_sensor_readings_stats,
+    rebuild_rollups,
+    rebuild_zone_latest_state,
+    retention_cutoff,
     session
 )
+from smart_gardening.core.clock import system_clock
+from smart_gardening.db.archive import archive_expired_rows
 
 
-def run_data_cleanup(retention_days=60, dry_run=False):
+def print_cleanup_progress(table, deleted, current_id, last_id):
+    """Print one progress line per deleted batch"""
+    print(f"   {table}: {deleted} deleted (id {current_id}/{last_id})")
+
+
+def print_archive_progress(table, archived):
+    """Print one progress line per archived chunk"""
+    print(f"   {table}: {archived} archived")
+
+
+def run_data_cleanup(retention_days=60, dry_run=False, batch_size=None, vacuum=False, archive_dir=None, clock=None):
     """
     Run data cleanup operation.
     
     Args:
         retention_days: Number of days to keep data
         dry_run: If True, only show what would be deleted without actually deleting
+        batch_size: Maximum rows deleted per transaction
+        vacuum: If True, return freed pages to the OS afterwards
+        archive_dir: If set, copy expiring rows to Parquet files here before deleting them
+        clock: Clock that defines "now" for the retention cutoff (defaults to the system clock)
+    
+    Returns:
+        bool: False if archiving failed and the cleanup was skipped
     """
+    # One timestamp for the whole run, so the archive and cleanup agree on the cutoff
+    now = (clock or system_clock).utcnow()
+
     print(f"🧹 Smart Gardening Data Maintenance")
     print("=" * 50)
     
@@ -54,7 +78,7 @@ def run_data_cleanup(retention_days=60, dry_run=False):
         print("=" * 50)
         
         # Calculate cutoff date
-        cutoff_date = datetime.now(timezone.utc) - timedelta(days=retention_days)
+        cutoff_date = retention_cutoff(retention_days, now)
         print(f"Would delete records older than: {cutoff_date}")
         
         # Count records that would be deleted
@@ -71,13 +95,41 @@ def run_data_cleanup(retention_days=60, dry_run=False):
         print(f"Would delete {old_readings} sensor readings")
         print(f"Would delete {old_pump_logs} pump logs")
         print(f"Total records to be deleted: {old_readings + old_pump_logs}")
+        if archive_dir:
+            print(f"Would archive them to: {archive_dir}")
         
     else:
+        if archive_dir:
+            print(f"📦 Archiving data older than {retention_days} days to {archive_dir}...")
+            print("=" * 50)
+            
+            try:
+                archived = archive_expired_rows(
+                    archive_dir,
+                    retention_days,
+                    chunk_size=batch_size,
+                    progress_callback=print_archive_progress,
+                    now=now
+                )
+            except Exception:
+                # Never delete rows that did not make it into the archive
+                print("❌ Archiving failed; skipping cleanup so no unarchived rows are deleted")
+                return False
+            
+            print(f"✅ Archived {archived.get('sensor_readings', 0)} sensor readings and {archived.get('pump_logs', 0)} pump logs")
+            print()
+        
         print(f"🗑️  Cleaning up data older than {retention_days} days...")
         print("=" * 50)
         
-        # Run cleanup
-        deleted_count = cleanup_old_sensor_readings(retention_days)
+        # Run cleanup in short batches; safe to interrupt and rerun
+        deleted_count = cleanup_old_sensor_readings(
+            retention_days,
+            batch_size=batch_size,
+            progress_callback=print_cleanup_progress,
+            vacuum=vacuum,
+            now=now
+        )
         
         print(f"✅ Cleanup completed successfully!")
         print(f"   Total records deleted: {deleted_count}")
@@ -92,6 +144,8 @@ def run_data_cleanup(retention_days=60, dry_run=False):
             print(f"   Newest record: {updated_stats.get('newest_record', 'N/A')}")
             if updated_stats.get('date_range_days'):
                 print(f"   Date range: {updated_stats['date_range_days']} days")
+    
+    return True
 
 
 def schedule_cleanup():
@@ -99,7 +153,7 @@ def schedule_cleanup():
     Schedule regular cleanup operations.
     This function can be called by a cron job or scheduler.
     """
-    print(f"⏰ Scheduled data cleanup at {datetime.now(timezone.utc)}")
+    print(f"⏰ Scheduled data cleanup at {system_clock.utcnow()}")
     run_data_cleanup(retention_days=60, dry_run=False)
 
 
@@ -113,8 +167,11 @@ Examples:
   %(prog)s --cleanup                    # Run cleanup with default 60-day retention
   %(prog)s --cleanup --days 30          # Run cleanup with 30-day retention
   %(prog)s --cleanup --dry-run          # Show what would be deleted without deleting
+  %(prog)s --cleanup --batch-size 1000 --vacuum   # Smaller batches, then reclaim disk space
+  %(prog)s --archive /data/garden-archive         # Archive expiring rows to Parquet, then delete them
   %(prog)s --stats                      # Show database statistics only
   %(prog)s --schedule                   # Run scheduled cleanup (for cron jobs)
+  %(prog)s --rebuild-rollups            # Recompute 1m/1h/1d rollups from raw readings
         """
     )
     
@@ -137,6 +194,26 @@ Examples:
         help="Show what would be deleted without actually deleting"
     )
     
+    parser.add_argument(
+        "--batch-size", 
+        type=int, 
+        default=None,
+        help="Maximum rows deleted per transaction (default: 5000)"
+    )
+    
+    parser.add_argument(
+        "--vacuum", 
+        action="store_true",
+        help="Run an incremental vacuum after cleanup (SQLite)"
+    )
+    
+    parser.add_argument(
+        "--archive", 
+        metavar="DIR",
+        default=None,
+        help="Archive expiring rows to day-partitioned Parquet files in DIR before deleting them"
+    )
+    
     parser.add_argument(
         "--stats", 
         action="store_true",
@@ -149,12 +226,37 @@ Examples:
         help="Run scheduled cleanup (for cron jobs)"
     )
     
+    parser.add_argument(
+        "--rebuild-rollups", 
+        action="store_true",
+        help="Recompute sensor rollups from raw readings"
+    )
+    
+    parser.add_argument(
+        "--rebuild-latest-state", 
+        action="store_true",
+        help="Recompute each zone's latest reading and pump state for the dashboard"
+    )
+    
     args = parser.parse_args()
     
-    if args.schedule:
+    if args.rebuild_rollups:
+        print("📈 Rebuilding sensor rollups")
+        print("=" * 50)
+        init_db()
+        processed = rebuild_rollups()
+        print(f"✅ Folded {processed} sensor readings into rollups")
+    elif args.rebuild_latest_state:
+        print("📍 Rebuilding zone latest state")
+        print("=" * 50)
+        init_db()
+        written = rebuild_zone_latest_state()
+        print(f"✅ Wrote the latest state of {written} zones")
+    elif args.schedule:
         schedule_cleanup()
-    elif args.cleanup:
-        run_data_cleanup(args.days, args.dry_run)
+    elif args.cleanup or args.archive:
+        if not run_data_cleanup(args.days, args.dry_run, args.batch_size, args.vacuum, args.archive):
+            sys.exit(1)
     elif args.stats:
         print("📊 Smart Gardening Database Statistics")
         print("=" * 50)
@@ -0,0 +1,180 @@
+"""
+Parquet archive for expired sensor readings and pump logs.
+
+Rows past the retention cutoff are streamed out of the hot tables in
+chunks and written to day-partitioned, compressed Parquet files:
+
+    <archive_dir>/<table>/date=YYYY-MM-DD/part-<first id>-<last id>.parquet
+
+Each chunk is deleted from the database only after its files are written.
+The reader uses pyarrow datasets, so zone/time filters prune whole day
+partitions and row groups instead of loading the archive into memory.
+"""
+
+import os
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from smart_gardening.db.database import session, retention_cutoff, SensorReading, PumpLog
+
+ARCHIVE_TABLES = {
+    'sensor_readings': (SensorReading, ['id', 'zone_id', 'moisture', 'ph', 'timestamp']),
+    'pump_logs': (PumpLog, ['id', 'zone_id', 'status', 'timestamp']),
+}
+
+ARCHIVE_CHUNK_SIZE = 50000
+
+_PARTITIONING = ds.partitioning(pa.schema([('date', pa.string())]), flavor='hive')
+
+
+def _write_chunk(archive_dir, table_name, frame, compression):
+    """Write one chunk of rows as one Parquet file per day it covers."""
+    written = 0
+    days = frame['timestamp'].dt.strftime('%Y-%m-%d')
+    for day, day_frame in frame.groupby(days, sort=False):
+        partition_dir = os.path.join(archive_dir, table_name, f'date={day}')
+        os.makedirs(partition_dir, exist_ok=True)
+        file_name = f"part-{day_frame['id'].iloc[0]}-{day_frame['id'].iloc[-1]}.parquet"
+        pq.write_table(
+            pa.Table.from_pandas(day_frame, preserve_index=False),
+            os.path.join(partition_dir, file_name),
+            compression=compression,
+        )
+        written += len(day_frame)
+    return written
+
+
+def archive_expired_rows(archive_dir, retention_days=60, db_session=None, chunk_size=None,
+                         compression='zstd', progress_callback=None, now=None):
+    """
+    Move rows older than the retention period from the database to the archive.
+
+    Rows are read in id order, ``chunk_size`` at a time. Each chunk is written
+    to Parquet and then deleted in its own short transaction. File names are
+    derived from the chunk's id range, so rerunning after an interruption
+    overwrites a partially archived chunk instead of duplicating it.
+
+    Args:
+        archive_dir: Root directory of the archive
+        retention_days: Number of days to keep in the database
+        db_session: Session to use (defaults to the module session)
+        chunk_size: Rows read, written and deleted per step
+        compression: Parquet compression codec
+        progress_callback: Called as ``callback(table, archived_so_far)``
+        now: Current time from the caller's clock (see ``retention_cutoff``)
+
+    Returns:
+        dict: Number of rows archived per table
+
+    Raises:
+        Exception: Any error while reading, writing or deleting a chunk is
+            re-raised after rolling back, so callers never go on to delete
+            rows that were not archived. Chunks completed before the error
+            stay archived and deleted.
+    """
+    if db_session is None:
+        db_session = session
+    if chunk_size is None:
+        chunk_size = ARCHIVE_CHUNK_SIZE
+
+    cutoff_date = retention_cutoff(retention_days, now)
+    archived = {}
+
+    try:
+        for table_name, (model, columns) in ARCHIVE_TABLES.items():
+            archived[table_name] = 0
+            last_id = 0
+            while True:
+                chunk = db_session.query(*[getattr(model, column) for column in columns]).filter(
+                    model.timestamp < cutoff_date,
+                    model.id > last_id
+                ).order_by(model.id).limit(chunk_size).all()
+                if not chunk:
+                    break
+
+                frame = pd.DataFrame(chunk, columns=columns)
+                frame['timestamp'] = pd.to_datetime(frame['timestamp'])
+                _write_chunk(archive_dir, table_name, frame, compression)
+
+                chunk_ids = frame['id'].tolist()
+                db_session.query(model).filter(model.id.in_(chunk_ids)).delete(synchronize_session=False)
+                db_session.commit()
+
+                archived[table_name] += len(chunk_ids)
+                last_id = chunk_ids[-1]
+                if progress_callback is not None:
+                    progress_callback(table_name, archived[table_name])
+    except Exception as e:
+        # Chunks archived before the error are already written and deleted
+        db_session.rollback()
+        print(f"Error archiving expired rows: {e}")
+        raise
+
+    return archived
+
+
+def _archive_filter(zone_id=None, start=None, end=None):
+    """Build a dataset filter; date bounds prune partitions, timestamps prune rows."""
+    conditions = []
+    if zone_id is not None:
+        conditions.append(ds.field('zone_id') == zone_id)
+    if start is not None:
+        conditions.append(ds.field('date') >= start.strftime('%Y-%m-%d'))
+        conditions.append(ds.field('timestamp') >= pa.scalar(start, type=pa.timestamp('us')))
+    if end is not None:
+        conditions.append(ds.field('date') <= end.strftime('%Y-%m-%d'))
+        conditions.append(ds.field('timestamp') < pa.scalar(end, type=pa.timestamp('us')))
+
+    expression = None
+    for condition in conditions:
+        expression = condition if expression is None else expression & condition
+    return expression
+
+
+def _open_dataset(archive_dir, table_name):
+    if table_name not in ARCHIVE_TABLES:
+        raise ValueError(f"Unknown archive table: {table_name}")
+    table_dir = os.path.join(archive_dir, table_name)
+    if not os.path.isdir(table_dir):
+        return None
+    return ds.dataset(table_dir, format='parquet', partitioning=_PARTITIONING)
+
+
+def iter_archive(archive_dir, table_name='sensor_readings', zone_id=None, start=None, end=None,
+                 columns=None, batch_size=65536):
+    """
+    Stream archived rows matching a zone and time range as DataFrames.
+
+    Only partitions and row groups that can match the filter are read, and
+    at most ``batch_size`` rows are held in memory at a time.
+    """
+    dataset = _open_dataset(archive_dir, table_name)
+    if dataset is None:
+        return
+    if columns is None:
+        columns = ARCHIVE_TABLES[table_name][1]
+
+    for batch in dataset.to_batches(columns=columns, filter=_archive_filter(zone_id, start, end),
+                                    batch_size=batch_size):
+        if batch.num_rows:
+            yield batch.to_pandas()
+
+
+def read_archive(archive_dir, table_name='sensor_readings', zone_id=None, start=None, end=None,
+                 columns=None):
+    """
+    Read archived rows matching a zone and time range into one DataFrame.
+
+    Returns:
+        pandas.DataFrame: Matching rows ordered by timestamp
+    """
+    frames = list(iter_archive(archive_dir, table_name, zone_id, start, end, columns))
+    if not frames:
+        return pd.DataFrame(columns=columns or ARCHIVE_TABLES[table_name][1])
+    frame = pd.concat(frames, ignore_index=True)
+    if 'timestamp' in frame.columns:
+        frame = frame.sort_values('timestamp', ignore_index=True)
+    return frame
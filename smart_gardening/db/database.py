@@ -1,12 +1,75 @@
-from sqlalchemy import create_engine, Column, Integer, String, Float, Boolean, DateTime, Text
+from sqlalchemy import bindparam, create_engine, event, func, insert, select, text, update, Column, Integer, String, Float, Boolean, DateTime, Text, Index, UniqueConstraint
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import aliased, relationship, sessionmaker, scoped_session
+from contextlib import contextmanager
 import datetime
+import time
+import numpy as np
+from smart_gardening.config import Config
+from smart_gardening.core.downsample import minmax_downsample
+
+SQLITE_BUSY_TIMEOUT_MS = 5000
+SQLITE_MMAP_SIZE = 256 * 1024 * 1024
+CLEANUP_BATCH_SIZE = 5000
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    """Tune every new SQLite connection for one writer plus concurrent readers."""
+    cursor = dbapi_connection.cursor()
+    # auto_vacuum can only be chosen before the first table is created; it lets
+    # retention cleanup hand freed pages back with PRAGMA incremental_vacuum.
+    cursor.execute("PRAGMA page_count")
+    if cursor.fetchone()[0] == 0:
+        cursor.execute("PRAGMA auto_vacuum=INCREMENTAL")
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute(f"PRAGMA mmap_size={SQLITE_MMAP_SIZE}")
+    cursor.execute(f"PRAGMA busy_timeout={SQLITE_BUSY_TIMEOUT_MS}")
+    cursor.close()
+
+def create_db_engine(database_url=None, echo=False):
+    """
+    Create a database engine, defaulting to ``Config().DATABASE_URL``.
+
+    SQLite connections run in WAL mode so readers never block the writer,
+    with ``synchronous=NORMAL``, a memory-mapped read path and a busy
+    timeout instead of immediate "database is locked" errors.
+    """
+    if database_url is None:
+        database_url = Config().DATABASE_URL
+
+    if database_url.startswith('sqlite'):
+        db_engine = create_engine(
+            database_url,
+            echo=echo,
+            connect_args={'timeout': SQLITE_BUSY_TIMEOUT_MS / 1000},
+        )
+        event.listen(db_engine, 'connect', _set_sqlite_pragmas)
+    else:
+        db_engine = create_engine(database_url, echo=echo, pool_pre_ping=True)
+    return db_engine
 
 Base = declarative_base()
-engine = create_engine('sqlite:///smart_garden.db', echo=False)
-Session = sessionmaker(bind=engine)
-session = Session()
+engine = create_db_engine()
+SessionFactory = sessionmaker(bind=engine)
+# Thread-local sessions: the collector, its writer thread and every Streamlit
+# script thread each get their own Session when they use ``session``.
+Session = scoped_session(SessionFactory)
+session = Session
+
+@contextmanager
+def session_scope():
+    """Provide a short-lived session that commits on success and always closes."""
+    db_session = SessionFactory()
+    try:
+        yield db_session
+        db_session.commit()
+    except Exception:
+        db_session.rollback()
+        raise
+    finally:
+        db_session.close()
 
 class ZoneModel(Base):
     __tablename__ = 'zones'
@@ -18,6 +81,21 @@ class ZoneModel(Base):
     ph_max = Column(Float, default=7.5)
     created_at = Column(DateTime, default=datetime.datetime.utcnow)
     last_watered = Column(DateTime, nullable=True)
+    # Bumped on every configuration change so the collector can reload just the changed zones
+    updated_at = Column(DateTime, default=datetime.datetime.utcnow, onupdate=datetime.datetime.utcnow)
+
+    __table_args__ = (
+        Index('ix_zones_updated_at', 'updated_at'),
+    )
+
+    # plants.zone_id has no foreign key, so the join is spelled out; plants are
+    # added and removed through PlantModel rows, hence read-only here
+    plants = relationship(
+        'PlantModel',
+        primaryjoin='ZoneModel.id == foreign(PlantModel.zone_id)',
+        order_by='PlantModel.id',
+        viewonly=True,
+    )
 
 class PlantModel(Base):
     __tablename__ = 'plants'
@@ -37,6 +115,11 @@ class SensorReading(Base):
     ph = Column(Float)
     timestamp = Column(DateTime, default=datetime.datetime.utcnow)
 
+    __table_args__ = (
+        Index('ix_sensor_readings_zone_id_timestamp', 'zone_id', 'timestamp'),
+        Index('ix_sensor_readings_timestamp', 'timestamp'),
+    )
+
 class PumpLog(Base):
     __tablename__ = 'pump_logs'
     id = Column(Integer, primary_key=True, autoincrement=True)
@@ -44,6 +127,69 @@ class PumpLog(Base):
     status = Column(String)
     timestamp = Column(DateTime, default=datetime.datetime.utcnow)
 
+    __table_args__ = (
+        Index('ix_pump_logs_zone_id_timestamp', 'zone_id', 'timestamp'),
+        Index('ix_pump_logs_timestamp', 'timestamp'),
+    )
+
+class PumpState(Base):
+    """Last checkpointed pump state of a zone, read back when the controller restarts"""
+    __tablename__ = 'pump_state'
+    zone_id = Column(Integer, primary_key=True, autoincrement=False)
+    pump_on = Column(Boolean, nullable=False, default=False)
+    pump_start = Column(DateTime, nullable=True)
+    updated_at = Column(DateTime, default=datetime.datetime.utcnow)
+
+class ZoneLatestState(Base):
+    """Latest reading, pump status and watering time of a zone, kept current by record_batch"""
+    __tablename__ = 'zone_latest_state'
+    zone_id = Column(Integer, primary_key=True, autoincrement=False)
+    moisture = Column(Float)
+    ph = Column(Float)
+    reading_at = Column(DateTime, nullable=True)
+    pump_on = Column(Boolean, nullable=False, default=False)
+    last_watered = Column(DateTime, nullable=True)
+    updated_at = Column(DateTime, default=datetime.datetime.utcnow)
+
+    __table_args__ = (
+        # The dashboard asks for the rows changed since its last refresh
+        Index('ix_zone_latest_state_updated_at', 'updated_at'),
+    )
+
+# Rollup bucket widths in seconds, finest first
+ROLLUP_RESOLUTIONS = {
+    '1m': 60,
+    '1h': 3600,
+    '1d': 86400,
+}
+
+class SensorRollup(Base):
+    """Per-zone moisture/pH aggregates for one time bucket at one resolution"""
+    __tablename__ = 'sensor_rollups'
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    resolution = Column(Integer, nullable=False)
+    zone_id = Column(Integer, nullable=False)
+    bucket_start = Column(DateTime, nullable=False)
+    count = Column(Integer, nullable=False, default=0)
+    moisture_min = Column(Float)
+    moisture_max = Column(Float)
+    moisture_sum = Column(Float, default=0.0)
+    ph_min = Column(Float)
+    ph_max = Column(Float)
+    ph_sum = Column(Float, default=0.0)
+
+    __table_args__ = (
+        UniqueConstraint('resolution', 'zone_id', 'bucket_start', name='uq_sensor_rollups_bucket'),
+    )
+
+    @property
+    def moisture_mean(self):
+        return self.moisture_sum / self.count if self.count else None
+
+    @property
+    def ph_mean(self):
+        return self.ph_sum / self.count if self.count else None
+
 def remove_plant(plant_id: int, db_session=None) -> bool:
     """Remove a plant from the database."""
     if plant_id is None or not isinstance(plant_id, int) or plant_id <= 0:
@@ -76,33 +222,659 @@ def get_zone_by_id(zone_id: int) -> ZoneModel:
         return None
     return session.query(ZoneModel).filter(ZoneModel.id == zone_id).first()
 
-def cleanup_old_sensor_readings(retention_days: int = 60, db_session=None):
-    """Remove sensor readings older than the specified number of days."""
+def _delete_expired_rows(model, cutoff_date, db_session, batch_size, pause, progress_callback):
+    """
+    Delete rows of ``model`` older than ``cutoff_date`` in bounded id ranges.
+
+    Each range of ``batch_size`` ids is deleted and committed in its own
+    short transaction, then the loop sleeps for ``pause`` seconds so the
+    collector can take the write lock. Nothing is tracked between runs: an
+    interrupted cleanup resumes from the oldest remaining expired row.
+    """
+    first_id, last_id = db_session.query(
+        func.min(model.id), func.max(model.id)
+    ).filter(model.timestamp < cutoff_date).one()
+    db_session.commit()
+    if first_id is None:
+        return 0
+
+    deleted = 0
+    lower = first_id
+    while lower <= last_id:
+        upper = lower + batch_size
+        deleted += db_session.query(model).filter(
+            model.id >= lower,
+            model.id < upper,
+            model.timestamp < cutoff_date
+        ).delete(synchronize_session=False)
+        db_session.commit()
+
+        if progress_callback is not None:
+            progress_callback(model.__tablename__, deleted, min(upper - 1, last_id), last_id)
+        lower = upper
+        time.sleep(pause)
+
+    return deleted
+
+def _incremental_vacuum(db_session, pages=None):
+    """Return freed pages to the OS when the SQLite file uses auto_vacuum=INCREMENTAL."""
+    if db_session.get_bind().dialect.name != 'sqlite':
+        return False
+    if db_session.execute(text("PRAGMA auto_vacuum")).scalar() != 2:
+        print("Skipping incremental vacuum: database was created without auto_vacuum=INCREMENTAL (run VACUUM once to enable it).")
+        return False
+    db_session.execute(text(f"PRAGMA incremental_vacuum({int(pages) if pages else ''})"))
+    db_session.commit()
+    return True
+
+def retention_cutoff(retention_days, now=None):
+    """
+    Oldest timestamp kept by a retention period, as naive UTC like the stored rows.
+
+    Args:
+        retention_days: Number of days to keep data
+        now: Current time from the caller's clock (aware, or naive UTC); defaults to the wall clock
+    """
+    if now is None:
+        now = datetime.datetime.now(datetime.timezone.utc)
+    if now.tzinfo is not None:
+        now = now.astimezone(datetime.timezone.utc).replace(tzinfo=None)
+    return now - datetime.timedelta(days=retention_days)
+
+def cleanup_old_pump_logs(retention_days: int = 60, db_session=None, batch_size=None, pause=0.0, progress_callback=None,
+                          now=None):
+    """Remove pump logs older than the specified number of days, in short batches."""
     if db_session is None:
         db_session = session
-        
-    try:     
-        cutoff_date = datetime.datetime.now(datetime.timezone.utc) - datetime.timedelta(days=retention_days)
-        
-        deleted_count = db_session.query(SensorReading).filter(
-            SensorReading.timestamp < cutoff_date
-        ).delete()
-        
-        deleted_pump_logs = db_session.query(PumpLog).filter(
-            PumpLog.timestamp < cutoff_date
-        ).delete()
-        
+    if batch_size is None:
+        batch_size = CLEANUP_BATCH_SIZE
+
+    try:
+        cutoff_date = retention_cutoff(retention_days, now)
+        return _delete_expired_rows(PumpLog, cutoff_date, db_session, batch_size, pause, progress_callback)
+    except Exception as e:
+        db_session.rollback()
+        print(f"Error during pump log cleanup: {e}")
+        return 0
+
+def cleanup_old_sensor_readings(retention_days: int = 60, db_session=None, batch_size=None, pause=0.0,
+                                progress_callback=None, vacuum=False, now=None):
+    """
+    Remove sensor readings and pump logs older than the specified number of days.
+
+    Rows are deleted in id ranges of ``batch_size`` with one short transaction
+    per range (see ``_delete_expired_rows``), so the collector is never locked
+    out for longer than a single batch. One-minute rollups past the cutoff are
+    pruned too; hourly and daily rollups are kept as long-term history.
+
+    Args:
+        retention_days: Number of days to keep data
+        db_session: Session to use (defaults to the module session)
+        batch_size: Maximum id range deleted per transaction
+        pause: Seconds to sleep between batches
+        progress_callback: Called as ``callback(table, deleted_so_far, current_id, last_id)``
+        vacuum: Run ``PRAGMA incremental_vacuum`` afterwards (SQLite only)
+        now: Current time from the caller's clock (see ``retention_cutoff``)
+
+    Returns:
+        int: Number of sensor readings and pump logs deleted
+    """
+    if db_session is None:
+        db_session = session
+    if batch_size is None:
+        batch_size = CLEANUP_BATCH_SIZE
+
+    deleted_count = 0
+    deleted_pump_logs = 0
+    try:
+        cutoff_date = retention_cutoff(retention_days, now)
+
+        deleted_count = _delete_expired_rows(
+            SensorReading, cutoff_date, db_session, batch_size, pause, progress_callback
+        )
+        deleted_pump_logs = _delete_expired_rows(
+            PumpLog, cutoff_date, db_session, batch_size, pause, progress_callback
+        )
+
+        db_session.query(SensorRollup).filter(
+            SensorRollup.resolution == ROLLUP_RESOLUTIONS['1m'],
+            SensorRollup.bucket_start < cutoff_date
+        ).delete(synchronize_session=False)
         db_session.commit()
-        
+
+        if vacuum:
+            _incremental_vacuum(db_session)
+
         print(f"Data cleanup completed: {deleted_count} sensor readings and {deleted_pump_logs} pump logs older than {retention_days} days removed.")
-        
+
         return deleted_count + deleted_pump_logs
-        
+
     except Exception as e:
         db_session.rollback()
         print(f"Error during data cleanup: {e}")
+        # Batches committed before the error stay deleted; rerunning resumes from there
+        return deleted_count + deleted_pump_logs
+
+def record_batch(readings=(), pump_logs=(), db_session=None, flush_size=None, pump_states=()):
+    """
+    Insert sensor readings and pump logs in a single transaction.
+
+    Readings are mappings with ``zone_id``, ``moisture``, ``ph`` and an
+    optional ``timestamp``; pump logs carry ``zone_id``, ``status`` and an
+    optional ``timestamp``. Rows without a timestamp share one capture time.
+    An "ON" pump log also moves its zone's ``last_watered`` forward, so the
+    zone is only marked watered once the pump transition is recorded.
+    Pump states carry ``zone_id``, ``pump_on``, ``pump_start`` and
+    ``last_watered``; they replace the zone's PumpState row and advance its
+    ``last_watered``, checkpointing the controller in the same commit.
+    The zone_latest_state row of every zone in the batch is upserted in the
+    same transaction too, so the dashboard reads current state without
+    scanning sensor_readings.
+    Rows are written with Core ``executemany`` inserts of at most
+    ``flush_size`` rows each and committed once, so a whole tick costs a
+    single commit regardless of the number of zones.
+
+    Returns:
+        tuple: (readings inserted, pump logs inserted, pump states saved), (0, 0, 0) on error
+    """
+    if db_session is None:
+        db_session = session
+    if flush_size is None:
+        flush_size = Config().INGEST_FLUSH_SIZE
+
+    captured_at = datetime.datetime.utcnow()
+    reading_rows = [
+        {
+            'zone_id': item['zone_id'],
+            'moisture': item.get('moisture'),
+            'ph': item.get('ph'),
+            'timestamp': item.get('timestamp') or captured_at,
+        }
+        for item in readings
+    ]
+    pump_log_rows = [
+        {
+            'zone_id': item['zone_id'],
+            'status': item.get('status'),
+            'timestamp': item.get('timestamp') or captured_at,
+        }
+        for item in pump_logs
+    ]
+    state_rows = [
+        {
+            'zone_id': item['zone_id'],
+            'pump_on': bool(item['pump_on']),
+            'pump_start': item.get('pump_start'),
+            'updated_at': captured_at,
+        }
+        for item in pump_states
+    ]
+    if not reading_rows and not pump_log_rows and not state_rows:
+        return 0, 0, 0
+
+    try:
+        for model, rows in ((SensorReading, reading_rows), (PumpLog, pump_log_rows)):
+            for start in range(0, len(rows), flush_size):
+                db_session.execute(insert(model), rows[start:start + flush_size])
+        watered = _latest_watering(pump_log_rows, pump_states)
+        _update_last_watered(db_session, watered)
+        _save_pump_states(db_session, state_rows)
+        _update_latest_state(db_session, reading_rows, pump_log_rows, state_rows, watered, captured_at)
+        _update_rollups(db_session, reading_rows, flush_size)
+        db_session.commit()
+        return len(reading_rows), len(pump_log_rows), len(state_rows)
+    except Exception as e:
+        db_session.rollback()
+        print(f"Error recording sensor batch: {e}")
+        return 0, 0, 0
+
+def _latest_watering(pump_log_rows, pump_states):
+    """Latest watering time per zone from "ON" pump logs and checkpointed states."""
+    watered = {}
+    times = [(row['zone_id'], row['timestamp']) for row in pump_log_rows if row['status'] == "ON"]
+    times += [(item['zone_id'], item.get('last_watered')) for item in pump_states]
+    for zone_id, timestamp in times:
+        if timestamp is not None and (zone_id not in watered or timestamp > watered[zone_id]):
+            watered[zone_id] = timestamp
+    return watered
+
+def _update_last_watered(db_session, watered):
+    if not watered:
+        return
+    # Never move last_watered backwards when older transitions arrive late
+    db_session.connection().execute(
+        update(ZoneModel.__table__)
+        .where(ZoneModel.__table__.c.id == bindparam('zone'))
+        .where((ZoneModel.__table__.c.last_watered.is_(None)) |
+               (ZoneModel.__table__.c.last_watered < bindparam('watered')))
+        # Watering is controller state, not a configuration change for ZoneWatcher
+        .values(last_watered=bindparam('watered'), updated_at=ZoneModel.__table__.c.updated_at),
+        [{'zone': zone_id, 'watered': timestamp} for zone_id, timestamp in watered.items()]
+    )
+
+def _save_pump_states(db_session, state_rows):
+    if not state_rows:
+        return
+    dialect_insert, _, _ = _upsert_dialect(db_session)
+    stmt = dialect_insert(PumpState)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=['zone_id'],
+        set_={
+            'pump_on': stmt.excluded.pump_on,
+            'pump_start': stmt.excluded.pump_start,
+            'updated_at': stmt.excluded.updated_at,
+        },
+    )
+    db_session.execute(stmt, state_rows)
+
+def _update_latest_state(db_session, reading_rows, pump_log_rows, state_rows, watered, captured_at):
+    dialect_insert, _, greatest = _upsert_dialect(db_session)
+    table = ZoneLatestState.__table__
+
+    readings = {}
+    for row in reading_rows:
+        latest = readings.get(row['zone_id'])
+        if latest is None or row['timestamp'] >= latest['timestamp']:
+            readings[row['zone_id']] = row
+    if readings:
+        stmt = dialect_insert(ZoneLatestState)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=['zone_id'],
+            set_={
+                'moisture': stmt.excluded.moisture,
+                'ph': stmt.excluded.ph,
+                'reading_at': stmt.excluded.reading_at,
+                'updated_at': stmt.excluded.updated_at,
+            },
+            # A late row from an older tick must not replace a newer reading
+            where=table.c.reading_at.is_(None) | (table.c.reading_at <= stmt.excluded.reading_at),
+        )
+        db_session.execute(stmt, [
+            {'zone_id': zone_id, 'moisture': row['moisture'], 'ph': row['ph'],
+             'reading_at': row['timestamp'], 'updated_at': captured_at}
+            for zone_id, row in readings.items()
+        ])
+
+    # Newest pump log per zone, overridden by the controller's own checkpoint
+    logged = {}
+    for row in pump_log_rows:
+        if row['zone_id'] not in logged or row['timestamp'] >= logged[row['zone_id']]['timestamp']:
+            logged[row['zone_id']] = row
+    pumps = {zone_id: row['status'] == "ON" for zone_id, row in logged.items()}
+    pumps.update((row['zone_id'], row['pump_on']) for row in state_rows)
+    if pumps:
+        stmt = dialect_insert(ZoneLatestState)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=['zone_id'],
+            set_={'pump_on': stmt.excluded.pump_on, 'updated_at': stmt.excluded.updated_at},
+        )
+        db_session.execute(stmt, [
+            {'zone_id': zone_id, 'pump_on': pump_on, 'updated_at': captured_at}
+            for zone_id, pump_on in pumps.items()
+        ])
+
+    if watered:
+        stmt = dialect_insert(ZoneLatestState)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=['zone_id'],
+            set_={
+                # Two-argument min/max is NULL on SQLite when the column is still NULL
+                'last_watered': func.coalesce(greatest(table.c.last_watered, stmt.excluded.last_watered),
+                                              stmt.excluded.last_watered),
+                'updated_at': stmt.excluded.updated_at,
+            },
+        )
+        db_session.execute(stmt, [
+            {'zone_id': zone_id, 'last_watered': timestamp, 'updated_at': captured_at}
+            for zone_id, timestamp in watered.items()
+        ])
+
+def rebuild_zone_latest_state(db_session=None):
+    """
+    Recompute zone_latest_state from zones, pump_state and sensor_readings.
+
+    Used to fill the table for data written before it existed. Each zone's
+    newest reading is found with an index seek on
+    ``ix_sensor_readings_zone_id_timestamp``.
+
+    Returns:
+        int: Number of zones written
+    """
+    if db_session is None:
+        db_session = session
+
+    try:
+        newer = aliased(SensorReading)
+        latest_id = (
+            select(newer.id)
+            .where(newer.zone_id == ZoneModel.id)
+            .order_by(newer.timestamp.desc())
+            .limit(1)
+            .correlate(ZoneModel)
+            .scalar_subquery()
+        )
+        rows = (
+            db_session.query(ZoneModel.id, ZoneModel.last_watered, PumpState.pump_on,
+                             SensorReading.moisture, SensorReading.ph, SensorReading.timestamp)
+            .outerjoin(PumpState, PumpState.zone_id == ZoneModel.id)
+            .outerjoin(SensorReading, SensorReading.id == latest_id)
+            .all()
+        )
+        now = datetime.datetime.utcnow()
+        db_session.query(ZoneLatestState).delete(synchronize_session=False)
+        if rows:
+            db_session.execute(insert(ZoneLatestState), [
+                {
+                    'zone_id': row.id,
+                    'moisture': row.moisture,
+                    'ph': row.ph,
+                    'reading_at': row.timestamp,
+                    'pump_on': bool(row.pump_on),
+                    'last_watered': row.last_watered,
+                    'updated_at': now,
+                }
+                for row in rows
+            ])
+        db_session.commit()
+        return len(rows)
+    except Exception as e:
+        db_session.rollback()
+        print(f"Error rebuilding zone latest state: {e}")
+        return 0
+
+def record_readings(batch, db_session=None, flush_size=None):
+    """
+    Insert a batch of sensor readings in a single transaction.
+
+    Returns:
+        int: Number of readings inserted (0 on error)
+    """
+    return record_batch(readings=batch, db_session=db_session, flush_size=flush_size)[0]
+
+_EPOCH = datetime.datetime(1970, 1, 1)
+
+def _bucket_start(timestamp, resolution):
+    """Floor a naive UTC timestamp to the start of its bucket."""
+    if timestamp.tzinfo is not None:
+        timestamp = timestamp.astimezone(datetime.timezone.utc).replace(tzinfo=None)
+    seconds = int((timestamp - _EPOCH).total_seconds())
+    return _EPOCH + datetime.timedelta(seconds=seconds - seconds % resolution)
+
+def _upsert_dialect(db_session):
+    """Return the ON CONFLICT-capable insert and the two-argument min/max functions."""
+    if db_session.get_bind().dialect.name == 'postgresql':
+        return postgresql_insert, func.least, func.greatest
+    return sqlite_insert, func.min, func.max
+
+def _update_rollups(db_session, reading_rows, flush_size, since=None):
+    """
+    Fold a batch of readings into the 1m/1h/1d rollup tables.
+
+    The batch is pre-aggregated in memory so each (resolution, zone, bucket)
+    is upserted once per batch. Readings missing moisture or pH are skipped.
+    ``since`` optionally maps a resolution to the earliest bucket to update.
+    """
+    buckets = {}
+    for row in reading_rows:
+        moisture, ph = row['moisture'], row['ph']
+        if moisture is None or ph is None:
+            continue
+        for resolution in ROLLUP_RESOLUTIONS.values():
+            bucket_start = _bucket_start(row['timestamp'], resolution)
+            if since is not None and bucket_start < since[resolution]:
+                continue
+            key = (resolution, row['zone_id'], bucket_start)
+            bucket = buckets.get(key)
+            if bucket is None:
+                buckets[key] = [1, moisture, moisture, moisture, ph, ph, ph]
+            else:
+                bucket[0] += 1
+                bucket[1] = min(bucket[1], moisture)
+                bucket[2] = max(bucket[2], moisture)
+                bucket[3] += moisture
+                bucket[4] = min(bucket[4], ph)
+                bucket[5] = max(bucket[5], ph)
+                bucket[6] += ph
+    if not buckets:
+        return
+
+    dialect_insert, least, greatest = _upsert_dialect(db_session)
+    stmt = dialect_insert(SensorRollup)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=['resolution', 'zone_id', 'bucket_start'],
+        set_={
+            'count': SensorRollup.count + stmt.excluded.count,
+            'moisture_min': least(SensorRollup.moisture_min, stmt.excluded.moisture_min),
+            'moisture_max': greatest(SensorRollup.moisture_max, stmt.excluded.moisture_max),
+            'moisture_sum': SensorRollup.moisture_sum + stmt.excluded.moisture_sum,
+            'ph_min': least(SensorRollup.ph_min, stmt.excluded.ph_min),
+            'ph_max': greatest(SensorRollup.ph_max, stmt.excluded.ph_max),
+            'ph_sum': SensorRollup.ph_sum + stmt.excluded.ph_sum,
+        },
+    )
+    rows = [
+        {
+            'resolution': resolution,
+            'zone_id': zone_id,
+            'bucket_start': bucket_start,
+            'count': count,
+            'moisture_min': moisture_min,
+            'moisture_max': moisture_max,
+            'moisture_sum': moisture_sum,
+            'ph_min': ph_min,
+            'ph_max': ph_max,
+            'ph_sum': ph_sum,
+        }
+        for (resolution, zone_id, bucket_start), (count, moisture_min, moisture_max, moisture_sum, ph_min, ph_max, ph_sum)
+        in buckets.items()
+    ]
+    for start in range(0, len(rows), flush_size):
+        db_session.execute(stmt, rows[start:start + flush_size])
+
+def rebuild_rollups(db_session=None, chunk_size=10000):
+    """
+    Recompute rollups from the raw sensor_readings table.
+
+    Used to backfill rollups for readings ingested before they existed.
+    Retention deletes raw readings but keeps hourly and daily rollups, so
+    only buckets that start at or after the oldest remaining reading are
+    rebuilt; older buckets (and the partial bucket straddling the oldest
+    reading) are left untouched so long-term history survives a rebuild.
+
+    Returns:
+        int: Number of readings folded into the rollups
+    """
+    if db_session is None:
+        db_session = session
+
+    try:
+        oldest = db_session.query(func.min(SensorReading.timestamp)).scalar()
+        if oldest is None:
+            return 0
+
+        # First bucket boundary at or after the oldest reading, per resolution
+        since = {}
+        for resolution in ROLLUP_RESOLUTIONS.values():
+            boundary = _bucket_start(oldest, resolution)
+            if boundary < oldest:
+                boundary += datetime.timedelta(seconds=resolution)
+            since[resolution] = boundary
+            db_session.query(SensorRollup).filter(
+                SensorRollup.resolution == resolution,
+                SensorRollup.bucket_start >= boundary
+            ).delete(synchronize_session=False)
+
+        processed = 0
+        last_id = 0
+        while True:
+            chunk = db_session.query(
+                SensorReading.id, SensorReading.zone_id, SensorReading.moisture,
+                SensorReading.ph, SensorReading.timestamp
+            ).filter(
+                SensorReading.id > last_id,
+                SensorReading.timestamp >= min(since.values())
+            ).order_by(SensorReading.id).limit(chunk_size).all()
+            if not chunk:
+                break
+            _update_rollups(db_session, [row._asdict() for row in chunk], chunk_size, since)
+            processed += len(chunk)
+            last_id = chunk[-1].id
+        db_session.commit()
+        return processed
+    except Exception as e:
+        db_session.rollback()
+        print(f"Error rebuilding rollups: {e}")
         return 0
 
+def select_history_resolution(span_seconds, max_points):
+    """
+    Pick the rollup resolution (in seconds) for a chart.
+
+    Returns the finest resolution whose bucket count over ``span_seconds``
+    stays within ``max_points``, falling back to the coarsest rollup for
+    spans too long for any of them.
+    """
+    for resolution in sorted(ROLLUP_RESOLUTIONS.values()):
+        if span_seconds / resolution <= max_points:
+            return resolution
+    return max(ROLLUP_RESOLUTIONS.values())
+
+def get_sensor_history(zone_id, start, end=None, max_points=500, db_session=None):
+    """
+    Get moisture/pH history for a zone, sized to a point budget.
+
+    Short ranges whose raw readings fit in ``max_points`` are served from
+    sensor_readings; anything longer comes from the rollup resolution chosen
+    by ``select_history_resolution``.
+
+    Returns:
+        dict: ``resolution`` (0 for raw readings) and ``points``, a list of
+        dicts with ``timestamp``, ``count`` and mean/min/max moisture and pH
+    """
+    if db_session is None:
+        db_session = session
+    if end is None:
+        end = datetime.datetime.utcnow()
+
+    span_seconds = (end - start).total_seconds()
+    if span_seconds <= max_points * min(ROLLUP_RESOLUTIONS.values()):
+        raw_query = db_session.query(SensorReading).filter(
+            SensorReading.zone_id == zone_id,
+            SensorReading.timestamp >= start,
+            SensorReading.timestamp <= end,
+        )
+        if raw_query.count() <= max_points:
+            return {
+                'resolution': 0,
+                'points': [
+                    {
+                        'timestamp': reading.timestamp,
+                        'count': 1,
+                        'moisture_mean': reading.moisture,
+                        'moisture_min': reading.moisture,
+                        'moisture_max': reading.moisture,
+                        'ph_mean': reading.ph,
+                        'ph_min': reading.ph,
+                        'ph_max': reading.ph,
+                    }
+                    for reading in raw_query.order_by(SensorReading.timestamp.asc())
+                ],
+            }
+
+    resolution = select_history_resolution(span_seconds, max_points)
+    rollups = db_session.query(SensorRollup).filter(
+        SensorRollup.resolution == resolution,
+        SensorRollup.zone_id == zone_id,
+        SensorRollup.bucket_start >= _bucket_start(start, resolution),
+        SensorRollup.bucket_start <= end,
+    ).order_by(SensorRollup.bucket_start.asc()).all()
+
+    return {
+        'resolution': resolution,
+        'points': [
+            {
+                'timestamp': rollup.bucket_start,
+                'count': rollup.count,
+                'moisture_mean': rollup.moisture_mean,
+                'moisture_min': rollup.moisture_min,
+                'moisture_max': rollup.moisture_max,
+                'ph_mean': rollup.ph_mean,
+                'ph_min': rollup.ph_min,
+                'ph_max': rollup.ph_max,
+            }
+            for rollup in rollups
+        ],
+    }
+
+# Most rows a chart loads per pixel of width before switching to a coarser source
+CHART_ROWS_PER_PIXEL = 16
+
+def get_chart_series(zone_id, start, end=None, width=800, db_session=None):
+    """
+    Get moisture/pH chart series for a zone, downsampled to a pixel budget.
+
+    The range is read into NumPy arrays from raw readings when it holds at
+    most ``CHART_ROWS_PER_PIXEL * width`` of them, else from the finest
+    rollup with at most that many buckets, so a year costs about as much as
+    a day. ``minmax_downsample`` then cuts each series to about ``width``
+    points; rollups contribute their bucket minimum and maximum, so short
+    dry spells and pump bursts stay visible at every range.
+
+    Returns:
+        dict: ``resolution`` (0 for raw readings) plus ``moisture`` and ``ph``,
+        each a (timestamps as naive UTC datetime64[s], values) pair of arrays
+    """
+    if db_session is None:
+        db_session = session
+    if end is None:
+        end = datetime.datetime.utcnow()
+
+    row_budget = CHART_ROWS_PER_PIXEL * width
+    span_seconds = (end - start).total_seconds()
+    resolution = None
+    if span_seconds <= row_budget * min(ROLLUP_RESOLUTIONS.values()):
+        raw_count = db_session.query(func.count(SensorReading.id)).filter(
+            SensorReading.zone_id == zone_id,
+            SensorReading.timestamp >= start,
+            SensorReading.timestamp <= end,
+        ).scalar()
+        if raw_count <= row_budget:
+            resolution = 0
+
+    if resolution == 0:
+        query = select(
+            SensorReading.timestamp, SensorReading.moisture, SensorReading.moisture,
+            SensorReading.ph, SensorReading.ph,
+        ).where(
+            SensorReading.zone_id == zone_id,
+            SensorReading.timestamp >= start,
+            SensorReading.timestamp <= end,
+        ).order_by(SensorReading.timestamp.asc())
+    else:
+        resolution = select_history_resolution(span_seconds, row_budget)
+        query = select(
+            SensorRollup.bucket_start, SensorRollup.moisture_min, SensorRollup.moisture_max,
+            SensorRollup.ph_min, SensorRollup.ph_max,
+        ).where(
+            SensorRollup.resolution == resolution,
+            SensorRollup.zone_id == zone_id,
+            SensorRollup.bucket_start >= _bucket_start(start, resolution),
+            SensorRollup.bucket_start <= end,
+        ).order_by(SensorRollup.bucket_start.asc())
+
+    columns = list(zip(*db_session.execute(query).all())) or [()] * 5
+    timestamps = np.array(columns[0], dtype='datetime64[s]')
+    buckets = max(width // 2, 1)
+    series = {'resolution': resolution}
+    for name, low, high in (('moisture', 1, 2), ('ph', 3, 4)):
+        series[name] = minmax_downsample(
+            timestamps,
+            np.array(columns[low], dtype=float),
+            np.array(columns[high], dtype=float) if resolution else None,
+            buckets=buckets,
+        )
+    return series
+
 def get_sensor_readings_stats():
     """Get statistics about sensor readings in the database."""
     try:
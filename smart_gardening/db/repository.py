@@ -0,0 +1,262 @@
+"""
+Loading controller zones from the database.
+
+The collector used to start from hard-coded zones with every pump off, so a
+restart forgot pumps that were running and zones that had just been watered.
+``load_zones`` rebuilds every zone from ZoneModel together with its
+checkpointed PumpState (written by the runtime through ``record_batch``) in
+a single query, so the control loop resumes where it stopped: a pump that was
+running is still timed from its original start and a recently watered zone
+keeps its cooldown.
+
+ZoneWatcher keeps a running collector in step with zones added, edited or
+removed from the dashboard without reloading every zone: each poll is one
+aggregate query over ``zones`` (row count and newest ``updated_at``), and
+rows are only fetched for zones that actually changed.
+
+The dashboard pages read zones together with their plants through the
+ZoneModel.plants relationship: ``load_dashboard_zones``, ``get_zones_with_plants``
+and ``get_zone_with_plants`` load the plants of every requested zone with one
+extra ``IN`` query instead of one query per zone. The dashboard only reads:
+moisture, pH and pump state come from the zone_latest_state row that
+``record_batch`` upserts with every batch the collector writes, and
+``get_zone_states`` lets a refresh fetch only the rows changed since the last one.
+"""
+
+import datetime
+
+from sqlalchemy import func
+from sqlalchemy.orm import selectinload
+
+from smart_gardening.core.zone import Zone
+from smart_gardening.db.database import PumpState, SessionFactory, ZoneLatestState, ZoneModel, session
+
+
+def _local(timestamp):
+    """Stored naive UTC timestamp as the naive local datetime Zone objects use"""
+    if timestamp is None:
+        return None
+    return timestamp.replace(tzinfo=datetime.timezone.utc).astimezone().replace(tzinfo=None)
+
+
+def zone_from_row(db_zone, state=None):
+    """
+    Build a controller Zone from a ZoneModel row and its PumpState row.
+
+    Args:
+        db_zone: ZoneModel row
+        state: PumpState row, or None if the zone was never checkpointed
+
+    Returns:
+        Zone: Zone with configuration, last watering time and pump state restored
+    """
+    zone = Zone.from_db_model(db_zone)
+    zone.last_watering_time = _local(db_zone.last_watered)
+    if state is not None and state.pump_on:
+        zone.pump_status = True
+        zone.pump_start_time = _local(state.pump_start)
+    else:
+        zone.pump_status = False
+    return zone
+
+
+def _zone_rows(db_session, *criteria):
+    """(ZoneModel, PumpState or None) pairs matching ``criteria``, ordered by id"""
+    return (
+        db_session.query(ZoneModel, PumpState)
+        .outerjoin(PumpState, PumpState.zone_id == ZoneModel.id)
+        .filter(*criteria)
+        .order_by(ZoneModel.id)
+        .all()
+    )
+
+
+def load_zones(db_session=None):
+    """
+    Load every zone with its persisted pump state in one query.
+
+    Returns:
+        list: Zone objects ordered by id
+    """
+    if db_session is None:
+        db_session = session
+    return [zone_from_row(db_zone, state) for db_zone, state in _zone_rows(db_session)]
+
+
+def plant_to_dict(plant):
+    """Plant row as the dict the dashboard shows under a zone"""
+    return {
+        'id': plant.id,
+        'name': plant.name,
+        'type': plant.plant_type,
+        'planting_date': plant.planting_date.strftime('%Y-%m-%d') if plant.planting_date else None,
+        'notes': plant.notes,
+    }
+
+
+def load_dashboard_zones(db_session=None):
+    """
+    Load every zone with its latest state and plants in two queries.
+
+    Zones without a reading yet have ``moisture`` and ``ph`` set to None.
+
+    Returns:
+        list: Zone objects ordered by id, each with ``plants`` filled in by
+        ``plant_to_dict`` and ``reading_time`` set to the local time of its reading
+    """
+    if db_session is None:
+        db_session = session
+    rows = (
+        db_session.query(ZoneModel, ZoneLatestState)
+        .outerjoin(ZoneLatestState, ZoneLatestState.zone_id == ZoneModel.id)
+        .options(selectinload(ZoneModel.plants))
+        .order_by(ZoneModel.id)
+        .all()
+    )
+    zones = []
+    for db_zone, state in rows:
+        zone = Zone.from_db_model(db_zone)
+        zone.plants = [plant_to_dict(plant) for plant in db_zone.plants]
+        zone.last_watering_time = _local(db_zone.last_watered)
+        if state is None:
+            zone.update_readings(None, None)
+            zone.pump_status = False
+        else:
+            zone.update_readings(state.moisture, state.ph)
+            zone.reading_time = _local(state.reading_at)
+            zone.pump_status = state.pump_on
+        zones.append(zone)
+    return zones
+
+
+def get_zone_states(since=None, db_session=None):
+    """
+    Get the zone_latest_state rows written after ``since``.
+
+    Args:
+        since: Naive UTC ``updated_at`` already seen, or None for every row
+
+    Returns:
+        list: ZoneLatestState rows ordered by ``updated_at``
+    """
+    if db_session is None:
+        db_session = session
+    query = db_session.query(ZoneLatestState)
+    if since is not None:
+        query = query.filter(ZoneLatestState.updated_at > since)
+    return query.order_by(ZoneLatestState.updated_at).all()
+
+
+def get_zones_with_plants(db_session=None):
+    """
+    Get every ZoneModel row with its ``plants`` already loaded.
+
+    Returns:
+        list: ZoneModel rows ordered by id
+    """
+    if db_session is None:
+        db_session = session
+    return (
+        db_session.query(ZoneModel)
+        .options(selectinload(ZoneModel.plants))
+        .order_by(ZoneModel.id)
+        .all()
+    )
+
+
+def get_zone_with_plants(zone_id, db_session=None):
+    """
+    Get one ZoneModel row with its ``plants`` already loaded.
+
+    Returns:
+        ZoneModel: The zone, or None if it does not exist
+    """
+    if db_session is None:
+        db_session = session
+    return (
+        db_session.query(ZoneModel)
+        .options(selectinload(ZoneModel.plants))
+        .filter(ZoneModel.id == zone_id)
+        .first()
+    )
+
+
+class ZoneWatcher:
+    """Loads zones once, then reports zones inserted, updated or deleted since the last poll."""
+
+    def __init__(self, session_factory=None, zone_filter=None):
+        """
+        :param session_factory: Callable returning a new database session; each call uses its own
+        :param zone_filter: Optional callable taking a zone id; zones it rejects are ignored
+            (used by shard workers to watch only their own zones)
+        """
+        self.session_factory = session_factory if session_factory is not None else SessionFactory
+        self.zone_filter = zone_filter
+        self.since = None
+        self.ids = set()
+        # Zones already reported with updated_at == since; ``>=`` fetches them again
+        self._boundary = set()
+
+    def _keep(self, zone_id):
+        return self.zone_filter is None or self.zone_filter(zone_id)
+
+    def load(self):
+        """
+        Load every zone (that passes the filter) with its pump state in one query.
+
+        Returns:
+            list: Zone objects ordered by id
+        """
+        db_session = self.session_factory()
+        try:
+            rows = _zone_rows(db_session)
+        finally:
+            db_session.close()
+        self.ids = {db_zone.id for db_zone, _ in rows}
+        self._advance(rows)
+        return [zone_from_row(db_zone, state) for db_zone, state in rows if self._keep(db_zone.id)]
+
+    def poll(self):
+        """
+        Find zones changed since ``load()`` or the previous poll.
+
+        Returns:
+            tuple: (changed, removed) where ``changed`` lists Zone objects for
+            inserted or updated zones and ``removed`` is a set of deleted zone ids
+        """
+        db_session = self.session_factory()
+        try:
+            count, latest = db_session.query(func.count(ZoneModel.id), func.max(ZoneModel.updated_at)).one()
+            rows = []
+            if latest is not None and (self.since is None or latest > self.since):
+                since = ZoneModel.updated_at.isnot(None) if self.since is None else ZoneModel.updated_at >= self.since
+                rows = [(db_zone, state) for db_zone, state in _zone_rows(db_session, since)
+                        if db_zone.updated_at != self.since or db_zone.id not in self._boundary]
+                self._advance(rows)
+
+            known = self.ids | {db_zone.id for db_zone, _ in rows}
+            removed = set()
+            if count != len(known):
+                # Rows vanished (or appeared without an updated_at): compare the id lists
+                ids = {zone_id for zone_id, in db_session.query(ZoneModel.id)}
+                removed = self.ids - ids
+                missing = ids - known
+                if missing:
+                    rows += _zone_rows(db_session, ZoneModel.id.in_(missing))
+                known = ids
+            self.ids = known
+        finally:
+            db_session.close()
+
+        changed = [zone_from_row(db_zone, state) for db_zone, state in rows if self._keep(db_zone.id)]
+        return changed, {zone_id for zone_id in removed if self._keep(zone_id)}
+
+    def _advance(self, rows):
+        stamps = [db_zone.updated_at for db_zone, _ in rows if db_zone.updated_at is not None]
+        if not stamps:
+            return
+        latest = max(stamps)
+        if latest != self.since:
+            self.since = latest
+            self._boundary = set()
+        self._boundary.update(db_zone.id for db_zone, _ in rows if db_zone.updated_at == latest)
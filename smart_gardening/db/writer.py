@@ -0,0 +1,174 @@
+import datetime
+import queue
+import threading
+import time
+
+from smart_gardening.config import Config
+from smart_gardening.db.database import SessionFactory, record_batch
+
+_STOP = object()
+
+
+class BackgroundWriter:
+    """
+    Write-behind buffer for sensor readings, pump logs and pump state checkpoints.
+
+    The control loop enqueues rows and carries on; a background thread drains
+    the bounded queue and writes batches through ``record_batch`` whenever
+    ``flush_size`` rows are pending or ``flush_interval`` seconds have passed.
+    When the queue is full, ``enqueue_*`` blocks for up to ``put_timeout``
+    seconds (back-pressure) and then drops the row, counting it in ``stats()``.
+    Callers that must never block, such as code running on an event loop,
+    pass ``block=False`` so a full queue drops the row immediately.
+    Pump states only need their latest value, so a zone checkpointed several
+    times before a flush is written once.
+    """
+
+    def __init__(self, max_queue_size=None, flush_size=None, flush_interval=None,
+                 put_timeout=1.0, session_factory=None):
+        config = Config()
+        self.max_queue_size = max_queue_size if max_queue_size is not None else config.WRITER_QUEUE_SIZE
+        self.flush_size = flush_size if flush_size is not None else config.INGEST_FLUSH_SIZE
+        self.flush_interval = flush_interval if flush_interval is not None else config.INGEST_FLUSH_INTERVAL
+        self.put_timeout = put_timeout
+        self.session_factory = session_factory if session_factory is not None else SessionFactory
+
+        self._queue = queue.Queue(maxsize=self.max_queue_size)
+        self._thread = None
+        self._lock = threading.Lock()
+        self._counters = {
+            'enqueued': 0,
+            'dropped': 0,
+            'readings_written': 0,
+            'pump_logs_written': 0,
+            'pump_states_written': 0,
+            'flushes': 0,
+            'failed_flushes': 0,
+            'max_queue_depth': 0,
+            'last_flush_latency': 0.0,
+            'max_flush_latency': 0.0,
+            'total_flush_latency': 0.0,
+        }
+
+    def start(self):
+        """Start the background writer thread"""
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name="sensor-writer", daemon=True)
+            self._thread.start()
+        return self
+
+    def enqueue_reading(self, zone_id, moisture, ph, timestamp=None, block=True):
+        """Queue a sensor reading; returns False if it was dropped"""
+        return self._put(('reading', {
+            'zone_id': zone_id,
+            'moisture': moisture,
+            'ph': ph,
+            'timestamp': timestamp or datetime.datetime.utcnow(),
+        }), block)
+
+    def enqueue_pump_log(self, zone_id, status, timestamp=None, block=True):
+        """Queue a pump log row; returns False if it was dropped"""
+        return self._put(('pump_log', {
+            'zone_id': zone_id,
+            'status': status,
+            'timestamp': timestamp or datetime.datetime.utcnow(),
+        }), block)
+
+    def enqueue_pump_state(self, zone_id, pump_on, pump_start=None, last_watered=None, block=True):
+        """Queue a checkpoint of a zone's pump state; returns False if it was dropped"""
+        return self._put(('pump_state', {
+            'zone_id': zone_id,
+            'pump_on': pump_on,
+            'pump_start': pump_start,
+            'last_watered': last_watered,
+        }), block)
+
+    def stop(self, timeout=None):
+        """Write everything still queued and stop the writer thread"""
+        if self._thread is None:
+            return
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+        self._thread = None
+
+    def queue_depth(self):
+        """Number of rows waiting to be written"""
+        return self._queue.qsize()
+
+    def stats(self):
+        """Snapshot of queue depth, throughput and flush latency counters"""
+        with self._lock:
+            stats = dict(self._counters)
+        stats['queue_depth'] = self.queue_depth()
+        flushes = stats['flushes']
+        stats['avg_flush_latency'] = stats['total_flush_latency'] / flushes if flushes else 0.0
+        return stats
+
+    def _put(self, item, block=True):
+        try:
+            self._queue.put(item, block=block, timeout=self.put_timeout)
+        except queue.Full:
+            with self._lock:
+                self._counters['dropped'] += 1
+            return False
+        with self._lock:
+            self._counters['enqueued'] += 1
+            self._counters['max_queue_depth'] = max(self._counters['max_queue_depth'], self._queue.qsize())
+        return True
+
+    def _run(self):
+        db_session = self.session_factory()
+        readings, pump_logs, pump_states = [], [], {}
+        deadline = time.monotonic() + self.flush_interval
+        try:
+            while True:
+                try:
+                    if readings or pump_logs or pump_states:
+                        item = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+                    else:
+                        item = self._queue.get()
+                except queue.Empty:
+                    item = None
+
+                if item is _STOP:
+                    break
+                if item is not None:
+                    if not readings and not pump_logs and not pump_states:
+                        # The interval counts from the oldest buffered row, not from the last flush
+                        deadline = time.monotonic() + self.flush_interval
+                    kind, row = item
+                    if kind == 'pump_state':
+                        pump_states[row['zone_id']] = row
+                    else:
+                        (readings if kind == 'reading' else pump_logs).append(row)
+
+                pending = len(readings) + len(pump_logs) + len(pump_states)
+                if pending >= self.flush_size or time.monotonic() >= deadline:
+                    self._flush(db_session, readings, pump_logs, pump_states)
+                    readings, pump_logs, pump_states = [], [], {}
+                    deadline = time.monotonic() + self.flush_interval
+
+            self._flush(db_session, readings, pump_logs, pump_states)
+        finally:
+            db_session.close()
+
+    def _flush(self, db_session, readings, pump_logs, pump_states):
+        if not readings and not pump_logs and not pump_states:
+            return
+        started = time.perf_counter()
+        written_readings, written_logs, written_states = record_batch(
+            readings, pump_logs, db_session=db_session, flush_size=self.flush_size,
+            pump_states=list(pump_states.values())
+        )
+        latency = time.perf_counter() - started
+
+        with self._lock:
+            if written_readings + written_logs + written_states == 0:
+                self._counters['failed_flushes'] += 1
+            self._counters['flushes'] += 1
+            self._counters['readings_written'] += written_readings
+            self._counters['pump_logs_written'] += written_logs
+            self._counters['pump_states_written'] += written_states
+            self._counters['last_flush_latency'] = latency
+            self._counters['max_flush_latency'] = max(self._counters['max_flush_latency'], latency)
+            self._counters['total_flush_latency'] += latency
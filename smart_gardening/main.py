@@ -1,82 +1,56 @@
-import time
-from datetime import datetime, timedelta
-from smart_gardening.simulator.simulator import SensorSimulator, get_default_zones
-from smart_gardening.actuators.pump import  control_pump
-from smart_gardening.db.database import session, SensorReading, init_db, cleanup_old_sensor_readings
+import asyncio
+import sys
+from smart_gardening.core.clock import SystemClock
+from smart_gardening.db.database import init_db
+from smart_gardening.db.repository import ZoneWatcher
+from smart_gardening.config import Config
+from smart_gardening.runtime import ControlRuntime, RETENTION_DAYS
+from smart_gardening.supervisor import ShardSupervisor
 
 
 if __name__ == "__main__":
     init_db()
     print("Starting Smart Irrigation System Simulation...")
-    print("Sensor readings will be updated every 30 seconds...")
-    print("Data retention: 60 days (automatic cleanup)")
+    config = Config()
+    print(f"Sensors are polled every {config.ACTIVE_POLL_INTERVAL}s while a pump runs, "
+          f"every {config.NEAR_THRESHOLD_POLL_INTERVAL}s near the moisture threshold "
+          f"and every {config.SENSOR_READING_INTERVAL}s otherwise...")
+    print(f"Data retention: {RETENTION_DAYS} days (automatic cleanup)")
+    print("Press Ctrl+C (or send SIGTERM) to stop.")
 
-    zones = get_default_zones()
-    simulator = SensorSimulator(zones)
-    
-    # Track when last cleanup was performed
-    last_cleanup = datetime.now()
-    cleanup_interval = timedelta(days=1)  # Run cleanup once per day
-    
-    try:
-        while True:
-            print(f"\n--- Sensor Reading Update at {time.strftime('%Y-%m-%d %H:%M:%S')} ---")
-            
-            # Simulate new sensor readings
-            simulator.simulate()
+    # Zones come back with the pump state and last watering time checkpointed before the last stop
+    watcher = ZoneWatcher()
+    zones = watcher.load()
+    running = sum(1 for zone in zones if zone.pump_status)
+    print(f"Loaded {len(zones)} zones ({running} pumps still running).")
+    if config.ZONE_RELOAD_INTERVAL:
+        print(f"Zones added, edited or removed in the dashboard are picked up within {config.ZONE_RELOAD_INTERVAL}s.")
+    elif not zones:
+        print("No zones in the database yet; add one from the dashboard first.")
+        sys.exit(1)
 
-            for zone in zones:
-                # Create new sensor reading record
-                reading = SensorReading(
-                    zone_id=zone.id,
-                    moisture=zone.moisture,
-                    ph=zone.ph
-                )
-                session.add(reading)
-                
-                # Advanced automation logic
-                if zone.pump_status:  # Pump is currently running
-                    if zone.should_deactivate_pump():
-                        # Stop pump if moisture is sufficient or max runtime reached
-                        control_pump(zone.id, False)
-                        zone.stop_pump()
-                        reason = "moisture sufficient" if zone.moisture >= zone.moisture_threshold else "max runtime reached"
-                        print(f"Zone {zone.name}: Pump stopped - {reason}")
-                    else:
-                        # Pump continues running
-                        print(f"Zone {zone.name}: Pump running - Moisture={zone.moisture}%, pH={zone.ph}")
-                else:  # Pump is currently off
-                    if zone.should_activate_pump():
-                        # Start pump if needed and allowed
-                        control_pump(zone.id, True)
-                        zone.start_pump()
-                        print(f"Zone {zone.name}: Pump started - Moisture={zone.moisture}%, pH={zone.ph}")
-                    else:
-                        # Pump remains off
-                        reason = "moisture sufficient" if zone.moisture >= zone.moisture_threshold else "recent watering"
-                        print(f"Zone {zone.name}: Pump off - {reason} (Moisture={zone.moisture}%, pH={zone.ph})")
+    if config.SHARD_COUNT > 1:
+        # Each shard of zones gets its own worker process, control loop and writer;
+        # crashed workers are restarted by the supervisor
+        print(f"Running {config.SHARD_COUNT} shard workers...")
+        supervisor = ShardSupervisor(zones, shards=config.SHARD_COUNT,
+                                     reload_interval=config.ZONE_RELOAD_INTERVAL)
+        result = supervisor.run()
 
-                status_str = "ON" if zone.pump_status else "OFF"
-                print(f"Zone {zone.name}: Final Status - Moisture={zone.moisture}%, pH={zone.ph}, Pump={status_str}")
-            
-            session.commit()
-            
-            # Check if it's time for data cleanup (once per day)
-            current_time = datetime.now()
-            if current_time - last_cleanup >= cleanup_interval:
-                print(f"\n🧹 Running scheduled data cleanup at {current_time.strftime('%Y-%m-%d %H:%M:%S')}...")
-                deleted_count = cleanup_old_sensor_readings(retention_days=60)
-                if deleted_count > 0:
-                    print(f"✅ Cleaned up {deleted_count} old records")
-                else:
-                    print("✅ No old records to clean up")
-                last_cleanup = current_time
-                print("Waiting 30 seconds until next update...")
-            else:
-                print("Waiting 30 seconds until next update...")
-            
-            time.sleep(30)
-            
-    except KeyboardInterrupt:
-        print("\nSimulation stopped by user.")
-        session.close()
+        print("\nSimulation stopped.")
+        for shard in result['shards']:
+            print(f"Shard {shard['shard']}: {shard['zones']} zones, {shard['readings_written']} readings written, "
+                  f"{shard['dropped']} dropped, {shard['restarts']} restarts")
+        stats = result['totals']
+        print(f"Wrote {stats['readings_written']} readings and {stats['pump_logs_written']} pump logs "
+              f"from {stats['sensor_reads']} sensor reads across {config.SHARD_COUNT} shards.")
+    else:
+        # Polling, control decisions, database writes and cleanup run as separate
+        # asyncio tasks, so a long cleanup no longer delays the next reading
+        runtime = ControlRuntime(zones, clock=SystemClock(), watcher=watcher)
+        stats = asyncio.run(runtime.run())
+
+        print("\nSimulation stopped.")
+        print(f"Wrote {stats['readings_written']} readings and {stats['pump_logs_written']} pump logs "
+              f"in {stats['flushes']} flushes from {stats['sensor_reads']} sensor reads "
+              f"({stats['missed_polls']} reads skipped while overrunning).")
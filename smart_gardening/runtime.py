@@ -0,0 +1,425 @@
+"""
+asyncio runtime for the irrigation control loop.
+
+The runtime splits the loop into independent tasks so slow work in one
+stage does not delay the others:
+
+- polling: reads the zones that are due according to the PollScheduler
+  through the SensorBus, one batch per driver, and hands the tick to the
+  control task
+- control: evaluates the ZoneTable masks for the latest tick, lets the
+  WaterBudget pick which waiting zones may start, hands pump switches to
+  the PumpDispatcher as one batch and schedules each read zone's next poll;
+  a failed batch is retried with backoff. Zones whose pump switched are
+  checkpointed (pump state and last watering) so a restart resumes them
+- persistence: a BackgroundWriter batches readings and pump logs on its own
+  thread; control never blocks on its bounded queue, so when writes fall
+  behind rows are dropped and counted instead of stalling the event loop
+- maintenance: runs the daily retention cleanup in a worker thread
+- reload: when given a ZoneWatcher, picks up zones added, edited or removed
+  in the database every ``reload_interval`` seconds without a restart
+
+Each zone is polled at its own rate: fast while its pump runs, moderately
+when moisture is near the threshold, and at ``SENSOR_READING_INTERVAL``
+otherwise. Polls and the maintenance task are scheduled on the event loop's
+monotonic clock from their previous deadline rather than from when the work
+finished, so they do not drift; deadlines missed while overrunning are
+skipped and counted rather than run back to back.
+
+SIGINT/SIGTERM stop the runtime gracefully: the periodic tasks are
+cancelled and the writer drains everything already queued.
+"""
+
+import asyncio
+import datetime
+import signal
+
+import numpy as np
+
+from smart_gardening.actuators.dispatcher import PumpDispatcher
+from smart_gardening.actuators.pump import control_pumps
+from smart_gardening.config import Config
+from smart_gardening.core.budget import WaterBudget
+from smart_gardening.core.clock import system_clock
+from smart_gardening.core.scheduler import PollScheduler
+from smart_gardening.core.zone_table import ZoneTable
+from smart_gardening.db.database import SessionFactory, cleanup_old_sensor_readings
+from smart_gardening.db.writer import BackgroundWriter
+from smart_gardening.sensors.drivers import SensorBus, SensorDriver, SimulatedDriver
+
+CLEANUP_INTERVAL = 24 * 3600
+RETENTION_DAYS = 60
+
+
+def _utc(epoch):
+    """Epoch seconds (NaN for never) as the naive UTC datetime stored in the database"""
+    if np.isnan(epoch):
+        return None
+    return datetime.datetime.fromtimestamp(epoch, datetime.timezone.utc).replace(tzinfo=None)
+
+
+class ControlRuntime:
+    """Runs polling, control, persistence and maintenance as asyncio tasks."""
+
+    def __init__(self, zones, idle_interval=None, near_interval=None, active_interval=None, near_margin=None,
+                 flush_size=None, flush_interval=None, cleanup_interval=CLEANUP_INTERVAL,
+                 retention_days=RETENTION_DAYS, clock=None, session_factory=None,
+                 pump_driver=control_pumps, writer=None, sensors=None, budget=None,
+                 watcher=None, reload_interval=None, verbose=True):
+        """
+        :param zones: Zone objects to control; they are bound to a ZoneTable
+        :param idle_interval: Seconds between reads of a zone far from its threshold (defaults to Config)
+        :param near_interval: Seconds between reads of a zone near its threshold (defaults to Config)
+        :param active_interval: Seconds between reads of a zone whose pump runs (defaults to Config)
+        :param near_margin: Moisture points above threshold that count as near (defaults to Config)
+        :param flush_size: Rows that trigger a database write (defaults to Config)
+        :param flush_interval: Maximum seconds rows wait before being written (defaults to Config)
+        :param cleanup_interval: Seconds between retention cleanups (None to leave cleanup
+            to another process)
+        :param retention_days: Days of readings kept by the cleanup
+        :param clock: Clock for stored timestamps and pump timing (defaults to the system clock)
+        :param session_factory: Callable returning a new database session
+        :param pump_driver: Called with the ``(zone_id, on)`` commands of each tick that switches pumps
+        :param writer: BackgroundWriter for readings and pump logs (built from the flush
+            settings and ``session_factory`` by default)
+        :param sensors: SensorBus, or a single SensorDriver for every zone
+            (defaults to a SimulatedDriver)
+        :param budget: WaterBudget limiting concurrently running pumps (defaults to the
+            MAX_CONCURRENT_PUMPS and MAX_WATER_FLOW settings)
+        :param watcher: ZoneWatcher polled for zone changes (None keeps the zones fixed)
+        :param reload_interval: Seconds between watcher polls (defaults to Config; 0 disables)
+        :param verbose: Print pump switches and tick summaries
+        """
+        config = Config()
+        self.zones = list(zones)
+        self.clock = clock if clock is not None else system_clock
+        self.table = ZoneTable.from_zones(self.zones, clock=self.clock)
+        self.flow_rate = config.PUMP_FLOW_RATE
+        self.table.flow_rate[:] = self.flow_rate
+        self.budget = budget if budget is not None else WaterBudget(
+            max_pumps=config.MAX_CONCURRENT_PUMPS or None, max_flow=config.MAX_WATER_FLOW or None
+        )
+        if sensors is None:
+            sensors = SimulatedDriver()
+        self.sensors = SensorBus(sensors) if isinstance(sensors, SensorDriver) else sensors
+        self.idle_interval = idle_interval if idle_interval is not None else config.SENSOR_READING_INTERVAL
+        self.near_interval = near_interval if near_interval is not None else config.NEAR_THRESHOLD_POLL_INTERVAL
+        self.active_interval = active_interval if active_interval is not None else config.ACTIVE_POLL_INTERVAL
+        self.near_margin = near_margin if near_margin is not None else config.NEAR_THRESHOLD_MARGIN
+        self.scheduler = None
+        self.flush_size = flush_size if flush_size is not None else config.INGEST_FLUSH_SIZE
+        self.flush_interval = flush_interval if flush_interval is not None else config.INGEST_FLUSH_INTERVAL
+        self.cleanup_interval = cleanup_interval
+        self.retention_days = retention_days
+        self.session_factory = session_factory if session_factory is not None else SessionFactory
+        self.writer = writer if writer is not None else BackgroundWriter(
+            flush_size=self.flush_size, flush_interval=self.flush_interval, session_factory=self.session_factory
+        )
+        self.dispatcher = PumpDispatcher(pump_driver, log=self._log_pump_transitions, clock=self.clock)
+        self.dispatcher.seed({zone.id: on for zone, on in zip(self.zones, self.table.pump_on.tolist())})
+        self.watcher = watcher
+        self.reload_interval = reload_interval if reload_interval is not None else config.ZONE_RELOAD_INTERVAL
+        self.verbose = verbose
+
+        self._ticks = None
+        self._stop_event = None
+        self._rescheduled = None
+        self._unsaved = set()
+        # Bumped whenever rows of the table change meaning; reads started before are discarded
+        self._layout = 0
+        self._stats = {
+            'polls': 0,
+            'sensor_reads': 0,
+            'failed_reads': 0,
+            'control_ticks': 0,
+            'pump_starts': 0,
+            'pump_stops': 0,
+            'cleanups': 0,
+            'zone_reloads': 0,
+            'zones_added': 0,
+            'zones_updated': 0,
+            'zones_removed': 0,
+        }
+
+    def stats(self):
+        """Snapshot of the runtime counters, including the writer's"""
+        stats = dict(self._stats)
+        stats.update(self.writer.stats())
+        bus = self.sensors.stats()
+        stats['sensor_transactions'] = bus['transactions']
+        stats['sensor_timeouts'] = bus['timeouts']
+        stats['sensor_errors'] = bus['errors']
+        dispatcher = self.dispatcher.stats()
+        stats['pump_batches'] = dispatcher['batches']
+        stats['pump_failures'] = dispatcher['failures']
+        stats['pending_pump_commands'] = dispatcher['pending']
+        stats['pumps_deferred'] = self.budget.deferred
+        stats['pumps_waiting'] = len(self.budget.queue())
+        stats['pending_rows'] = stats['queue_depth']
+        stats['missed_polls'] = self.scheduler.missed if self.scheduler is not None else 0
+        return stats
+
+    def stop(self):
+        """Ask a running runtime to shut down gracefully"""
+        if self._stop_event is not None:
+            self._stop_event.set()
+
+    async def run(self, duration=None):
+        """
+        Run until stop() is called, a signal arrives, or ``duration`` seconds pass.
+
+        Returns:
+            dict: Final runtime stats
+        """
+        loop = asyncio.get_running_loop()
+        self._ticks = asyncio.Queue(maxsize=1)
+        self._stop_event = asyncio.Event()
+        self._rescheduled = asyncio.Event()
+        self.scheduler = PollScheduler(len(self.table), self.idle_interval, self.near_interval,
+                                       self.active_interval, self.near_margin, start=loop.time())
+
+        installed = []
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(sig, self.stop)
+                installed.append(sig)
+            except (NotImplementedError, RuntimeError, ValueError):
+                # Not supported on this platform or outside the main thread
+                pass
+
+        self.writer.start()
+        periodic = [
+            asyncio.create_task(self._poll(), name='polling'),
+            asyncio.create_task(self._control(), name='control'),
+        ]
+        if self.cleanup_interval is not None:
+            periodic.append(asyncio.create_task(self._maintain(), name='maintenance'))
+        if self.watcher is not None and self.reload_interval:
+            periodic.append(asyncio.create_task(self._reload(), name='reload'))
+        try:
+            if duration is None:
+                await self._stop_event.wait()
+            else:
+                try:
+                    await asyncio.wait_for(self._stop_event.wait(), timeout=duration)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            for task in periodic:
+                task.cancel()
+            await asyncio.gather(*periodic, return_exceptions=True)
+            await self.sensors.close()
+            # Readings polled but not yet handled by control still count
+            while not self._ticks.empty():
+                self._handle_tick(self._ticks.get_nowait())
+            # One last attempt at pump commands still waiting for a retry
+            self.dispatcher.dispatch(force=True)
+            # Let the writer write everything queued before it exits
+            await asyncio.to_thread(self.writer.stop)
+            for sig in installed:
+                loop.remove_signal_handler(sig)
+
+        return self.stats()
+
+    async def _every(self, interval):
+        """Yield at a fixed rate, compensating for the time spent between yields."""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time()
+        while True:
+            yield
+            deadline += interval
+            lag = loop.time() - deadline
+            if lag > 0:
+                # Overran one or more periods: skip them instead of bursting
+                deadline += (int(lag // interval) + 1) * interval
+            await asyncio.sleep(deadline - loop.time())
+
+    async def _poll(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            # Re-read every pass: a zone reload replaces the table and the schedule
+            scheduler = self.scheduler
+            table = self.table
+            layout = self._layout
+            rows = scheduler.pop_due(loop.time())
+            if len(rows):
+                moisture, ph = await self.sensors.read([self.zones[row].id for row in rows.tolist()])
+                if layout != self._layout:
+                    # Rows were renumbered while the read was in flight; the new schedule polls them again
+                    continue
+                read = np.isfinite(moisture) & np.isfinite(ph)
+                if not read.all():
+                    # Zones whose driver timed out or failed keep their last reading
+                    scheduler.reschedule(table, rows[~read], loop.time())
+                    self._stats['failed_reads'] += int((~read).sum())
+                rows = rows[read]
+                table.moisture[rows] = moisture[read]
+                table.ph[rows] = ph[read]
+                self._stats['polls'] += 1
+                self._stats['sensor_reads'] += len(rows)
+            if len(rows):
+                if self._ticks.full():
+                    # Control has not taken the previous tick yet: fold its rows into this one
+                    rows = np.union1d(self._ticks.get_nowait()[2], rows)
+                self._ticks.put_nowait((self.clock.now(), self.clock.utcnow().replace(tzinfo=None), rows))
+
+            # Sleep until the next zone is due, or until control reschedules zones
+            self._rescheduled.clear()
+            next_due = scheduler.next_due()
+            timeout = None if next_due is None else max(0.0, next_due - loop.time())
+            try:
+                await asyncio.wait_for(self._rescheduled.wait(), timeout=timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _control(self):
+        while True:
+            # Wake up for a pending pump retry even if no reading arrives
+            try:
+                tick = await asyncio.wait_for(self._ticks.get(), timeout=self.dispatcher.retry_in())
+            except asyncio.TimeoutError:
+                self.dispatcher.dispatch()
+                continue
+            self._handle_tick(tick)
+
+    def _handle_tick(self, tick):
+        loop = asyncio.get_running_loop()
+        table = self.table
+        now, captured_at, rows = tick
+
+        for row in rows.tolist():
+            zone = self.zones[row]
+            self.writer.enqueue_reading(zone.id, zone.moisture, zone.ph, timestamp=captured_at, block=False)
+
+        to_stop = table.deactivate_mask(now)
+        table.stop_pumps(to_stop, now)
+        # Stopped pumps free budget before waiting zones are admitted
+        to_start = self.budget.admit(table, table.activate_mask(now), now)
+        table.start_pumps(to_start, now)
+        self._switch_pumps(to_stop, False, captured_at)
+        self._switch_pumps(to_start, True, captured_at)
+        self.dispatcher.dispatch()
+        self._checkpoint((to_stop | to_start).nonzero()[0])
+        self._stats['control_ticks'] += 1
+
+        # Read zones go back on the heap; zones whose pump just switched are polled sooner
+        self.scheduler.reschedule(table, rows, loop.time())
+        self.scheduler.expedite(table, (to_stop | to_start).nonzero()[0], loop.time())
+        self._rescheduled.set()
+
+        if self.verbose:
+            running = int(table.pump_on.sum())
+            print(f"--- Tick at {now.strftime('%Y-%m-%d %H:%M:%S')}: {len(rows)} zones read, "
+                  f"{running}/{len(table)} pumps running, {self.writer.queue_depth()} rows pending ---")
+
+    def _switch_pumps(self, mask, on, captured_at):
+        for row in mask.nonzero()[0]:
+            zone = self.zones[row]
+            self.dispatcher.command(zone.id, on, timestamp=captured_at)
+            self._stats['pump_starts' if on else 'pump_stops'] += 1
+            if self.verbose:
+                print(f"Zone {zone.name}: Pump {'started' if on else 'stopped'} - "
+                      f"Moisture={zone.moisture}%, pH={zone.ph}")
+
+    def _checkpoint(self, rows):
+        # Only zones that switched this tick; a checkpoint dropped by a full queue is retried next tick
+        table = self.table
+        self._unsaved.update(rows.tolist())
+        for row in sorted(self._unsaved):
+            if self.writer.enqueue_pump_state(self.zones[row].id, bool(table.pump_on[row]),
+                                              _utc(table.pump_start[row]), _utc(table.last_watered[row]),
+                                              block=False):
+                self._unsaved.discard(row)
+
+    def _log_pump_transitions(self, rows):
+        for row in rows:
+            self.writer.enqueue_pump_log(row['zone_id'], row['status'], timestamp=row['timestamp'], block=False)
+
+    async def _reload(self):
+        while True:
+            await asyncio.sleep(self.reload_interval)
+            try:
+                changed, removed = await asyncio.to_thread(self.watcher.poll)
+            except Exception as e:
+                print(f"Zone reload failed: {e}")
+                continue
+            if changed or removed:
+                self.apply_zone_changes(changed, removed)
+
+    def apply_zone_changes(self, changed, removed=()):
+        """
+        Add, reconfigure and remove zones of a running runtime.
+
+        Zones already controlled keep their readings and pump state and only
+        take the new name, plant type, moisture threshold and pH range. New
+        zones join with the state they were loaded with. A removed zone's pump
+        is switched off and checkpointed as off.
+
+        :param changed: Zone objects for inserted or updated zones (see ZoneWatcher.poll)
+        :param removed: Ids of zones to stop controlling
+        """
+        loop = asyncio.get_running_loop()
+        rows = {zone.id: row for row, zone in enumerate(self.zones)}
+        added = []
+        for zone in changed:
+            row = rows.get(zone.id)
+            if row is None:
+                added.append(zone)
+                continue
+            current = self.zones[row]
+            current.name = zone.name
+            current.plant_type = zone.plant_type
+            current.moisture_threshold = zone.moisture_threshold
+            current.ph_range = zone.ph_range
+            self._stats['zones_updated'] += 1
+        removed = [zone_id for zone_id in removed if zone_id in rows]
+        self._stats['zone_reloads'] += 1
+        if not added and not removed:
+            return
+
+        # Finish the tick already read against the old rows before they are renumbered
+        while not self._ticks.empty():
+            self._handle_tick(self._ticks.get_nowait())
+        for zone_id in removed:
+            row = rows[zone_id]
+            if self.table.pump_on[row]:
+                self.dispatcher.command(zone_id, False)
+            self.writer.enqueue_pump_state(zone_id, False, block=False)
+        self.dispatcher.dispatch()
+
+        gone = set(removed)
+        unsaved = {self.zones[row].id for row in self._unsaved} - gone
+        keep = [row for row, zone in enumerate(self.zones) if zone.id not in gone]
+        self.zones = [self.zones[row] for row in keep] + added
+        self._unsaved = {row for row, zone in enumerate(self.zones) if zone.id in unsaved}
+        self.table = ZoneTable.from_zones(self.zones, clock=self.clock)
+        self.table.flow_rate[:] = self.flow_rate
+        self.dispatcher.seed({zone.id: on for zone, on in zip(added, self.table.pump_on[len(keep):].tolist())})
+        if self.scheduler is not None:
+            self.scheduler = self.scheduler.resized(keep, len(self.table), loop.time())
+        self._layout += 1
+        self._stats['zones_added'] += len(added)
+        self._stats['zones_removed'] += len(removed)
+        self._rescheduled.set()
+        if self.verbose:
+            print(f"🔄 Zones reloaded: {len(added)} added, {len(removed)} removed, {len(self.zones)} controlled")
+
+    async def _maintain(self):
+        loop = asyncio.get_running_loop()
+        # The first cleanup runs one interval after start-up, as in the old loop
+        await asyncio.sleep(self.cleanup_interval)
+        async for _ in self._every(self.cleanup_interval):
+            now = self.clock.utcnow()
+            started = loop.time()
+            deleted = await asyncio.to_thread(self._cleanup, now)
+            self._stats['cleanups'] += 1
+            if self.verbose:
+                print(f"🧹 Cleanup removed {deleted} old records in {loop.time() - started:.1f}s")
+
+    def _cleanup(self, now):
+        db_session = self.session_factory()
+        try:
+            # Short batches with a pause between them so flushes are not locked out
+            return cleanup_old_sensor_readings(self.retention_days, db_session=db_session, pause=0.05, now=now)
+        finally:
+            db_session.close()
@@ -0,0 +1,159 @@
+"""
+Asynchronous sensor drivers with batch reads.
+
+Real sensor buses (I2C multiplexers, Modbus, serial or TCP gateways) return
+many channels per transaction and take time to answer, so a driver reads a
+batch of zones in one awaitable call:
+
+    moisture, ph = await driver.read_many(zone_ids)
+
+Both arrays line up with ``zone_ids``; a zone the driver could not read is
+NaN. Each driver declares how many transactions it accepts at once
+(``max_concurrency``), how long one may take (``timeout``) and how many zones
+fit in one transaction (``batch_size``). SensorBus routes zones to their
+driver and enforces those limits, so one slow or failing bus only costs its
+own zones a reading.
+"""
+
+import abc
+import asyncio
+
+import numpy as np
+
+from smart_gardening.simulator.simulator import MOISTURE_RANGE, PH_RANGE, _fill_uniform
+
+
+class SensorDriver(abc.ABC):
+    """Interface shared by all sensor drivers."""
+
+    def __init__(self, max_concurrency=1, timeout=5.0, batch_size=None):
+        """
+        :param max_concurrency: Transactions the bus accepts at the same time
+        :param timeout: Seconds one ``read_many`` call may take before it is abandoned
+        :param batch_size: Most zones per transaction (None for no limit)
+        """
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self.batch_size = batch_size
+
+    @abc.abstractmethod
+    async def read_many(self, zone_ids):
+        """
+        Read moisture and pH for ``zone_ids`` in one transaction.
+
+        Returns:
+            tuple: (moisture, ph) float arrays aligned with ``zone_ids``, NaN where unread
+        """
+
+    async def close(self):
+        """Release the driver's connections"""
+
+
+class SimulatedDriver(SensorDriver):
+    """Driver returning uniform random readings after an optional bus latency."""
+
+    def __init__(self, seed=None, latency=0.0, max_concurrency=1, timeout=5.0, batch_size=None):
+        """
+        :param seed: Seed for the NumPy Generator
+        :param latency: Seconds each transaction takes
+        """
+        super().__init__(max_concurrency, timeout, batch_size)
+        self.rng = np.random.default_rng(seed)
+        self.latency = latency
+        self.transactions = 0
+
+    async def read_many(self, zone_ids):
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        self.transactions += 1
+        size = len(zone_ids)
+        moisture = _fill_uniform(self.rng, np.empty(size), *MOISTURE_RANGE)
+        ph = _fill_uniform(self.rng, np.empty(size), *PH_RANGE)
+        return moisture, ph
+
+
+class SensorBus:
+    """Routes batch reads to each zone's driver within the driver's limits."""
+
+    def __init__(self, default_driver, routes=None):
+        """
+        :param default_driver: Driver for zones without a route
+        :param routes: Optional mapping of zone id to the driver that reads it
+        """
+        self.default_driver = default_driver
+        self.routes = dict(routes or {})
+        self._semaphores = {}
+        self._stats = {
+            'transactions': 0,
+            'timeouts': 0,
+            'errors': 0,
+            'failed_reads': 0,
+        }
+
+    @property
+    def drivers(self):
+        """Every driver on the bus, default first"""
+        drivers = [self.default_driver]
+        for driver in self.routes.values():
+            if all(driver is not known for known in drivers):
+                drivers.append(driver)
+        return drivers
+
+    def stats(self):
+        """Snapshot of transaction, timeout and error counters"""
+        return dict(self._stats)
+
+    async def read(self, zone_ids):
+        """
+        Read every zone in ``zone_ids`` through its driver.
+
+        Zones are grouped per driver and split into ``batch_size`` chunks; the
+        chunks of one driver run at most ``max_concurrency`` at a time and
+        different drivers run concurrently. A chunk that times out or raises
+        leaves its zones NaN.
+
+        Returns:
+            tuple: (moisture, ph) float arrays aligned with ``zone_ids``
+        """
+        moisture = np.full(len(zone_ids), np.nan)
+        ph = np.full(len(zone_ids), np.nan)
+
+        groups = {}
+        for index, zone_id in enumerate(zone_ids):
+            driver = self.routes.get(zone_id, self.default_driver)
+            groups.setdefault(id(driver), (driver, []))[1].append(index)
+
+        chunks = []
+        for driver, indexes in groups.values():
+            step = driver.batch_size or len(indexes)
+            for start in range(0, len(indexes), step):
+                chunks.append((driver, np.array(indexes[start:start + step], dtype=np.intp)))
+
+        results = await asyncio.gather(*(
+            self._read_chunk(driver, [zone_ids[index] for index in indexes]) for driver, indexes in chunks
+        ))
+        for (driver, indexes), result in zip(chunks, results):
+            if result is not None:
+                moisture[indexes], ph[indexes] = result
+        self._stats['failed_reads'] += int(np.isnan(moisture).sum())
+        return moisture, ph
+
+    async def close(self):
+        """Close every driver on the bus"""
+        for driver in self.drivers:
+            await driver.close()
+
+    async def _read_chunk(self, driver, zone_ids):
+        semaphore = self._semaphores.get(id(driver))
+        if semaphore is None:
+            semaphore = self._semaphores[id(driver)] = asyncio.Semaphore(driver.max_concurrency)
+        async with semaphore:
+            self._stats['transactions'] += 1
+            try:
+                return await asyncio.wait_for(driver.read_many(zone_ids), timeout=driver.timeout)
+            except asyncio.TimeoutError:
+                self._stats['timeouts'] += 1
+            except Exception as e:
+                self._stats['errors'] += 1
+                print(f"Sensor read failed for {len(zone_ids)} zones: {e}")
+        return None
@@ -0,0 +1,130 @@
+"""
+TCP sensor gateway driver and a local fake gateway.
+
+Serial-to-TCP gateways expose a bus of sensor channels over a socket. The
+line protocol used here is one request and one response per transaction:
+
+    READ A,B,C
+    A=45.12/6.51;B=38.90/6.80;C=ERR
+
+Values are ``moisture/ph``; ``ERR`` marks a channel that did not answer.
+A request the gateway cannot parse gets ``ERR <message>``.
+
+FakeGateway serves that protocol on localhost with random readings and a
+configurable latency, as a stand-in for hardware in tests and local runs.
+"""
+
+import asyncio
+
+import numpy as np
+
+from smart_gardening.sensors.drivers import SensorDriver
+from smart_gardening.simulator.simulator import MOISTURE_RANGE, PH_RANGE
+
+
+class GatewayError(Exception):
+    """The gateway rejected a request."""
+
+
+class GatewayDriver(SensorDriver):
+    """Reads zones through a TCP sensor gateway, one connection per transaction."""
+
+    def __init__(self, host, port, max_concurrency=4, timeout=2.0, batch_size=64):
+        """
+        :param host: Gateway host name or address
+        :param port: Gateway TCP port
+        """
+        super().__init__(max_concurrency, timeout, batch_size)
+        self.host = host
+        self.port = port
+
+    async def read_many(self, zone_ids):
+        reader, writer = await asyncio.open_connection(self.host, self.port)
+        try:
+            writer.write(f"READ {','.join(str(zone_id) for zone_id in zone_ids)}\n".encode())
+            await writer.drain()
+            line = (await reader.readline()).decode().strip()
+        finally:
+            writer.close()
+            await writer.wait_closed()
+        return self._parse(line, zone_ids)
+
+    @staticmethod
+    def _parse(line, zone_ids):
+        if not line or line.startswith('ERR'):
+            raise GatewayError(line or "connection closed")
+        values = {}
+        for item in line.split(';'):
+            channel, _, value = item.partition('=')
+            if value != 'ERR':
+                moisture, _, ph = value.partition('/')
+                values[channel] = (float(moisture), float(ph))
+
+        moisture = np.full(len(zone_ids), np.nan)
+        ph = np.full(len(zone_ids), np.nan)
+        for index, zone_id in enumerate(zone_ids):
+            reading = values.get(str(zone_id))
+            if reading is not None:
+                moisture[index], ph[index] = reading
+        return moisture, ph
+
+
+class FakeGateway:
+    """Local TCP server speaking the gateway protocol with random readings."""
+
+    def __init__(self, host='127.0.0.1', port=0, latency=0.0, seed=None, failing_channels=()):
+        """
+        :param host: Address to listen on
+        :param port: Port to listen on (0 picks a free port)
+        :param latency: Seconds each transaction takes
+        :param seed: Seed for the NumPy Generator
+        :param failing_channels: Zone ids answered with ``ERR``
+        """
+        self.host = host
+        self.port = port
+        self.latency = latency
+        self.rng = np.random.default_rng(seed)
+        self.failing_channels = {str(channel) for channel in failing_channels}
+        self.transactions = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._server = None
+
+    async def start(self):
+        """Start listening; ``port`` holds the bound port afterwards"""
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    async def stop(self):
+        """Stop listening and close the server"""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def _handle(self, reader, writer):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            request = (await reader.readline()).decode().strip()
+            if self.latency:
+                await asyncio.sleep(self.latency)
+            command, _, channels = request.partition(' ')
+            if command != 'READ' or not channels:
+                response = f"ERR bad request {request!r}"
+            else:
+                response = ';'.join(self._reading(channel) for channel in channels.split(','))
+            self.transactions += 1
+            writer.write(f"{response}\n".encode())
+            await writer.drain()
+        finally:
+            self.in_flight -= 1
+            writer.close()
+
+    def _reading(self, channel):
+        if channel in self.failing_channels:
+            return f"{channel}=ERR"
+        moisture = self.rng.uniform(*MOISTURE_RANGE)
+        ph = self.rng.uniform(*PH_RANGE)
+        return f"{channel}={moisture:.2f}/{ph:.2f}"
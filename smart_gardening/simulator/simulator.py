@@ -1,17 +1,70 @@
 import random
+
+import numpy as np
+import pandas as pd
+
 from smart_gardening.core.zone import Zone
+from smart_gardening.core.zone_table import ZoneTable, pump_is_on
+
+MOISTURE_RANGE = (20, 80)
+PH_RANGE = (5.5, 7.5)
+
+
+def _fill_uniform(rng, out, low, high):
+    """Fill ``out`` in place with uniform values in [low, high) rounded to 2 decimals."""
+    rng.random(out=out)
+    out *= high - low
+    out += low
+    np.round(out, 2, out=out)
+    return out
+
 
 class SensorSimulator:
-    def __init__(self, zones) -> None:
+    def __init__(self, zones, seed=None) -> None:
         """
-        :param zones: List of zone Objects
+        :param zones: List of zone Objects, or a ZoneTable for batch simulation
+        :param seed: Seed for the NumPy Generator used by the batch mode
         """
         self.zones = zones
+        self.rng = np.random.default_rng(seed)
+
+    def simulate(self, rows=None):
+        """
+        Draw new readings for every zone, or only for ``rows`` (indexes into zones).
+        """
+        if isinstance(self.zones, ZoneTable):
+            self.simulate_batch(rows=rows)
+            return
+        zones = self.zones if rows is None else [self.zones[row] for row in rows]
+        for zone in zones:
+            zone.moisture = round(random.uniform(*MOISTURE_RANGE), 2)
+            zone.ph = round(random.uniform(*PH_RANGE), 2)
+
+    def simulate_batch(self, size=None, rows=None):
+        """
+        Draw moisture and pH readings for many zones in one call.
+
+        With a ZoneTable the table's arrays are filled in place (only at
+        ``rows`` if given); otherwise ``size`` new arrays are returned without
+        touching any Zone objects.
 
-    def simulate(self):
-        for zone in self.zones:
-            zone.moisture = round(random.uniform(20, 80), 2)
-            zone.ph = round(random.uniform(5.5, 7.5), 2)
+        :param size: Number of zones (only used without a ZoneTable)
+        :param rows: Table rows to refresh (defaults to all)
+        :return: (moisture, ph) arrays
+        """
+        table = self.zones if isinstance(self.zones, ZoneTable) else None
+        if table is not None and rows is None:
+            moisture, ph = table.moisture, table.ph
+        else:
+            if size is None:
+                size = len(rows) if rows is not None else len(self.zones)
+            moisture, ph = np.empty(size), np.empty(size)
+        _fill_uniform(self.rng, moisture, *MOISTURE_RANGE)
+        _fill_uniform(self.rng, ph, *PH_RANGE)
+        if table is not None and rows is not None:
+            table.moisture[rows] = moisture
+            table.ph[rows] = ph
+        return moisture, ph
 
     def get_data(self):
         return [
@@ -24,6 +77,137 @@ class SensorSimulator:
             for zone in self.zones
         ]
 
+    def get_arrays(self):
+        """Current readings as column arrays instead of one dict per zone"""
+        if isinstance(self.zones, ZoneTable):
+            return {
+                "zone": self.zones.ids,
+                "moisture": self.zones.moisture,
+                "ph": self.zones.ph,
+                "pump_status": self.zones.pump_on,
+            }
+        return {
+            "zone": np.array([zone.name for zone in self.zones], dtype=object),
+            "moisture": np.array([zone.moisture for zone in self.zones], dtype=np.float64),
+            "ph": np.array([zone.ph for zone in self.zones], dtype=np.float64),
+            "pump_status": np.array([pump_is_on(zone.pump_status) for zone in self.zones], dtype=bool),
+        }
+
+    def get_frame(self):
+        """Current readings as a DataFrame with one row per zone"""
+        return pd.DataFrame(self.get_arrays())
+
+class SoilModel:
+    """
+    Stateful soil moisture and pH model for every zone in a ZoneTable.
+
+    True moisture decays exponentially through evaporation and rises at a
+    fixed rate while the zone's pump is on (capped at saturation). pH follows
+    a mean-reverting random walk around each zone's starting value and is
+    pulled towards the irrigation water's pH while watering. Each step writes
+    noisy sensor readings into the table, so the automation logic sees the
+    effect of its own ``start_pump``/``stop_pump`` calls.
+
+    Both processes are integrated exactly over the step, so large steps stay
+    stable and a whole season can be simulated with coarse ticks.
+    """
+
+    def __init__(self, table, seed=None, evaporation_per_hour=0.02, inflow_per_minute=1.0,
+                 saturation=100.0, sensor_noise=0.5, ph_reversion_per_hour=0.05,
+                 ph_volatility=0.02, water_ph=7.0):
+        """
+        :param table: ZoneTable whose readings and pump states drive the model
+        :param seed: Seed for the noise Generator
+        :param evaporation_per_hour: Fraction of moisture lost per hour
+        :param inflow_per_minute: Moisture percentage points added per pump minute
+        :param saturation: Upper bound for soil moisture
+        :param sensor_noise: Standard deviation of moisture sensor noise
+        :param ph_reversion_per_hour: Rate pH returns to its target
+        :param ph_volatility: pH random walk per square-root hour
+        :param water_ph: pH of the irrigation water
+        """
+        self.table = table
+        self.rng = np.random.default_rng(seed)
+        self.evaporation = evaporation_per_hour / 3600.0
+        self.inflow = inflow_per_minute / 60.0
+        self.saturation = saturation
+        self.sensor_noise = sensor_noise
+        self.ph_reversion = ph_reversion_per_hour / 3600.0
+        self.ph_volatility = ph_volatility / np.sqrt(3600.0)
+        self.water_ph = water_ph
+
+        self.soil_moisture = np.where(np.isnan(table.moisture), 50.0, table.moisture)
+        self.soil_ph = np.where(np.isnan(table.ph), 6.5, table.ph)
+        self.baseline_ph = self.soil_ph.copy()
+        self._noise = np.empty(len(table))
+
+    def step(self, seconds):
+        """Advance the soil state by ``seconds`` and write new sensor readings."""
+        pump_on = self.table.pump_on
+
+        # dm/dt = -k*m + inflow*pump  =>  m' = m*e^(-k*dt) + inflow/k*(1 - e^(-k*dt)),
+        # which tends to m + inflow*dt as k -> 0
+        decay = np.exp(-self.evaporation * seconds)
+        if self.evaporation > 0:
+            gain = self.inflow * -np.expm1(-self.evaporation * seconds) / self.evaporation
+        else:
+            gain = self.inflow * seconds
+        self.soil_moisture *= decay
+        self.soil_moisture[pump_on] += gain
+        np.minimum(self.soil_moisture, self.saturation, out=self.soil_moisture)
+
+        # Ornstein-Uhlenbeck step towards the baseline, or the water pH while watering;
+        # without reversion it is a plain random walk with spread volatility*sqrt(dt)
+        target = np.where(pump_on, self.water_ph, self.baseline_ph)
+        reversion = np.exp(-self.ph_reversion * seconds)
+        if self.ph_reversion > 0:
+            spread = self.ph_volatility * np.sqrt(-np.expm1(-2.0 * self.ph_reversion * seconds)
+                                                  / (2.0 * self.ph_reversion))
+        else:
+            spread = self.ph_volatility * np.sqrt(seconds)
+        self.soil_ph = target + (self.soil_ph - target) * reversion
+        self.soil_ph += spread * self.rng.standard_normal(len(self.soil_ph))
+
+        self.rng.standard_normal(out=self._noise)
+        self._noise *= self.sensor_noise
+        self._noise += self.soil_moisture
+        np.clip(self._noise, 0.0, self.saturation, out=self._noise)
+        np.round(self._noise, 2, out=self.table.moisture)
+        np.round(self.soil_ph, 2, out=self.table.ph)
+
+    def run(self, clock, duration, tick_seconds=300, control=True, callback=None, budget=None):
+        """
+        Simulate ``duration`` seconds in ticks, optionally running the pump logic.
+
+        :param clock: VirtualClock providing the simulated time
+        :param duration: Seconds of simulated time
+        :param tick_seconds: Simulated seconds per tick
+        :param control: Start and stop pumps with the ZoneTable masks each tick
+        :param callback: Called as ``callback(now, table)`` after every tick
+        :param budget: Optional WaterBudget deciding which zones may start
+        :return: dict with tick count, pump starts and pump-on seconds
+        """
+        table = self.table
+        stats = {'ticks': 0, 'pump_starts': 0, 'pump_seconds': 0.0}
+        for _ in range(int(duration // tick_seconds)):
+            self.step(tick_seconds)
+            stats['pump_seconds'] += tick_seconds * int(table.pump_on.sum())
+            if control:
+                now = clock.time()
+                to_stop = table.deactivate_mask(now)
+                table.stop_pumps(to_stop, now)
+                to_start = table.activate_mask(now)
+                if budget is not None:
+                    to_start = budget.admit(table, to_start, now)
+                table.start_pumps(to_start, now)
+                stats['pump_starts'] += int(to_start.sum())
+            if callback is not None:
+                callback(clock.now(), table)
+            clock.sleep(tick_seconds)
+            stats['ticks'] += 1
+        return stats
+
+
 def get_default_zones():
     return [
         Zone(id="A", name="Zone A", moisture_threshold=40, ph_range=(6.0, 7.0), plant_type=["Cactus", "Spider Lily"], moisture=5, ph=7, pump_status=False),
@@ -0,0 +1,364 @@
+"""
+Multi-process supervisor for the control loop.
+
+Zones are partitioned across ``shards`` worker processes by a stable hash
+of their id (CRC-32, so the assignment is the same on every run and every
+machine). Each worker runs its own ControlRuntime with its own database
+engine and BackgroundWriter, so a slow sensor or a stalled write only
+affects the zones of that shard, and the shards use separate cores. Only
+the first shard with zones runs the retention cleanup, so the workers do
+not contend for the database with the same full-table deletes. Workers
+are started with the ``spawn`` method, so they never inherit locks held by
+threads of the supervisor.
+
+The supervisor restarts workers that exit unexpectedly and collects the
+stats each worker reports every ``report_interval`` seconds. Counters of
+a worker that crashed are carried over, so per-shard totals keep growing
+across restarts.
+
+``MAX_CONCURRENT_PUMPS`` and ``MAX_WATER_FLOW`` limit the whole supply line,
+so they are split between the shards in proportion to their zone counts
+(flow in whole pumps' worth of ``PUMP_FLOW_RATE``); the shards' budgets
+never add up to more than the configured limit.
+
+With a ``reload_interval`` every worker loads its own zones from the
+database when it starts (so a restarted worker resumes from the last
+checkpoint rather than the zones it was first given) and follows zones
+added, edited or removed through a ZoneWatcher restricted to its shard.
+All shards are started then, and a shard without zones yet still gets a
+share of the budget for the zones that may be added to it.
+"""
+
+import asyncio
+import functools
+import multiprocessing
+import os
+import queue
+import signal
+import time
+import warnings
+import zlib
+
+from sqlalchemy.orm import sessionmaker
+
+from smart_gardening.config import Config
+from smart_gardening.core.budget import WaterBudget
+from smart_gardening.db.database import create_db_engine
+from smart_gardening.db.repository import ZoneWatcher
+from smart_gardening.runtime import ControlRuntime
+
+# Runtime counters that are summed across restarts and shards
+COUNTERS = (
+    'polls', 'sensor_reads', 'failed_reads', 'control_ticks', 'pump_starts', 'pump_stops', 'cleanups',
+    'enqueued', 'dropped', 'readings_written', 'pump_logs_written', 'flushes', 'failed_flushes',
+    'missed_polls', 'pumps_deferred',
+)
+
+
+def shard_for(zone_id, shards):
+    """Shard index of ``zone_id``; stable across processes and runs."""
+    return zlib.crc32(str(zone_id).encode('utf-8')) % shards
+
+
+def partition_zones(zones, shards):
+    """Split ``zones`` into ``shards`` lists by the hash of their id."""
+    partitions = [[] for _ in range(shards)]
+    for zone in zones:
+        partitions[shard_for(zone.id, shards)].append(zone)
+    return partitions
+
+
+def _apportion(total, weights):
+    """Split the integer ``total`` in proportion to ``weights`` by largest remainder."""
+    weight_sum = sum(weights)
+    if weight_sum == 0:
+        return [0] * len(weights)
+    exact = [total * weight / weight_sum for weight in weights]
+    shares = [int(value) for value in exact]
+    by_remainder = sorted(range(len(weights)), key=lambda i: exact[i] - shares[i], reverse=True)
+    for i in by_remainder[:total - sum(shares)]:
+        shares[i] += 1
+    return shares
+
+
+def split_budget(partitions, max_pumps=None, max_flow=None, flow_rate=10.0):
+    """
+    One WaterBudget per shard whose limits add up to at most the global ones.
+
+    :param partitions: Zones of each shard, as returned by partition_zones
+    :param max_pumps: Global limit on running pumps (None for no limit)
+    :param max_flow: Global limit on litres per minute (None for no limit)
+    :param flow_rate: Litres per minute drawn by one pump
+    :return: List of WaterBudget, one per shard
+    """
+    weights = [len(zones) for zones in partitions]
+    pumps = [None] * len(partitions)
+    flows = [None] * len(partitions)
+    if max_pumps is not None:
+        pumps = _apportion(max_pumps, weights)
+    if max_flow is not None:
+        # Whole pumps' worth of flow, so every share can actually run a pump
+        units = _apportion(int(max_flow // flow_rate), weights)
+        flows = [unit * flow_rate for unit in units]
+
+    budgets = []
+    for pump_share, flow_share in zip(pumps, flows):
+        if flow_share == 0:
+            # Not even one pump's flow left for this shard
+            budgets.append(WaterBudget(max_pumps=0))
+        else:
+            budgets.append(WaterBudget(max_pumps=pump_share, max_flow=flow_share))
+
+    starved = sum(1 for weight, budget in zip(weights, budgets) if weight and budget.max_pumps == 0)
+    if starved:
+        warnings.warn(f"The pump budget is too small to give every shard a pump; "
+                      f"{starved} of {sum(1 for weight in weights if weight)} shards cannot water")
+    return budgets
+
+
+def _in_shard(shard, shards, zone_id):
+    return shard_for(zone_id, shards) == shard
+
+
+def _run_shard(shard, zones, database_url, reports, report_interval, runtime_options, shards=None):
+    """Worker process entry point: run one shard's runtime and report its stats."""
+    # Drop the supervisor's handlers inherited through fork; the runtime installs its own
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    signal.signal(signal.SIGINT, signal.default_int_handler)
+    # Never reuse connections inherited from the parent process
+    session_factory = sessionmaker(bind=create_db_engine(database_url))
+    if shards is not None:
+        # This shard's zones with their checkpointed state, then every change to them
+        watcher = ZoneWatcher(session_factory, zone_filter=functools.partial(_in_shard, shard, shards))
+        zones = watcher.load()
+        runtime_options = dict(runtime_options, watcher=watcher)
+    runtime = ControlRuntime(zones, session_factory=session_factory, **runtime_options)
+    pid = os.getpid()
+
+    async def report():
+        while True:
+            await asyncio.sleep(report_interval)
+            reports.put((shard, pid, runtime.stats()))
+
+    async def main():
+        reporter = asyncio.create_task(report())
+        try:
+            return await runtime.run()
+        finally:
+            reporter.cancel()
+
+    stats = asyncio.run(main())
+    reports.put((shard, pid, stats))
+
+
+class ShardSupervisor:
+    """Runs one ControlRuntime per shard in a worker process and restarts crashed workers."""
+
+    def __init__(self, zones, shards=None, database_url=None, report_interval=5.0, restart_delay=1.0,
+                 max_restarts=None, runtime_options=None, max_pumps=None, max_flow=None, reload_interval=None):
+        """
+        :param zones: Zone objects to partition across the workers
+        :param shards: Number of worker processes (defaults to the CPU count)
+        :param database_url: Database each worker connects to (defaults to Config)
+        :param report_interval: Seconds between stats reports from each worker
+        :param restart_delay: Seconds to wait before restarting a worker that exited
+        :param max_restarts: Restarts allowed per shard before it is left down (None for no limit)
+        :param runtime_options: Extra keyword arguments for every worker's ControlRuntime
+        :param max_pumps: Pumps allowed to run at once across all shards (defaults to Config)
+        :param max_flow: Litres per minute allowed across all shards (defaults to Config)
+        :param reload_interval: Seconds between zone reloads in each worker; None (the default)
+            keeps every worker on the zones given here
+        """
+        config = Config()
+        self.shards = shards if shards is not None else (os.cpu_count() or 1)
+        self.partitions = partition_zones(zones, self.shards)
+        self.database_url = database_url
+        self.report_interval = report_interval
+        self.restart_delay = restart_delay
+        self.max_restarts = max_restarts
+        self.runtime_options = dict(runtime_options or {})
+        self.reload_interval = reload_interval or None
+        if self.reload_interval is not None:
+            self.runtime_options['reload_interval'] = self.reload_interval
+        self.budgets = split_budget(
+            # Reloading shards may gain zones later, so an empty one still counts as one zone
+            self.partitions if self.reload_interval is None else [zones or [None] for zones in self.partitions],
+            max_pumps=max_pumps if max_pumps is not None else (config.MAX_CONCURRENT_PUMPS or None),
+            max_flow=max_flow if max_flow is not None else (config.MAX_WATER_FLOW or None),
+            flow_rate=config.PUMP_FLOW_RATE,
+        )
+
+        self._context = multiprocessing.get_context('spawn')
+        self._reports = self._context.Queue()
+        self._stopping = False
+        self._started_at = None
+        self._workers = [None] * self.shards
+        self._health = [{
+            'shard': shard,
+            'zones': len(zones),
+            'pid': None,
+            'alive': False,
+            'restarts': 0,
+            'last_exitcode': None,
+            'last_report': None,
+            'started_at': None,
+            'died_at': None,
+        } for shard, zones in enumerate(self.partitions)]
+        self._latest = [{} for _ in range(self.shards)]
+        # Shard that runs the retention cleanup for the whole database
+        self.maintenance_shard = next((shard for shard in range(self.shards) if self._runs(shard)), None)
+        self._carried = [dict.fromkeys(COUNTERS, 0) for _ in range(self.shards)]
+
+    def start(self):
+        """Start a worker for every shard that has zones (every shard when reloading)"""
+        self._stopping = False
+        self._started_at = time.monotonic()
+        for shard in range(self.shards):
+            if self._runs(shard):
+                self._spawn(shard)
+        return self
+
+    def poll(self):
+        """Collect worker reports and restart workers that exited; call periodically"""
+        self._drain_reports()
+        now = time.monotonic()
+        for shard, process in enumerate(self._workers):
+            if process is None:
+                continue
+            health = self._health[shard]
+            if process.is_alive():
+                continue
+            if health['alive']:
+                # Worker exited: keep its counters and schedule a restart
+                process.join()
+                health['alive'] = False
+                health['last_exitcode'] = process.exitcode
+                health['died_at'] = now
+                self._carry(shard)
+                if not self._stopping:
+                    print(f"⚠️ Shard {shard} worker (pid {health['pid']}) exited with code {process.exitcode}")
+            if self._stopping:
+                continue
+            if self.max_restarts is not None and health['restarts'] >= self.max_restarts:
+                continue
+            if now - health['died_at'] >= self.restart_delay:
+                health['restarts'] += 1
+                self._spawn(shard)
+
+    def stop(self, timeout=10.0):
+        """Ask every worker to shut down gracefully and wait for them"""
+        self._stopping = True
+        for process in self._workers:
+            if process is not None and process.is_alive():
+                # Workers handle SIGTERM by flushing their writer before exiting
+                process.terminate()
+        deadline = time.monotonic() + timeout
+        for process in self._workers:
+            if process is not None:
+                process.join(max(0.0, deadline - time.monotonic()))
+                if process.is_alive():
+                    process.kill()
+                    process.join()
+        self.poll()
+
+    def run(self, duration=None, check_interval=1.0):
+        """
+        Start the workers and supervise them until SIGINT/SIGTERM or ``duration`` seconds pass.
+
+        Returns:
+            dict: Final aggregated stats
+        """
+        def request_stop(signum, frame):
+            self._stopping = True
+
+        previous = {sig: signal.signal(sig, request_stop) for sig in (signal.SIGINT, signal.SIGTERM)}
+        try:
+            self.start()
+            deadline = None if duration is None else time.monotonic() + duration
+            while not self._stopping and (deadline is None or time.monotonic() < deadline):
+                time.sleep(check_interval if deadline is None else
+                           max(0.0, min(check_interval, deadline - time.monotonic())))
+                self.poll()
+        finally:
+            self.stop()
+            for sig, handler in previous.items():
+                signal.signal(sig, handler)
+        return self.stats()
+
+    def stats(self):
+        """
+        Per-shard health and counters plus totals across shards.
+
+        Returns:
+            dict: ``shards`` (one dict per shard) and ``totals`` with summed
+            counters and overall readings written per second
+        """
+        now = time.monotonic()
+        shards = []
+        totals = dict.fromkeys(COUNTERS, 0)
+        for shard in range(self.shards):
+            health = dict(self._health[shard])
+            counters = self._counters(shard)
+            uptime = now - health['started_at'] if health['started_at'] is not None else 0.0
+            health['last_report_age'] = now - health['last_report'] if health['last_report'] is not None else None
+            health['queue_depth'] = self._latest[shard].get('queue_depth', 0)
+            health['last_flush_latency'] = self._latest[shard].get('last_flush_latency', 0.0)
+            health['readings_per_second'] = (
+                self._latest[shard].get('readings_written', 0) / uptime if health['alive'] and uptime else 0.0
+            )
+            health.update(counters)
+            shards.append(health)
+            for key in COUNTERS:
+                totals[key] += counters[key]
+
+        elapsed = now - self._started_at if self._started_at is not None else 0.0
+        totals['readings_per_second'] = totals['readings_written'] / elapsed if elapsed else 0.0
+        totals['workers_alive'] = sum(1 for health in self._health if health['alive'])
+        totals['restarts'] = sum(health['restarts'] for health in self._health)
+        return {'shards': shards, 'totals': totals}
+
+    def _spawn(self, shard):
+        process = self._context.Process(
+            target=_run_shard,
+            args=(shard, self.partitions[shard], self.database_url, self._reports,
+                  self.report_interval, self._shard_options(shard),
+                  self.shards if self.reload_interval is not None else None),
+            name=f"shard-{shard}",
+            daemon=True,
+        )
+        process.start()
+        self._workers[shard] = process
+        self._latest[shard] = {}
+        health = self._health[shard]
+        health.update(pid=process.pid, alive=True, started_at=time.monotonic(), died_at=None, last_report=None)
+
+    def _runs(self, shard):
+        return bool(self.partitions[shard]) or self.reload_interval is not None
+
+    def _shard_options(self, shard):
+        options = dict(self.runtime_options, budget=self.budgets[shard])
+        if shard != self.maintenance_shard:
+            options['cleanup_interval'] = None
+        return options
+
+    def _drain_reports(self):
+        while True:
+            try:
+                shard, pid, stats = self._reports.get_nowait()
+            except queue.Empty:
+                return
+            # Ignore late reports from a worker that has already been replaced
+            if pid == self._health[shard]['pid']:
+                self._latest[shard] = stats
+                self._health[shard]['last_report'] = time.monotonic()
+
+    def _carry(self, shard):
+        # Called once per worker exit, after its final report was drained
+        self._drain_reports()
+        for key in COUNTERS:
+            self._carried[shard][key] += self._latest[shard].get(key, 0)
+        self._latest[shard] = {}
+
+    def _counters(self, shard):
+        latest = self._latest[shard]
+        return {key: self._carried[shard][key] + latest.get(key, 0) for key in COUNTERS}
@@ -9,6 +9,8 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 # Import the actual classes
 from smart_gardening.actuators.pump import WaterPump
+from smart_gardening.actuators.dispatcher import PumpDispatcher
+from smart_gardening.core.clock import VirtualClock
 from smart_gardening.core.zone import Zone
 
 
@@ -175,5 +177,70 @@ class TestWaterPump(unittest.TestCase):
         self.assertIn("ON", pump_str)
 
 
+class TestPumpDispatcher(unittest.TestCase):
+    """Test cases for the coalescing pump command dispatcher"""
+
+    def setUp(self):
+        """Set up a dispatcher with a mock driver and log"""
+        self.driver = MagicMock()
+        self.logged = []
+        self.clock = VirtualClock(start=datetime(2025, 6, 1, 12, 0, 0))
+        self.dispatcher = PumpDispatcher(self.driver, log=self.logged.extend, backoff=1.0, max_backoff=4.0,
+                                         clock=self.clock)
+        self.dispatcher.seed({1: False, 2: False, 3: True})
+
+    def test_redundant_commands_are_dropped(self):
+        """Test commands matching the pump's current state never reach the driver"""
+        self.assertFalse(self.dispatcher.command(1, False))
+        self.assertFalse(self.dispatcher.command(3, True))
+
+        self.assertEqual(self.dispatcher.dispatch(), 0)
+        self.driver.assert_not_called()
+        self.assertEqual(self.dispatcher.stats()['redundant'], 2)
+        self.assertEqual(self.logged, [])
+
+    def test_commands_coalesce_into_one_batch(self):
+        """Test a tick's commands go to the driver once, with the last command per zone winning"""
+        self.dispatcher.command(1, True)
+        self.dispatcher.command(2, True)
+        self.dispatcher.command(2, False)
+        self.dispatcher.command(3, False)
+
+        self.assertEqual(self.dispatcher.dispatch(), 2)
+
+        self.driver.assert_called_once_with([(1, True), (3, False)])
+        self.assertEqual([(row['zone_id'], row['status']) for row in self.logged], [(1, "ON"), (3, "OFF")])
+        self.assertEqual(self.dispatcher.state, {1: True, 2: False, 3: False})
+
+    def test_one_log_per_transition(self):
+        """Test repeated ticks with the same decision log the transition only once"""
+        for _ in range(5):
+            self.dispatcher.command(1, True)
+            self.dispatcher.dispatch()
+
+        self.assertEqual(self.driver.call_count, 1)
+        self.assertEqual(len(self.logged), 1)
+
+    def test_failed_batch_retries_with_backoff(self):
+        """Test a failed batch stays pending and is retried after a growing delay"""
+        self.driver.side_effect = [IOError("timeout"), IOError("timeout"), None]
+        self.dispatcher.command(1, True)
+
+        self.assertEqual(self.dispatcher.dispatch(), 0)
+        self.assertEqual(self.dispatcher.retry_in(), 1.0)
+        self.assertEqual(self.dispatcher.dispatch(), 0)
+        self.assertEqual(self.driver.call_count, 1)
+
+        self.clock.advance(1.0)
+        self.assertEqual(self.dispatcher.dispatch(), 0)
+        self.assertEqual(self.dispatcher.retry_in(), 2.0)
+
+        self.clock.advance(2.0)
+        self.assertEqual(self.dispatcher.dispatch(), 1)
+        self.assertIsNone(self.dispatcher.retry_in())
+        self.assertEqual(len(self.logged), 1)
+        self.assertEqual(self.dispatcher.stats()['failures'], 2)
+
+
 if __name__ == '__main__':
     unittest.main() 
\ No newline at end of file
@@ -0,0 +1,133 @@
+import unittest
+import tempfile
+import shutil
+import os
+import sys
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+# Add the project root to the path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from smart_gardening.db.database import Base, SensorReading, PumpLog
+from smart_gardening.db.archive import archive_expired_rows, iter_archive, read_archive
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+
+class TestArchive(unittest.TestCase):
+    """Test cases for archiving expired rows to Parquet"""
+
+    def setUp(self):
+        """Set up test database and archive directory"""
+        self.temp_db = tempfile.NamedTemporaryFile(delete=False, suffix='.db')
+        self.db_path = self.temp_db.name
+        self.temp_db.close()
+        self.archive_dir = tempfile.mkdtemp()
+
+        self.engine = create_engine(f'sqlite:///{self.db_path}')
+        Base.metadata.create_all(self.engine)
+
+        TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=self.engine)
+        self.test_session = TestingSessionLocal()
+
+        # 3 expired days x 2 zones x 4 readings, plus recent rows that must stay
+        self.old_day = (datetime.utcnow() - timedelta(days=90)).replace(hour=0, minute=0, second=0, microsecond=0)
+        for day in range(3):
+            for zone_id in (1, 2):
+                for hour in (0, 6, 12, 18):
+                    self.test_session.add(SensorReading(
+                        zone_id=zone_id, moisture=40.0 + hour, ph=6.5,
+                        timestamp=self.old_day + timedelta(days=day, hours=hour)
+                    ))
+            self.test_session.add(PumpLog(zone_id=1, status="ON", timestamp=self.old_day + timedelta(days=day)))
+        self.test_session.add(SensorReading(zone_id=1, moisture=55.0, ph=6.5, timestamp=datetime.utcnow()))
+        self.test_session.add(PumpLog(zone_id=1, status="OFF", timestamp=datetime.utcnow()))
+        self.test_session.commit()
+
+    def tearDown(self):
+        """Clean up test database and archive directory"""
+        self.test_session.close()
+        self.engine.dispose()
+        os.unlink(self.db_path)
+        shutil.rmtree(self.archive_dir)
+
+    def test_archive_moves_expired_rows(self):
+        """Test expired rows are written to the archive and removed from the database"""
+        archived = archive_expired_rows(self.archive_dir, retention_days=60,
+                                        db_session=self.test_session, chunk_size=5)
+
+        self.assertEqual(archived, {'sensor_readings': 24, 'pump_logs': 3})
+        self.assertEqual(self.test_session.query(SensorReading).count(), 1)
+        self.assertEqual(self.test_session.query(PumpLog).count(), 1)
+
+        frame = read_archive(self.archive_dir)
+        self.assertEqual(len(frame), 24)
+        self.assertTrue(frame['timestamp'].is_monotonic_increasing)
+
+    def test_archive_is_day_partitioned_and_compressed(self):
+        """Test one partition directory per day with compressed Parquet files"""
+        import pyarrow.parquet as pq
+
+        archive_expired_rows(self.archive_dir, retention_days=60, db_session=self.test_session)
+
+        table_dir = os.path.join(self.archive_dir, 'sensor_readings')
+        partitions = sorted(os.listdir(table_dir))
+        expected = [f"date={(self.old_day + timedelta(days=day)).strftime('%Y-%m-%d')}" for day in range(3)]
+        self.assertEqual(partitions, expected)
+
+        part_file = os.path.join(table_dir, partitions[0], os.listdir(os.path.join(table_dir, partitions[0]))[0])
+        metadata = pq.ParquetFile(part_file).metadata
+        self.assertEqual(metadata.row_group(0).column(0).compression, 'ZSTD')
+
+    def test_read_archive_filters_by_zone_and_time(self):
+        """Test the reader returns only the requested zone and time range"""
+        archive_expired_rows(self.archive_dir, retention_days=60, db_session=self.test_session)
+
+        start = self.old_day + timedelta(days=1)
+        end = self.old_day + timedelta(days=2)
+        frame = read_archive(self.archive_dir, zone_id=2, start=start, end=end)
+
+        self.assertEqual(len(frame), 4)
+        self.assertTrue((frame['zone_id'] == 2).all())
+        self.assertTrue((frame['timestamp'] >= start).all())
+        self.assertTrue((frame['timestamp'] < end).all())
+
+    def test_iter_archive_streams_batches(self):
+        """Test the archive can be consumed batch by batch"""
+        archive_expired_rows(self.archive_dir, retention_days=60, db_session=self.test_session)
+
+        batches = list(iter_archive(self.archive_dir, 'pump_logs', columns=['zone_id', 'status']))
+
+        self.assertEqual(sum(len(batch) for batch in batches), 3)
+        self.assertEqual(list(batches[0].columns), ['zone_id', 'status'])
+
+    def test_rerun_does_not_duplicate(self):
+        """Test rerunning after everything was archived leaves the archive unchanged"""
+        archive_expired_rows(self.archive_dir, retention_days=60, db_session=self.test_session)
+        archived = archive_expired_rows(self.archive_dir, retention_days=60, db_session=self.test_session)
+
+        self.assertEqual(archived, {'sensor_readings': 0, 'pump_logs': 0})
+        self.assertEqual(len(read_archive(self.archive_dir)), 24)
+
+    def test_write_failure_raises_and_keeps_rows(self):
+        """Test a failed Parquet write raises and deletes nothing that was not archived"""
+        with patch('smart_gardening.db.archive.pq.write_table', side_effect=OSError("disk full")):
+            with self.assertRaises(OSError):
+                archive_expired_rows(self.archive_dir, retention_days=60, db_session=self.test_session)
+
+        self.assertEqual(self.test_session.query(SensorReading).count(), 25)
+        self.assertEqual(self.test_session.query(PumpLog).count(), 4)
+
+    def test_read_missing_archive(self):
+        """Test reading an empty archive returns an empty frame"""
+        frame = read_archive(self.archive_dir, zone_id=1)
+        self.assertEqual(len(frame), 0)
+        self.assertIn('moisture', frame.columns)
+
+        with self.assertRaises(ValueError):
+            read_archive(self.archive_dir, table_name='zones')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,109 @@
+import unittest
+import os
+import sys
+from datetime import datetime
+
+import numpy as np
+
+# Add the project root to the path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from smart_gardening.core.budget import WaterBudget
+from smart_gardening.core.clock import VirtualClock
+from smart_gardening.core.zone_table import ZoneTable
+from smart_gardening.simulator.simulator import SoilModel
+
+
+class TestWaterBudget(unittest.TestCase):
+    """Test cases for the shared pump budget"""
+
+    def setUp(self):
+        """Set up five dry zones with different deficits"""
+        self.table = ZoneTable(5, moisture_threshold=40)
+        self.table.update_readings([35.0, 10.0, 30.0, 20.0, 39.0], 6.5)
+
+    def test_unlimited_budget_admits_everyone(self):
+        """Test without limits every candidate starts"""
+        budget = WaterBudget()
+
+        admitted = budget.admit(self.table, self.table.activate_mask(0.0), 0.0)
+
+        self.assertTrue(admitted.all())
+        self.assertEqual(budget.deferred, 0)
+
+    def test_max_pumps_admits_largest_deficits(self):
+        """Test the driest zones start first and running pumps count against the cap"""
+        budget = WaterBudget(max_pumps=3)
+        self.table.pump_on[4] = True
+
+        admitted = budget.admit(self.table, self.table.activate_mask(0.0), 0.0)
+
+        self.assertEqual(admitted.nonzero()[0].tolist(), [1, 3])
+        self.assertEqual(budget.deferred, 2)
+        self.assertEqual(budget.queue().tolist(), [0, 2])
+
+    def test_waiting_time_raises_priority(self):
+        """Test a zone deferred long enough outranks a drier newcomer"""
+        budget = WaterBudget(max_pumps=1, wait_weight=1.0)
+        candidates = np.array([True, False, False, False, False])
+        budget.admit(self.table, candidates, 0.0)
+        self.table.pump_on[0] = False
+
+        # Zone 0 (deficit 5) waits while zone 1 (deficit 30) is blocked by a running pump
+        self.table.pump_on[4] = True
+        self.assertFalse(budget.admit(self.table, np.array([True, False, False, False, False]), 0.0).any())
+        self.table.pump_on[4] = False
+
+        admitted = budget.admit(self.table, np.array([True, True, False, False, False]), 40 * 60.0)
+
+        self.assertEqual(admitted.nonzero()[0].tolist(), [0])
+
+    def test_flow_budget_fills_remaining_capacity(self):
+        """Test a large pump that does not fit is skipped so smaller ones use the flow"""
+        self.table.flow_rate[:] = [5.0, 30.0, 5.0, 5.0, 5.0]
+        budget = WaterBudget(max_flow=20.0)
+
+        # Zone 1's pump alone exceeds the limit, which is reported once
+        with self.assertWarns(UserWarning):
+            admitted = budget.admit(self.table, self.table.activate_mask(0.0), 0.0)
+
+        self.assertFalse(admitted[1])
+        self.assertEqual(int(admitted.sum()), 4)
+        self.assertLessEqual(self.table.flow_rate[admitted].sum(), 20.0)
+
+    def test_starving_zone_holds_capacity(self):
+        """Test a zone that has waited max_wait blocks smaller zones until it fits"""
+        self.table.flow_rate[:] = [5.0, 30.0, 5.0, 5.0, 5.0]
+        self.table.pump_on[0] = True
+        candidates = np.array([False, True, True, True, True])
+        patient = WaterBudget(max_flow=30.0, max_wait=None)
+        starving = WaterBudget(max_flow=30.0, max_wait=600.0)
+        for budget in (patient, starving):
+            budget.admit(self.table, np.array([False, True, False, False, False]), 0.0)
+
+        # Zone 1 needs 30 L/min but only 25 are left while zone 0 runs
+        self.assertEqual(patient.admit(self.table, candidates, 900.0).nonzero()[0].tolist(), [2, 3, 4])
+        self.assertFalse(starving.admit(self.table, candidates, 900.0).any())
+
+    def test_simulated_peak_respects_cap(self):
+        """Test many zones crossing threshold together never exceed the pump cap and all get watered"""
+        zones = 40
+        start = datetime(2025, 6, 1, 6, 0, 0)
+        clock = VirtualClock(start=start)
+        table = ZoneTable(zones, moisture_threshold=40, max_runtime_minutes=30, clock=clock)
+        table.update_readings(np.full(zones, 38.0), 6.5)
+        model = SoilModel(table, seed=1, sensor_noise=0.0, inflow_per_minute=1.0)
+        budget = WaterBudget(max_pumps=5)
+        peak = []
+
+        stats = model.run(clock, 12 * 3600, tick_seconds=60, budget=budget,
+                          callback=lambda now, t: peak.append(int(t.pump_on.sum())))
+
+        self.assertLessEqual(max(peak), 5)
+        self.assertEqual(max(peak), 5)
+        self.assertGreaterEqual(stats['pump_starts'], zones)
+        self.assertFalse(np.isnan(table.last_watered).any())
+
+
+if __name__ == '__main__':
+    unittest.main()
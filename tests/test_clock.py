@@ -0,0 +1,121 @@
+import unittest
+import os
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+
+# Add the project root to the path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from smart_gardening.core.clock import Clock, SystemClock, MonotonicClock, VirtualClock
+from smart_gardening.core.zone import Zone
+from smart_gardening.core.zone_table import ZoneTable
+from smart_gardening.db.database import retention_cutoff
+
+
+class TestClocks(unittest.TestCase):
+    """Test cases for the clock implementations"""
+
+    def test_system_clock(self):
+        """Test the system clock reports local and UTC wall time"""
+        clock = SystemClock()
+
+        self.assertIsNone(clock.now().tzinfo)
+        self.assertEqual(clock.utcnow().tzinfo, timezone.utc)
+        self.assertAlmostEqual(clock.time(), time.time(), delta=1)
+
+    def test_monotonic_clock_tracks_wall_time(self):
+        """Test the monotonic clock starts at wall time and never goes backwards"""
+        clock = MonotonicClock()
+
+        first = clock.time()
+        second = clock.time()
+
+        self.assertAlmostEqual(first, time.time(), delta=1)
+        self.assertGreaterEqual(second, first)
+        self.assertAlmostEqual(clock.utcnow().timestamp(), clock.now().timestamp(), delta=1)
+
+    def test_clock_requires_now(self):
+        """Test a clock that does not implement now() cannot be created"""
+        class Incomplete(Clock):
+            pass
+
+        class Fixed(Clock):
+            def now(self):
+                return datetime(2025, 6, 1, 12, 0, 0)
+
+        with self.assertRaises(TypeError):
+            Clock()
+        with self.assertRaises(TypeError):
+            Incomplete()
+        self.assertEqual(Fixed().time(), datetime(2025, 6, 1, 12, 0, 0).timestamp())
+
+    def test_virtual_clock_interface(self):
+        """Test the virtual clock provides UTC, epoch and monotonic time"""
+        start = datetime(2025, 6, 1, 12, 0, 0)
+        clock = VirtualClock(start)
+
+        clock.advance(90)
+
+        self.assertEqual(clock.monotonic(), 90)
+        self.assertEqual(clock.time(), (start + timedelta(seconds=90)).timestamp())
+        self.assertEqual(clock.utcnow(), (start + timedelta(seconds=90)).astimezone(timezone.utc))
+
+
+class TestClockInjection(unittest.TestCase):
+    """Test cases for threading a clock through zones and maintenance"""
+
+    def setUp(self):
+        """Set up a virtual clock"""
+        self.clock = VirtualClock(datetime(2025, 6, 1, 12, 0, 0))
+
+    def test_zone_uses_injected_clock(self):
+        """Test pump runtime and watering cooldown follow the zone's clock"""
+        zone = Zone(moisture=25, moisture_threshold=40, pump_status=False, clock=self.clock)
+
+        zone.start_pump()
+        self.assertEqual(zone.pump_start_time, self.clock.now())
+
+        self.clock.advance(31 * 60)
+        self.assertTrue(zone.is_max_runtime_reached())
+        zone.stop_pump()
+        self.assertFalse(zone.can_water())
+
+        self.clock.advance(2 * 3600 + 1)
+        self.assertTrue(zone.should_activate_pump())
+
+    def test_tick_time_overrides_clock(self):
+        """Test an explicit tick timestamp is used instead of reading a clock"""
+        zone = Zone(moisture=25, moisture_threshold=40, pump_status=False)
+        tick = datetime(2030, 1, 1)
+
+        zone.start_pump(now=tick)
+
+        self.assertEqual(zone.pump_start_time, tick)
+        self.assertFalse(zone.is_max_runtime_reached(now=tick + timedelta(minutes=30)))
+        self.assertTrue(zone.is_max_runtime_reached(now=tick + timedelta(minutes=31)))
+
+    def test_zone_table_defaults_to_its_clock(self):
+        """Test table masks computed without a timestamp read the table's clock"""
+        table = ZoneTable.from_zones([Zone(moisture=25, moisture_threshold=40, pump_status=False)],
+                                     clock=self.clock)
+
+        table.start_pumps(table.activate_mask())
+        self.assertEqual(table.zone(0).pump_start_time, self.clock.now())
+
+        self.clock.advance(31 * 60)
+        table.update_readings(25, 6.5)
+        self.assertTrue(table.deactivate_mask()[0])
+
+    def test_retention_cutoff_from_clock(self):
+        """Test the retention cutoff is naive UTC whatever clock time it is given"""
+        now = datetime(2025, 6, 1, 12, 0, 0, tzinfo=timezone.utc)
+
+        self.assertEqual(retention_cutoff(60, now), datetime(2025, 4, 2, 12, 0, 0))
+        self.assertEqual(retention_cutoff(60, now.astimezone(timezone(timedelta(hours=2)))),
+                         datetime(2025, 4, 2, 12, 0, 0))
+        self.assertIsNone(retention_cutoff(60).tzinfo)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -190,6 +190,32 @@ class TestConfig(unittest.TestCase):
             # Should fall back to default (positive value)
             self.assertGreater(config.SENSOR_READING_INTERVAL, 0)
     
+    def test_flow_budget_below_one_pump_is_ignored(self):
+        """Test a flow limit no single pump fits under is rejected with a warning"""
+        with patch.dict(os.environ, {'MAX_WATER_FLOW': '5', 'PUMP_FLOW_RATE': '10'}):
+            with self.assertWarns(UserWarning):
+                config = Config()
+            self.assertEqual(config.MAX_WATER_FLOW, 0.0)
+
+        with patch.dict(os.environ, {'MAX_WATER_FLOW': '25', 'PUMP_FLOW_RATE': '10'}):
+            self.assertEqual(Config().MAX_WATER_FLOW, 25.0)
+    
+    def test_zone_reload_interval(self):
+        """Test the zone reload interval defaults to 10 s and 0 turns reloading off"""
+        self.assertEqual(Config().ZONE_RELOAD_INTERVAL, 10.0)
+        with patch.dict(os.environ, {'ZONE_RELOAD_INTERVAL': '0'}):
+            self.assertEqual(Config().ZONE_RELOAD_INTERVAL, 0.0)
+        with patch.dict(os.environ, {'ZONE_RELOAD_INTERVAL': 'often'}):
+            self.assertEqual(Config().ZONE_RELOAD_INTERVAL, 10.0)
+    
+    def test_dashboard_cache_ttl(self):
+        """Test the dashboard cache TTL defaults to 30 s and rejects non-positive values"""
+        self.assertEqual(Config().DASHBOARD_CACHE_TTL, 30.0)
+        with patch.dict(os.environ, {'DASHBOARD_CACHE_TTL': '5'}):
+            self.assertEqual(Config().DASHBOARD_CACHE_TTL, 5.0)
+        with patch.dict(os.environ, {'DASHBOARD_CACHE_TTL': '0'}):
+            self.assertEqual(Config().DASHBOARD_CACHE_TTL, 30.0)
+    
     def test_configuration_type_consistency(self):
         """Test that configuration types are consistent"""
         # All timing values should be integers
@@ -9,9 +9,9 @@ from datetime import datetime, timedelta
 # Add the project root to the path
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from smart_gardening.db.database import Base, ZoneModel, PlantModel, SensorReading, PumpLog, init_db
+from smart_gardening.db.database import Base, ZoneModel, PlantModel, SensorReading, PumpLog, ZoneLatestState, init_db, record_batch
 from smart_gardening.core.zone import Zone
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker
 
 
@@ -154,6 +154,133 @@ class TestDashboardData(unittest.TestCase):
             self.assertIsInstance(ph, (int, float))
 
 
+class TestDashboardCache(unittest.TestCase):
+    """Test cases for the cached dashboard data access module"""
+
+    def setUp(self):
+        """Set up test database and empty caches"""
+        try:
+            import streamlit as st
+            from smart_gardening.dashboard import data
+        except ImportError:
+            self.skipTest("streamlit is not installed")
+        self.data = data
+        st.cache_data.clear()
+
+        self.temp_db = tempfile.NamedTemporaryFile(delete=False, suffix='.db')
+        self.db_path = self.temp_db.name
+        self.temp_db.close()
+
+        self.engine = create_engine(f'sqlite:///{self.db_path}')
+        Base.metadata.create_all(self.engine)
+        TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=self.engine)
+        self.test_session = TestingSessionLocal()
+        self.test_session.add_all([
+            ZoneModel(id=1, name="Vegetable Garden", moisture_threshold=30),
+            ZoneModel(id=2, name="Herb Garden", moisture_threshold=25),
+            PlantModel(zone_id=1, name="Tomato", plant_type="Vegetable"),
+        ])
+        self.test_session.commit()
+
+        self.session_factory = patch('smart_gardening.db.database.SessionFactory', TestingSessionLocal)
+        self.session_factory.start()
+        self.statements = []
+        event.listen(self.engine, 'before_cursor_execute', lambda *args: self.statements.append(args[2]))
+
+    def tearDown(self):
+        """Clean up test database"""
+        self.session_factory.stop()
+        self.test_session.close()
+        self.engine.dispose()
+        os.unlink(self.db_path)
+
+    def test_reruns_are_served_from_the_cache(self):
+        """Test loading the same zones again sends no queries"""
+        first = self.data.load_zones()
+        queries = len(self.statements)
+        second = self.data.load_zones()
+
+        self.assertEqual([zone.name for zone in second], [zone.name for zone in first])
+        self.assertGreater(queries, 0)
+        self.assertEqual(len(self.statements), queries)
+
+    def test_dashboard_writes_invalidate_the_cache(self):
+        """Test a plant added or removed through the module shows up on the next load"""
+        self.assertEqual(len(self.data.get_zone(1)['plants']), 1)
+        version = self.data.data_version()
+
+        plant_id = self.data.add_plant(zone_id=1, name="Pepper", plant_type="Vegetable")
+
+        self.assertEqual(self.data.data_version(), version + 1)
+        self.assertEqual([plant['name'] for plant in self.data.get_zone(1)['plants']], ["Tomato", "Pepper"])
+        zones = {zone.id: zone for zone in self.data.load_zones()}
+        self.assertEqual(len(zones[1].plants), 2)
+
+        self.assertTrue(self.data.remove_plant(plant_id))
+        self.assertEqual(len(self.data.get_zone(1)['plants']), 1)
+        self.assertFalse(self.data.remove_plant(plant_id))
+        self.assertEqual(self.data.data_version(), version + 2)
+
+    def test_other_writers_wait_for_the_ttl(self):
+        """Test a change made outside the module is not seen until the cache expires"""
+        self.assertEqual(len(self.data.load_zones()), 2)
+        self.test_session.add(ZoneModel(id=3, name="Flower Bed"))
+        self.test_session.commit()
+
+        self.assertEqual(len(self.data.load_zones()), 2)
+
+        zone_id = self.data.add_zone(name="Orchard", plant_type="Trees", moisture_threshold=35)
+        self.assertEqual([zone.id for zone in self.data.load_zones()], [1, 2, 3, zone_id])
+
+    def test_charts_are_keyed_by_zone_and_range(self):
+        """Test each zone and range gets its own cache entry"""
+        now = datetime.utcnow()
+        record_batch([
+            {'zone_id': 1, 'moisture': 40.0, 'ph': 6.5, 'timestamp': now - timedelta(days=3)},
+            {'zone_id': 1, 'moisture': 42.0, 'ph': 6.6, 'timestamp': now - timedelta(hours=2)},
+            {'zone_id': 2, 'moisture': 30.0, 'ph': 6.8, 'timestamp': now - timedelta(hours=2)},
+        ], db_session=self.test_session)
+
+        self.assertEqual(list(self.data.get_chart(1, 7)['moisture'][1]), [40.0, 42.0])
+        self.assertEqual(list(self.data.get_chart(1, 1)['moisture'][1]), [42.0])
+        self.assertEqual(list(self.data.get_chart(2, 7)['ph'][1]), [6.8])
+
+    def test_state_feed_fetches_only_changed_zones(self):
+        """Test a refresh returns every zone but only reads rows written since the last one"""
+        written = datetime(2025, 6, 1, 12, 0, 0)
+        self.test_session.add_all([
+            ZoneLatestState(zone_id=1, moisture=40.0, ph=6.5, reading_at=written, updated_at=written - timedelta(hours=1)),
+            ZoneLatestState(zone_id=2, moisture=30.0, ph=6.8, reading_at=written, updated_at=written),
+        ])
+        self.test_session.commit()
+        feed = self.data.ZoneStateFeed()
+
+        self.assertEqual(feed.refresh()[2]['moisture'], 30.0)
+        self.assertEqual(feed.seen, written)
+
+        changed = written + timedelta(minutes=1)
+        self.test_session.get(ZoneLatestState, 2).moisture = 28.0
+        self.test_session.get(ZoneLatestState, 2).updated_at = changed
+        self.test_session.commit()
+        fetched = []
+        get_zone_states = self.data.get_zone_states
+
+        def record_fetch(since, db_session):
+            rows = get_zone_states(since, db_session)
+            fetched.extend(row.zone_id for row in rows)
+            return rows
+
+        with patch.object(self.data, 'get_zone_states', side_effect=record_fetch):
+            states = feed.refresh()
+
+        self.assertEqual(fetched, [2])
+        self.assertEqual(sorted(states), [1, 2])
+        self.assertEqual(states[2]['moisture'], 28.0)
+        self.assertEqual(states[1]['moisture'], 40.0)
+        self.assertEqual(feed.seen, changed)
+        self.assertIn("zone_latest_state.updated_at >", self.statements[-1])
+
+
 class TestZoneStatus(unittest.TestCase):
     """Test cases for zone status calculations"""
     
@@ -9,6 +9,7 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 from smart_gardening.db.database import (
     init_db, 
     cleanup_old_sensor_readings, 
+    cleanup_old_pump_logs,
     get_sensor_readings_stats,
     SensorReading,
     PumpLog,
@@ -164,6 +165,90 @@ class TestDataRetention(unittest.TestCase):
         self.assertEqual(session.query(SensorReading).count(), 0)
         self.assertEqual(session.query(PumpLog).count(), 0)
     
+    def test_cleanup_in_batches(self):
+        now = datetime.now(timezone.utc)
+        
+        for i in range(25):
+            session.add(SensorReading(zone_id=1, moisture=40.0, ph=6.5, timestamp=now - timedelta(days=70, minutes=i)))
+            session.add(SensorReading(zone_id=1, moisture=50.0, ph=6.5, timestamp=now - timedelta(days=1, minutes=i)))
+        session.commit()
+        
+        progress = []
+        deleted_count = cleanup_old_sensor_readings(
+            retention_days=60,
+            batch_size=10,
+            progress_callback=lambda table, deleted, current_id, last_id: progress.append((table, deleted))
+        )
+        
+        self.assertEqual(deleted_count, 25)
+        self.assertEqual(session.query(SensorReading).count(), 25)
+        self.assertTrue(all(r.moisture == 50.0 for r in session.query(SensorReading).all()))
+        
+        reading_progress = [deleted for table, deleted in progress if table == 'sensor_readings']
+        self.assertGreater(len(reading_progress), 1)
+        self.assertEqual(reading_progress[-1], 25)
+        self.assertEqual(reading_progress, sorted(reading_progress))
+    
+    def test_cleanup_resumes_after_interruption(self):
+        now = datetime.now(timezone.utc)
+        
+        for i in range(30):
+            session.add(SensorReading(zone_id=1, moisture=40.0, ph=6.5, timestamp=now - timedelta(days=70, minutes=i)))
+        session.commit()
+        
+        def interrupt(table, deleted, current_id, last_id):
+            if deleted >= 10:
+                raise KeyboardInterrupt
+        
+        with self.assertRaises(KeyboardInterrupt):
+            cleanup_old_sensor_readings(retention_days=60, batch_size=10, progress_callback=interrupt)
+        
+        # The first batch was committed before the interruption
+        self.assertEqual(session.query(SensorReading).count(), 20)
+        
+        deleted_count = cleanup_old_sensor_readings(retention_days=60, batch_size=10)
+        
+        self.assertEqual(deleted_count, 20)
+        self.assertEqual(session.query(SensorReading).count(), 0)
+    
+    def test_cleanup_with_vacuum(self):
+        now = datetime.now(timezone.utc)
+        
+        session.add(SensorReading(zone_id=1, moisture=40.0, ph=6.5, timestamp=now - timedelta(days=70)))
+        session.commit()
+        
+        with patch('smart_gardening.db.database._incremental_vacuum') as mock_vacuum:
+            deleted_count = cleanup_old_sensor_readings(retention_days=60, vacuum=True)
+        
+        self.assertEqual(deleted_count, 1)
+        mock_vacuum.assert_called_once()
+    
+    def test_failed_archive_skips_cleanup(self):
+        from smart_gardening.data_maintenance import run_data_cleanup
+        
+        now = datetime.now(timezone.utc)
+        session.add(SensorReading(zone_id=1, moisture=40.0, ph=6.5, timestamp=now - timedelta(days=70)))
+        session.commit()
+        
+        with patch('smart_gardening.data_maintenance.archive_expired_rows', side_effect=OSError("disk full")):
+            completed = run_data_cleanup(retention_days=60, archive_dir='/nonexistent')
+        
+        self.assertFalse(completed)
+        self.assertEqual(session.query(SensorReading).count(), 1)
+    
+    def test_cleanup_uses_clock_time(self):
+        # Readings written by a fast-forwarded simulation expire relative to its clock
+        virtual_now = datetime(2030, 1, 1, tzinfo=timezone.utc)
+        
+        session.add(SensorReading(zone_id=1, moisture=40.0, ph=6.5, timestamp=datetime(2029, 12, 20)))
+        session.add(SensorReading(zone_id=1, moisture=40.0, ph=6.5, timestamp=datetime(2029, 10, 1)))
+        session.commit()
+        
+        deleted_count = cleanup_old_sensor_readings(retention_days=60, now=virtual_now)
+        
+        self.assertEqual(deleted_count, 1)
+        self.assertEqual(session.query(SensorReading).first().timestamp, datetime(2029, 12, 20))
+    
     def test_get_sensor_readings_stats(self):
         now = datetime.now(timezone.utc)
         
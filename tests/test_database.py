@@ -1,4 +1,5 @@
 import unittest
+from unittest.mock import patch
 import tempfile
 import os
 import sys
@@ -7,9 +8,10 @@ from datetime import datetime, timedelta
 # Add the project root to the path
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from smart_gardening.db.database import Base, ZoneModel, PlantModel, SensorReading, PumpLog, init_db, session
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from smart_gardening.db.database import Base, ZoneModel, PlantModel, SensorReading, PumpLog, init_db, session, create_db_engine, session_scope
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker, scoped_session
+import threading
 
 
 class TestDatabase(unittest.TestCase):
@@ -392,5 +394,96 @@ class TestDatabase(unittest.TestCase):
         self.assertEqual(updated_zone.last_watered, now)
 
 
+class TestEngineFactory(unittest.TestCase):
+    """Test cases for the engine factory and session helpers"""
+    
+    def setUp(self):
+        """Set up test database"""
+        self.temp_db = tempfile.NamedTemporaryFile(delete=False, suffix='.db')
+        self.db_path = self.temp_db.name
+        self.temp_db.close()
+        
+        self.engine = create_db_engine(f'sqlite:///{self.db_path}')
+        Base.metadata.create_all(self.engine)
+    
+    def tearDown(self):
+        """Clean up test database"""
+        self.engine.dispose()
+        for suffix in ('', '-wal', '-shm'):
+            if os.path.exists(self.db_path + suffix):
+                os.unlink(self.db_path + suffix)
+    
+    def test_sqlite_pragmas(self):
+        """Test SQLite connections are opened in WAL mode with tuned pragmas"""
+        with self.engine.connect() as conn:
+            self.assertEqual(conn.execute(text("PRAGMA journal_mode")).scalar(), "wal")
+            self.assertEqual(conn.execute(text("PRAGMA synchronous")).scalar(), 1)  # NORMAL
+            self.assertEqual(conn.execute(text("PRAGMA busy_timeout")).scalar(), 5000)
+            self.assertGreater(conn.execute(text("PRAGMA mmap_size")).scalar(), 0)
+            self.assertEqual(conn.execute(text("PRAGMA auto_vacuum")).scalar(), 2)  # INCREMENTAL
+    
+    def test_default_url_comes_from_config(self):
+        """Test the factory falls back to Config().DATABASE_URL"""
+        url = f'sqlite:///{self.db_path}'
+        with patch.dict(os.environ, {'DATABASE_URL': url}):
+            engine = create_db_engine()
+        self.assertEqual(str(engine.url), url)
+        engine.dispose()
+    
+    def test_reader_not_blocked_by_open_write_transaction(self):
+        """Test a reader can query while another connection holds a write transaction"""
+        SessionLocal = sessionmaker(bind=self.engine)
+        writer = SessionLocal()
+        reader = SessionLocal()
+        try:
+            writer.add(ZoneModel(name="Committed Zone"))
+            writer.commit()
+            
+            writer.add(ZoneModel(name="Pending Zone"))
+            writer.flush()  # holds the write lock without committing
+            
+            names = [zone.name for zone in reader.query(ZoneModel).all()]
+            self.assertEqual(names, ["Committed Zone"])
+        finally:
+            writer.rollback()
+            writer.close()
+            reader.close()
+    
+    def test_session_scope_commits_and_rolls_back(self):
+        """Test session_scope commits on success and rolls back on error"""
+        SessionLocal = sessionmaker(bind=self.engine)
+        
+        with patch('smart_gardening.db.database.SessionFactory', SessionLocal):
+            with session_scope() as db_session:
+                db_session.add(ZoneModel(name="Kept Zone"))
+            
+            with self.assertRaises(ValueError):
+                with session_scope() as db_session:
+                    db_session.add(ZoneModel(name="Discarded Zone"))
+                    db_session.flush()
+                    raise ValueError("boom")
+        
+        check = SessionLocal()
+        names = [zone.name for zone in check.query(ZoneModel).all()]
+        check.close()
+        self.assertEqual(names, ["Kept Zone"])
+    
+    def test_module_session_is_thread_local(self):
+        """Test the shared module session resolves to one Session per thread"""
+        self.assertIsInstance(session, scoped_session)
+        
+        sessions = {}
+        
+        def grab(name):
+            sessions[name] = session()
+            session.remove()
+        
+        worker = threading.Thread(target=grab, args=("worker",))
+        worker.start()
+        worker.join()
+        
+        self.assertIsNot(sessions["worker"], session())
+
+
 if __name__ == '__main__':
     unittest.main() 
\ No newline at end of file
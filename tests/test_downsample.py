@@ -0,0 +1,84 @@
+import unittest
+import os
+import sys
+
+import numpy as np
+
+# Add the project root to the path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from smart_gardening.core.downsample import minmax_downsample
+
+
+class TestMinMaxDownsample(unittest.TestCase):
+    """Test cases for min/max chart downsampling"""
+
+    def setUp(self):
+        """Set up a long noisy series with one spike and one dip"""
+        rng = np.random.default_rng(7)
+        self.times = np.arange(100000) * 60.0
+        self.values = rng.normal(40.0, 2.0, len(self.times))
+        self.values[12345] = 95.0
+        self.values[77777] = 1.0
+
+    def test_output_fits_the_bucket_budget(self):
+        """Test the output holds at most two points per bucket, in time order"""
+        times, values = minmax_downsample(self.times, self.values, buckets=400)
+
+        self.assertLessEqual(len(times), 800)
+        self.assertEqual(len(times), len(values))
+        self.assertTrue(np.all(np.diff(times) >= 0))
+
+    def test_peaks_survive(self):
+        """Test the global spike and dip are kept at their original times"""
+        times, values = minmax_downsample(self.times, self.values, buckets=400)
+
+        self.assertEqual(values.max(), 95.0)
+        self.assertEqual(times[values.argmax()], self.times[12345])
+        self.assertEqual(values.min(), 1.0)
+        self.assertEqual(times[values.argmin()], self.times[77777])
+
+    def test_bucket_extremes_match_a_loop(self):
+        """Test every bucket contributes exactly its minimum and maximum"""
+        times, values = minmax_downsample(self.times[:1000], self.values[:1000], buckets=10)
+
+        for bucket in range(10):
+            chunk = self.values[bucket * 100:(bucket + 1) * 100]
+            kept = values[(times >= bucket * 6000.0) & (times < (bucket + 1) * 6000.0)]
+            self.assertEqual(sorted(kept), sorted([chunk.min(), chunk.max()]))
+
+    def test_short_series_is_unchanged(self):
+        """Test a series already within budget is returned as is, minus NaNs"""
+        values = np.array([40.0, np.nan, 42.0])
+
+        times, kept = minmax_downsample(np.arange(3.0), values, buckets=10)
+
+        self.assertEqual(list(times), [0.0, 2.0])
+        self.assertEqual(list(kept), [40.0, 42.0])
+
+    def test_aggregates_keep_low_and_high(self):
+        """Test pre-aggregated samples contribute both their minimum and maximum"""
+        times, values = minmax_downsample(np.arange(3.0), [30.0, 31.0, 32.0], [35.0, 31.0, 60.0], buckets=10)
+
+        self.assertEqual(list(times), [0.0, 0.0, 1.0, 2.0, 2.0])
+        self.assertEqual(list(values), [30.0, 35.0, 31.0, 32.0, 60.0])
+
+    def test_datetime_times(self):
+        """Test datetime64 timestamps are bucketed and returned unchanged in type"""
+        stamps = self.times.astype(np.int64).astype('datetime64[s]')
+
+        times, values = minmax_downsample(stamps, self.values, buckets=400)
+
+        self.assertEqual(times.dtype, np.dtype('datetime64[s]'))
+        self.assertEqual(values.max(), 95.0)
+
+    def test_empty_series(self):
+        """Test an empty range gives empty arrays"""
+        times, values = minmax_downsample(np.array([]), np.array([]), buckets=10)
+
+        self.assertEqual(len(times), 0)
+        self.assertEqual(len(values), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,191 @@
+import unittest
+import tempfile
+import os
+import sys
+from datetime import datetime
+from unittest.mock import MagicMock
+
+# Add the project root to the path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from smart_gardening.actuators.dispatcher import PumpDispatcher
+from smart_gardening.db.database import (
+    Base, PumpState, SensorReading, ZoneLatestState, ZoneModel,
+    rebuild_zone_latest_state, record_batch, record_readings
+)
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+
+class TestIngestion(unittest.TestCase):
+    """Test cases for batched sensor reading ingestion"""
+
+    def setUp(self):
+        """Set up test database"""
+        self.temp_db = tempfile.NamedTemporaryFile(delete=False, suffix='.db')
+        self.db_path = self.temp_db.name
+        self.temp_db.close()
+
+        self.engine = create_engine(f'sqlite:///{self.db_path}')
+        Base.metadata.create_all(self.engine)
+
+        TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=self.engine)
+        self.test_session = TestingSessionLocal()
+
+        self.commits = 0
+
+        @event.listens_for(self.test_session, "after_commit")
+        def count_commit(session):
+            self.commits += 1
+
+    def tearDown(self):
+        """Clean up test database"""
+        self.test_session.close()
+        self.engine.dispose()
+        os.unlink(self.db_path)
+
+    def test_record_readings_single_commit(self):
+        """Test a large batch is written with a single commit"""
+        batch = [
+            {'zone_id': zone_id, 'moisture': 40.0, 'ph': 6.5}
+            for zone_id in range(1, 10001)
+        ]
+
+        inserted = record_readings(batch, db_session=self.test_session, flush_size=1000)
+
+        self.assertEqual(inserted, 10000)
+        self.assertEqual(self.commits, 1)
+        self.assertEqual(self.test_session.query(SensorReading).count(), 10000)
+
+    def test_record_readings_shared_timestamp(self):
+        """Test rows without a timestamp share one capture time"""
+        explicit = datetime(2025, 6, 1, 12, 0, 0)
+        batch = [
+            {'zone_id': 1, 'moisture': 40.0, 'ph': 6.5},
+            {'zone_id': 2, 'moisture': 45.0, 'ph': 6.8},
+            {'zone_id': 3, 'moisture': 50.0, 'ph': 7.0, 'timestamp': explicit},
+        ]
+
+        record_readings(batch, db_session=self.test_session)
+
+        readings = {r.zone_id: r for r in self.test_session.query(SensorReading).all()}
+        self.assertEqual(readings[1].timestamp, readings[2].timestamp)
+        self.assertEqual(readings[3].timestamp, explicit)
+        self.assertEqual(readings[2].moisture, 45.0)
+
+    def test_record_readings_empty_batch(self):
+        """Test an empty batch does not open a transaction"""
+        self.assertEqual(record_readings([], db_session=self.test_session), 0)
+        self.assertEqual(self.commits, 0)
+
+    def test_record_readings_rolls_back_on_error(self):
+        """Test a failing batch is rolled back as a whole"""
+        batch = [
+            {'zone_id': 1, 'moisture': 40.0, 'ph': 6.5},
+            {'zone_id': None, 'moisture': 45.0, 'ph': 6.8},
+        ]
+
+        inserted = record_readings(batch, db_session=self.test_session, flush_size=1)
+
+        self.assertEqual(inserted, 0)
+        self.assertEqual(self.test_session.query(SensorReading).count(), 0)
+        self.assertEqual(self.test_session.query(ZoneLatestState).count(), 0)
+
+    def test_pump_on_log_moves_last_watered_forward(self):
+        """Test the latest ON transition becomes the zone's last_watered, never an older one"""
+        self.test_session.add(ZoneModel(id=1, name="Herbs"))
+        self.test_session.commit()
+        morning, noon = datetime(2025, 6, 1, 8, 0, 0), datetime(2025, 6, 1, 12, 0, 0)
+
+        record_batch([], [
+            {'zone_id': 1, 'status': "ON", 'timestamp': morning},
+            {'zone_id': 1, 'status': "ON", 'timestamp': noon},
+            {'zone_id': 1, 'status': "OFF", 'timestamp': datetime(2025, 6, 1, 12, 5, 0)},
+        ], db_session=self.test_session)
+        record_batch([], [{'zone_id': 1, 'status': "ON", 'timestamp': morning}], db_session=self.test_session)
+
+        self.test_session.expire_all()
+        self.assertEqual(self.test_session.get(ZoneModel, 1).last_watered, noon)
+
+    def test_rejected_pump_command_does_not_mark_zone_watered(self):
+        """Test last_watered waits for the dispatcher to confirm the transition"""
+        self.test_session.add(ZoneModel(id=1, name="Herbs"))
+        self.test_session.commit()
+        driver = MagicMock(side_effect=[IOError("bus busy"), None])
+        dispatcher = PumpDispatcher(driver, log=lambda rows: record_batch([], rows, db_session=self.test_session))
+        dispatcher.seed({1: False})
+
+        dispatcher.command(1, True, timestamp=datetime(2025, 6, 1, 12, 0, 0))
+        dispatcher.dispatch()
+        self.test_session.expire_all()
+        self.assertIsNone(self.test_session.get(ZoneModel, 1).last_watered)
+
+        dispatcher.dispatch(force=True)
+        self.test_session.expire_all()
+        self.assertEqual(self.test_session.get(ZoneModel, 1).last_watered, datetime(2025, 6, 1, 12, 0, 0))
+
+
+    def test_batch_updates_zone_latest_state(self):
+        """Test each zone's newest reading, pump state and watering time land in zone_latest_state"""
+        early, late = datetime(2025, 6, 1, 12, 0, 0), datetime(2025, 6, 1, 12, 0, 30)
+
+        record_batch(
+            [
+                {'zone_id': 1, 'moisture': 22.0, 'ph': 6.1, 'timestamp': late},
+                {'zone_id': 1, 'moisture': 25.0, 'ph': 6.2, 'timestamp': early},
+                {'zone_id': 2, 'moisture': 48.0, 'ph': 7.0, 'timestamp': early},
+            ],
+            [{'zone_id': 1, 'status': "ON", 'timestamp': late}],
+            db_session=self.test_session,
+        )
+
+        self.assertEqual(self.commits, 1)
+        states = {state.zone_id: state for state in self.test_session.query(ZoneLatestState)}
+        self.assertEqual((states[1].moisture, states[1].ph, states[1].reading_at), (22.0, 6.1, late))
+        self.assertTrue(states[1].pump_on)
+        self.assertEqual(states[1].last_watered, late)
+        self.assertEqual((states[2].moisture, states[2].reading_at), (48.0, early))
+        self.assertFalse(states[2].pump_on)
+        self.assertIsNone(states[2].last_watered)
+
+    def test_late_rows_do_not_rewind_zone_latest_state(self):
+        """Test an older reading or watering arriving later leaves the newer state in place"""
+        morning, noon = datetime(2025, 6, 1, 8, 0, 0), datetime(2025, 6, 1, 12, 0, 0)
+        record_batch([{'zone_id': 1, 'moisture': 30.0, 'ph': 6.5, 'timestamp': noon}],
+                     pump_states=[{'zone_id': 1, 'pump_on': True, 'pump_start': noon, 'last_watered': noon}],
+                     db_session=self.test_session)
+
+        record_batch([{'zone_id': 1, 'moisture': 60.0, 'ph': 6.9, 'timestamp': morning}],
+                     pump_states=[{'zone_id': 1, 'pump_on': False, 'last_watered': morning}],
+                     db_session=self.test_session)
+
+        self.test_session.expire_all()
+        state = self.test_session.get(ZoneLatestState, 1)
+        self.assertEqual((state.moisture, state.reading_at), (30.0, noon))
+        self.assertEqual(state.last_watered, noon)
+        self.assertFalse(state.pump_on)
+
+    def test_rebuild_zone_latest_state(self):
+        """Test the state table is backfilled from zones, pump_state and sensor_readings"""
+        noon = datetime(2025, 6, 1, 12, 0, 0)
+        self.test_session.add_all([
+            ZoneModel(id=1, name="Herbs", last_watered=noon),
+            ZoneModel(id=2, name="Roses"),
+            PumpState(zone_id=1, pump_on=True, pump_start=noon),
+            SensorReading(zone_id=1, moisture=33.0, ph=6.4, timestamp=noon),
+            SensorReading(zone_id=1, moisture=35.0, ph=6.6, timestamp=datetime(2025, 6, 1, 11, 0, 0)),
+        ])
+        self.test_session.commit()
+
+        self.assertEqual(rebuild_zone_latest_state(self.test_session), 2)
+
+        states = {state.zone_id: state for state in self.test_session.query(ZoneLatestState)}
+        self.assertEqual((states[1].moisture, states[1].reading_at), (33.0, noon))
+        self.assertTrue(states[1].pump_on)
+        self.assertEqual(states[1].last_watered, noon)
+        self.assertIsNone(states[2].reading_at)
+        self.assertFalse(states[2].pump_on)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,243 @@
+import unittest
+import tempfile
+import os
+import sys
+from datetime import datetime, timedelta
+
+# Add the project root to the path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from smart_gardening.db.database import Base, SensorReading, PumpLog, ZoneLatestState
+from sqlalchemy import create_engine, inspect, text
+from sqlalchemy.orm import sessionmaker
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+
+class TestQueryPlans(unittest.TestCase):
+    """Regression tests proving the hot sensor/pump queries are served by an index"""
+
+    def setUp(self):
+        """Set up test database with a few readings per zone"""
+        self.temp_db = tempfile.NamedTemporaryFile(delete=False, suffix='.db')
+        self.db_path = self.temp_db.name
+        self.temp_db.close()
+
+        self.engine = create_engine(f'sqlite:///{self.db_path}')
+        Base.metadata.create_all(self.engine)
+
+        TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=self.engine)
+        self.test_session = TestingSessionLocal()
+
+        now = datetime.utcnow()
+        for zone_id in range(1, 4):
+            for hours in range(24):
+                self.test_session.add(SensorReading(
+                    zone_id=zone_id, moisture=40.0, ph=6.5,
+                    timestamp=now - timedelta(hours=hours)
+                ))
+                self.test_session.add(PumpLog(
+                    zone_id=zone_id, status="ON",
+                    timestamp=now - timedelta(hours=hours)
+                ))
+        self.test_session.commit()
+
+    def tearDown(self):
+        """Clean up test database"""
+        self.test_session.close()
+        self.engine.dispose()
+        os.unlink(self.db_path)
+
+    def explain(self, query):
+        """Return the SQLite query plan for an ORM query as a single string"""
+        statement = query.statement.compile(self.engine, compile_kwargs={"literal_binds": True})
+        with self.engine.connect() as conn:
+            rows = conn.execute(text(f"EXPLAIN QUERY PLAN {statement}")).fetchall()
+        return "\n".join(row[-1] for row in rows)
+
+    def test_latest_reading_uses_composite_index(self):
+        """Test 'latest reading for a zone' is an index search with no sort step"""
+        plan = self.explain(
+            self.test_session.query(SensorReading)
+            .filter(SensorReading.zone_id == 1)
+            .order_by(SensorReading.timestamp.desc())
+            .limit(1)
+        )
+        self.assertIn("ix_sensor_readings_zone_id_timestamp", plan)
+        self.assertNotIn("TEMP B-TREE", plan)
+
+    def test_recent_window_uses_composite_index(self):
+        """Test the 7-day zone window ranges over the composite index"""
+        plan = self.explain(
+            self.test_session.query(SensorReading)
+            .filter(
+                SensorReading.zone_id == 1,
+                SensorReading.timestamp >= datetime(2025, 1, 1)
+            )
+            .order_by(SensorReading.timestamp.desc())
+            .limit(10)
+        )
+        self.assertIn("ix_sensor_readings_zone_id_timestamp (zone_id=? AND timestamp>?)", plan)
+        self.assertNotIn("TEMP B-TREE", plan)
+
+    def test_retention_cutoff_uses_timestamp_index(self):
+        """Test the retention cutoff filter is an index range scan on both tables"""
+        reading_plan = self.explain(
+            self.test_session.query(SensorReading.id)
+            .filter(SensorReading.timestamp < datetime(2025, 1, 1))
+        )
+        self.assertIn("ix_sensor_readings_timestamp (timestamp<?)", reading_plan)
+
+        pump_plan = self.explain(
+            self.test_session.query(PumpLog.id)
+            .filter(PumpLog.timestamp < datetime(2025, 1, 1))
+        )
+        self.assertIn("ix_pump_logs_timestamp (timestamp<?)", pump_plan)
+
+    def test_stats_oldest_and_newest_avoid_sort(self):
+        """Test oldest/newest record lookups walk the timestamp index"""
+        for ordering in (SensorReading.timestamp.asc(), SensorReading.timestamp.desc()):
+            plan = self.explain(
+                self.test_session.query(SensorReading).order_by(ordering).limit(1)
+            )
+            self.assertIn("ix_sensor_readings_timestamp", plan)
+            self.assertNotIn("TEMP B-TREE", plan)
+
+    def test_pump_log_history_uses_composite_index(self):
+        """Test per-zone pump history is served by the composite index"""
+        plan = self.explain(
+            self.test_session.query(PumpLog)
+            .filter(PumpLog.zone_id == 2)
+            .order_by(PumpLog.timestamp.desc())
+        )
+        self.assertIn("ix_pump_logs_zone_id_timestamp", plan)
+        self.assertNotIn("TEMP B-TREE", plan)
+
+    def test_zone_state_delta_uses_updated_at_index(self):
+        """Test the dashboard's 'changed since' refresh is an index range scan"""
+        plan = self.explain(
+            self.test_session.query(ZoneLatestState)
+            .filter(ZoneLatestState.updated_at > datetime(2025, 1, 1))
+            .order_by(ZoneLatestState.updated_at)
+        )
+        self.assertIn("ix_zone_latest_state_updated_at (updated_at>?)", plan)
+        self.assertNotIn("TEMP B-TREE", plan)
+
+
+class TestAlembicMigrations(unittest.TestCase):
+    """Test the Alembic revisions bring an old database in line with the models"""
+
+    def setUp(self):
+        """Set up an empty database file for Alembic to migrate"""
+        try:
+            from alembic import command
+            from alembic.config import Config as AlembicConfig
+        except ImportError:
+            self.skipTest("alembic is not installed")
+
+        self.command = command
+        self.temp_db = tempfile.NamedTemporaryFile(delete=False, suffix='.db')
+        self.db_path = self.temp_db.name
+        self.temp_db.close()
+
+        self.alembic_cfg = AlembicConfig(os.path.join(PROJECT_ROOT, 'alembic.ini'))
+        self.alembic_cfg.set_main_option('script_location', os.path.join(PROJECT_ROOT, 'alembic'))
+        self.alembic_cfg.set_main_option('sqlalchemy.url', f'sqlite:///{self.db_path}')
+
+    def tearDown(self):
+        """Clean up test database"""
+        os.unlink(self.db_path)
+
+    def test_upgrade_head_matches_models(self):
+        """Test upgrading to head yields integer zone ids and the new indexes"""
+        self.command.upgrade(self.alembic_cfg, 'head')
+
+        engine = create_engine(f'sqlite:///{self.db_path}')
+        inspector = inspect(engine)
+
+        for table in ('sensor_readings', 'pump_logs'):
+            columns = {column['name']: column for column in inspector.get_columns(table)}
+            self.assertEqual(str(columns['zone_id']['type']), 'INTEGER')
+            index_names = {index['name'] for index in inspector.get_indexes(table)}
+            self.assertIn(f'ix_{table}_zone_id_timestamp', index_names)
+            self.assertIn(f'ix_{table}_timestamp', index_names)
+
+        zone_columns = {column['name']: column for column in inspector.get_columns('zones')}
+        self.assertEqual(str(zone_columns['id']['type']), 'INTEGER')
+        self.assertIn('last_watered', zone_columns)
+        self.assertIn('updated_at', zone_columns)
+        self.assertIn('plants', inspector.get_table_names())
+        self.assertIn('pump_state', inspector.get_table_names())
+        self.assertIn('zone_latest_state', inspector.get_table_names())
+        self.assertIn('ix_zone_latest_state_updated_at',
+                      {index['name'] for index in inspector.get_indexes('zone_latest_state')})
+        engine.dispose()
+
+    def test_downgrade_round_trip(self):
+        """Test the migration can be rolled back to the initial revision"""
+        self.command.upgrade(self.alembic_cfg, 'head')
+        self.command.downgrade(self.alembic_cfg, '747264af12c9')
+
+        engine = create_engine(f'sqlite:///{self.db_path}')
+        inspector = inspect(engine)
+        self.assertNotIn('plants', inspector.get_table_names())
+        self.assertEqual(inspector.get_indexes('sensor_readings'), [])
+        engine.dispose()
+
+    def seed_legacy_rows(self, zone_id='1'):
+        """Insert rows the way the initial schema stored them"""
+        self.command.upgrade(self.alembic_cfg, '747264af12c9')
+        engine = create_engine(f'sqlite:///{self.db_path}')
+        with engine.begin() as connection:
+            connection.execute(text(
+                "INSERT INTO zones (id, name, moisture_threshold, ph_min, ph_max) "
+                "VALUES (:id, 'Herbs', 30, 6.0, 7.0)"), {'id': zone_id})
+            connection.execute(text(
+                "INSERT INTO sensor_readings (zone_id, moisture, ph, timestamp) "
+                "VALUES (:id, 42.5, 6.5, '2025-08-01 12:00:00')"), {'id': zone_id})
+            connection.execute(text(
+                "INSERT INTO pump_logs (zone_id, status, timestamp) VALUES "
+                "(:id, 1, '2025-08-01 12:00:00'), (:id, 0, '2025-08-01 12:05:00')"), {'id': zone_id})
+        engine.dispose()
+
+    def test_legacy_rows_survive_round_trip(self):
+        """Test zone ids and boolean pump states are converted both ways"""
+        self.seed_legacy_rows()
+        self.command.upgrade(self.alembic_cfg, 'head')
+
+        engine = create_engine(f'sqlite:///{self.db_path}')
+        with engine.connect() as connection:
+            self.assertEqual(connection.execute(text("SELECT id, typeof(id) FROM zones")).all(),
+                             [(1, 'integer')])
+            self.assertEqual(connection.execute(text("SELECT typeof(zone_id) FROM sensor_readings")).scalar(),
+                             'integer')
+            self.assertEqual(connection.execute(text(
+                "SELECT zone_id, status FROM pump_logs ORDER BY timestamp")).all(),
+                [(1, 'ON'), (1, 'OFF')])
+        engine.dispose()
+
+        self.command.downgrade(self.alembic_cfg, '747264af12c9')
+
+        engine = create_engine(f'sqlite:///{self.db_path}')
+        with engine.connect() as connection:
+            self.assertEqual(connection.execute(text("SELECT id FROM zones")).scalar(), '1')
+            self.assertEqual(connection.execute(text(
+                "SELECT zone_id, status FROM pump_logs ORDER BY timestamp")).all(),
+                [('1', 1), ('1', 0)])
+        engine.dispose()
+
+    def test_non_numeric_zone_ids_abort_upgrade(self):
+        """Test the upgrade refuses zone ids that would be cast to 0"""
+        self.seed_legacy_rows(zone_id='greenhouse-1')
+
+        with self.assertRaises(RuntimeError):
+            self.command.upgrade(self.alembic_cfg, 'head')
+
+        engine = create_engine(f'sqlite:///{self.db_path}')
+        with engine.connect() as connection:
+            self.assertEqual(connection.execute(text("SELECT id FROM zones")).scalar(), 'greenhouse-1')
+        engine.dispose()
+
+
+if __name__ == '__main__':
+    unittest.main()
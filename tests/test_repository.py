@@ -0,0 +1,263 @@
+import unittest
+import tempfile
+import os
+import sys
+from datetime import datetime, timedelta, timezone
+
+# Add the project root to the path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from smart_gardening.core.zone_table import ZoneTable
+from smart_gardening.db.database import Base, PlantModel, PumpState, ZoneModel, record_batch
+from smart_gardening.db.repository import (
+    ZoneWatcher, get_zone_states, get_zone_with_plants, load_dashboard_zones, load_zones
+)
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+
+class TestLoadZones(unittest.TestCase):
+    """Test cases for rebuilding controller zones from the database"""
+
+    def setUp(self):
+        """Set up test database with zones and checkpointed pump states"""
+        self.temp_db = tempfile.NamedTemporaryFile(delete=False, suffix='.db')
+        self.db_path = self.temp_db.name
+        self.temp_db.close()
+
+        self.engine = create_engine(f'sqlite:///{self.db_path}')
+        Base.metadata.create_all(self.engine)
+        self.test_session = sessionmaker(bind=self.engine)()
+
+        self.watered = datetime(2025, 6, 1, 6, 0, 0)
+        self.started = datetime(2025, 6, 1, 12, 0, 0)
+        self.test_session.add_all([
+            ZoneModel(id=1, name="Herbs", moisture_threshold=25, ph_min=6.5, ph_max=7.0, last_watered=self.watered),
+            ZoneModel(id=2, name="Tomatoes", moisture_threshold=40),
+            ZoneModel(id=3, name="Roses", moisture_threshold=35),
+            PumpState(zone_id=2, pump_on=True, pump_start=self.started),
+            PumpState(zone_id=3, pump_on=False, pump_start=None),
+        ])
+        self.test_session.commit()
+
+    def tearDown(self):
+        """Clean up test database"""
+        self.test_session.close()
+        self.engine.dispose()
+        os.unlink(self.db_path)
+
+    def test_restores_configuration_and_pump_state(self):
+        """Test zones come back with thresholds, last watering and running pumps"""
+        zones = {zone.id: zone for zone in load_zones(self.test_session)}
+
+        self.assertEqual(sorted(zones), [1, 2, 3])
+        self.assertEqual(zones[1].moisture_threshold, 25)
+        self.assertEqual(zones[1].ph_range, (6.5, 7.0))
+        self.assertEqual(zones[1].last_watering_time.timestamp(),
+                         self.watered.replace(tzinfo=timezone.utc).timestamp())
+        self.assertFalse(zones[1].pump_status)
+        self.assertTrue(zones[2].pump_status)
+        self.assertEqual(zones[2].pump_start_time.timestamp(),
+                         self.started.replace(tzinfo=timezone.utc).timestamp())
+        self.assertFalse(zones[3].pump_status)
+        self.assertIsNone(zones[3].pump_start_time)
+
+    def test_single_query_for_all_zones(self):
+        """Test the warm start costs one query however many zones exist"""
+        self.test_session.add_all(ZoneModel(name=f"Bed {n}") for n in range(50))
+        self.test_session.commit()
+        statements = []
+        event.listen(self.engine, 'before_cursor_execute', lambda *args: statements.append(args[2]))
+
+        zones = load_zones(self.test_session)
+
+        self.assertEqual(len(zones), 53)
+        self.assertEqual(len(statements), 1)
+
+    def test_restored_zones_drive_the_table(self):
+        """Test a restored running pump is stopped once its max runtime has passed"""
+        zones = load_zones(self.test_session)
+        table = ZoneTable.from_zones(zones)
+        now = self.started.replace(tzinfo=timezone.utc) + timedelta(minutes=31)
+
+        table.moisture[:] = 0.0
+        self.assertEqual(table.deactivate_mask(now).tolist(), [False, True, False])
+
+
+class TestZoneWatcher(unittest.TestCase):
+    """Test cases for incremental zone reloads"""
+
+    def setUp(self):
+        """Set up test database with two zones and a loaded watcher"""
+        self.temp_db = tempfile.NamedTemporaryFile(delete=False, suffix='.db')
+        self.db_path = self.temp_db.name
+        self.temp_db.close()
+
+        self.engine = create_engine(f'sqlite:///{self.db_path}')
+        Base.metadata.create_all(self.engine)
+        self.SessionLocal = sessionmaker(bind=self.engine)
+        self.test_session = self.SessionLocal()
+        self.test_session.add_all([
+            ZoneModel(id=1, name="Herbs", moisture_threshold=25),
+            ZoneModel(id=2, name="Tomatoes", moisture_threshold=40),
+        ])
+        self.test_session.commit()
+
+        self.watcher = ZoneWatcher(self.SessionLocal)
+        self.zones = self.watcher.load()
+
+    def tearDown(self):
+        """Clean up test database"""
+        self.test_session.close()
+        self.engine.dispose()
+        os.unlink(self.db_path)
+
+    def test_idle_poll_is_one_query(self):
+        """Test a poll with nothing changed costs a single aggregate query"""
+        statements = []
+        event.listen(self.engine, 'before_cursor_execute', lambda *args: statements.append(args[2]))
+
+        self.assertEqual(self.watcher.poll(), ([], set()))
+        self.assertEqual(len(statements), 1)
+        self.assertEqual([zone.id for zone in self.zones], [1, 2])
+
+    def test_reports_inserts_updates_and_deletes(self):
+        """Test each kind of change is reported once, with only the changed zones"""
+        self.test_session.add(ZoneModel(id=3, name="Roses", moisture_threshold=35))
+        self.test_session.get(ZoneModel, 1).moisture_threshold = 30
+        self.test_session.commit()
+
+        changed, removed = self.watcher.poll()
+        self.assertEqual({zone.id: zone.moisture_threshold for zone in changed}, {1: 30, 3: 35})
+        self.assertEqual(removed, set())
+        self.assertEqual(self.watcher.poll(), ([], set()))
+
+        self.test_session.delete(self.test_session.get(ZoneModel, 2))
+        self.test_session.commit()
+
+        self.assertEqual(self.watcher.poll(), ([], {2}))
+        self.assertEqual(self.watcher.poll(), ([], set()))
+
+    def test_watering_is_not_a_configuration_change(self):
+        """Test last_watered written by the controller does not trigger a reload"""
+        record_batch([], [{'zone_id': 1, 'status': "ON", 'timestamp': datetime(2030, 1, 1)}],
+                     db_session=self.test_session)
+
+        self.assertEqual(self.watcher.poll(), ([], set()))
+
+    def test_zone_filter_limits_changes(self):
+        """Test a shard's watcher only sees its own zones"""
+        watcher = ZoneWatcher(self.SessionLocal, zone_filter=lambda zone_id: zone_id % 2 == 1)
+        self.assertEqual([zone.id for zone in watcher.load()], [1])
+        self.test_session.add_all([ZoneModel(id=3, name="Roses"), ZoneModel(id=4, name="Lilies")])
+        self.test_session.delete(self.test_session.get(ZoneModel, 2))
+        self.test_session.commit()
+
+        changed, removed = watcher.poll()
+
+        self.assertEqual([zone.id for zone in changed], [3])
+        self.assertEqual(removed, set())
+
+
+class TestDashboardZones(unittest.TestCase):
+    """Test cases for loading zones with their plants for the dashboard"""
+
+    def setUp(self):
+        """Set up test database with zones, plants and recorded state"""
+        self.temp_db = tempfile.NamedTemporaryFile(delete=False, suffix='.db')
+        self.db_path = self.temp_db.name
+        self.temp_db.close()
+
+        self.engine = create_engine(f'sqlite:///{self.db_path}')
+        Base.metadata.create_all(self.engine)
+        self.test_session = sessionmaker(bind=self.engine)()
+
+        self.test_session.add_all([
+            ZoneModel(id=1, name="Herbs"),
+            ZoneModel(id=2, name="Tomatoes"),
+            ZoneModel(id=3, name="Roses"),
+            PlantModel(zone_id=1, name="Basil", plant_type="Herb", planting_date=datetime(2025, 5, 1)),
+            PlantModel(zone_id=1, name="Thyme", plant_type="Herb"),
+            PlantModel(zone_id=2, name="Cherry", plant_type="Vegetable", notes="Stake early"),
+        ])
+        self.test_session.commit()
+        self.read_at = datetime(2025, 6, 1, 12, 0, 0)
+        record_batch([{'zone_id': 2, 'moisture': 55.0, 'ph': 7.2, 'timestamp': self.read_at}],
+                     pump_states=[{'zone_id': 2, 'pump_on': True, 'pump_start': self.read_at}],
+                     db_session=self.test_session)
+
+    def tearDown(self):
+        """Clean up test database"""
+        self.test_session.close()
+        self.engine.dispose()
+        os.unlink(self.db_path)
+
+    def count_statements(self):
+        """Record every SQL statement sent to the test engine"""
+        statements = []
+        event.listen(self.engine, 'before_cursor_execute', lambda *args: statements.append(args[2]))
+        return statements
+
+    def test_plants_are_attached_to_their_zones(self):
+        """Test each zone carries its own plants and pump state"""
+        zones = {zone.id: zone for zone in load_dashboard_zones(self.test_session)}
+
+        self.assertEqual([plant['name'] for plant in zones[1].plants], ["Basil", "Thyme"])
+        self.assertEqual(zones[1].plants[0]['planting_date'], '2025-05-01')
+        self.assertIsNone(zones[1].plants[1]['planting_date'])
+        self.assertEqual(zones[2].plants[0]['notes'], "Stake early")
+        self.assertEqual(zones[3].plants, [])
+        self.assertTrue(zones[2].pump_status)
+
+    def test_query_count_does_not_grow_with_zones(self):
+        """Test zones, latest state and plants load in two queries however many zones exist"""
+        for n in range(50):
+            zone = ZoneModel(name=f"Bed {n}")
+            self.test_session.add(zone)
+            self.test_session.flush()
+            self.test_session.add(PlantModel(zone_id=zone.id, name=f"Plant {n}", plant_type="Flower"))
+        self.test_session.commit()
+        self.test_session.expire_all()
+        statements = self.count_statements()
+
+        zones = load_dashboard_zones(self.test_session)
+
+        self.assertEqual(len(zones), 53)
+        self.assertEqual(sum(len(zone.plants) for zone in zones), 53)
+        self.assertEqual(len(statements), 2)
+
+    def test_latest_state_per_zone(self):
+        """Test each zone shows its recorded state and zones without one show none"""
+        zones = {zone.id: zone for zone in load_dashboard_zones(self.test_session)}
+
+        self.assertEqual((zones[2].moisture, zones[2].ph), (55.0, 7.2))
+        self.assertEqual(zones[2].reading_time.timestamp(), self.read_at.replace(tzinfo=timezone.utc).timestamp())
+        self.assertIsNone(zones[3].moisture)
+        self.assertIsNone(zones[3].reading_time)
+        self.assertFalse(zones[3].pump_status)
+
+    def test_zone_states_since(self):
+        """Test only state rows written after the given time are returned"""
+        later = datetime.utcnow() + timedelta(hours=1)
+        record_batch([{'zone_id': 3, 'moisture': 41.0, 'ph': 6.9}], db_session=self.test_session)
+        first = get_zone_states(db_session=self.test_session)
+
+        self.assertEqual([state.zone_id for state in first], [2, 3])
+        self.assertEqual([state.zone_id for state in get_zone_states(first[0].updated_at, self.test_session)], [3])
+        self.assertEqual(get_zone_states(later, self.test_session), [])
+
+    def test_zone_with_plants(self):
+        """Test a single zone comes back with its plants already loaded"""
+        self.test_session.expire_all()
+        statements = self.count_statements()
+
+        zone = get_zone_with_plants(1, self.test_session)
+        names = [plant.name for plant in zone.plants]
+
+        self.assertEqual(names, ["Basil", "Thyme"])
+        self.assertEqual(len(statements), 2)
+        self.assertIsNone(get_zone_with_plants(99, self.test_session))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,235 @@
+import unittest
+import tempfile
+import os
+import sys
+from datetime import datetime, timedelta
+
+import numpy as np
+
+# Add the project root to the path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from smart_gardening.db.database import (
+    Base,
+    SensorRollup,
+    SensorReading,
+    record_readings,
+    rebuild_rollups,
+    get_chart_series,
+    get_sensor_history,
+    select_history_resolution,
+)
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+
+class TestSensorRollups(unittest.TestCase):
+    """Test cases for incremental 1m/1h/1d sensor rollups"""
+
+    def setUp(self):
+        """Set up test database"""
+        self.temp_db = tempfile.NamedTemporaryFile(delete=False, suffix='.db')
+        self.db_path = self.temp_db.name
+        self.temp_db.close()
+
+        self.engine = create_engine(f'sqlite:///{self.db_path}')
+        Base.metadata.create_all(self.engine)
+
+        TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=self.engine)
+        self.test_session = TestingSessionLocal()
+        self.base_time = datetime(2025, 6, 1, 12, 0, 0)
+
+    def tearDown(self):
+        """Clean up test database"""
+        self.test_session.close()
+        self.engine.dispose()
+        os.unlink(self.db_path)
+
+    def rollup(self, resolution, zone_id, bucket_start):
+        return self.test_session.query(SensorRollup).filter_by(
+            resolution=resolution, zone_id=zone_id, bucket_start=bucket_start
+        ).one()
+
+    def test_rollups_maintained_on_ingest(self):
+        """Test each batch updates the minute, hour and day buckets"""
+        record_readings([
+            {'zone_id': 1, 'moisture': 40.0, 'ph': 6.0, 'timestamp': self.base_time + timedelta(seconds=10)},
+            {'zone_id': 1, 'moisture': 60.0, 'ph': 7.0, 'timestamp': self.base_time + timedelta(seconds=40)},
+            {'zone_id': 1, 'moisture': 50.0, 'ph': 6.5, 'timestamp': self.base_time + timedelta(minutes=5)},
+        ], db_session=self.test_session)
+
+        minute = self.rollup(60, 1, self.base_time)
+        self.assertEqual(minute.count, 2)
+        self.assertEqual(minute.moisture_min, 40.0)
+        self.assertEqual(minute.moisture_max, 60.0)
+        self.assertAlmostEqual(minute.moisture_mean, 50.0)
+        self.assertAlmostEqual(minute.ph_mean, 6.5)
+
+        hour = self.rollup(3600, 1, self.base_time)
+        self.assertEqual(hour.count, 3)
+
+        day = self.rollup(86400, 1, datetime(2025, 6, 1))
+        self.assertEqual(day.count, 3)
+        self.assertEqual(day.ph_max, 7.0)
+
+    def test_rollups_merge_across_batches(self):
+        """Test a later batch folds into existing buckets instead of duplicating them"""
+        record_readings([
+            {'zone_id': 1, 'moisture': 40.0, 'ph': 6.0, 'timestamp': self.base_time},
+        ], db_session=self.test_session)
+        record_readings([
+            {'zone_id': 1, 'moisture': 20.0, 'ph': 7.5, 'timestamp': self.base_time + timedelta(minutes=30)},
+        ], db_session=self.test_session)
+
+        hour = self.rollup(3600, 1, self.base_time)
+        self.assertEqual(hour.count, 2)
+        self.assertEqual(hour.moisture_min, 20.0)
+        self.assertEqual(hour.moisture_max, 40.0)
+        self.assertEqual(hour.ph_min, 6.0)
+        self.assertEqual(hour.ph_max, 7.5)
+        self.assertEqual(self.test_session.query(SensorRollup).filter_by(resolution=3600).count(), 1)
+
+    def test_rebuild_matches_incremental(self):
+        """Test rebuilding from raw readings reproduces the incremental rollups"""
+        readings = [
+            {'zone_id': zone_id, 'moisture': 30.0 + i, 'ph': 6.0 + i / 100,
+             'timestamp': self.base_time + timedelta(minutes=7 * i)}
+            for zone_id in (1, 2) for i in range(40)
+        ]
+        record_readings(readings, db_session=self.test_session)
+        incremental = sorted(
+            (r.resolution, r.zone_id, r.bucket_start, r.count, r.moisture_min, r.moisture_max)
+            for r in self.test_session.query(SensorRollup).all()
+        )
+
+        processed = rebuild_rollups(db_session=self.test_session, chunk_size=7)
+
+        rebuilt = sorted(
+            (r.resolution, r.zone_id, r.bucket_start, r.count, r.moisture_min, r.moisture_max)
+            for r in self.test_session.query(SensorRollup).all()
+        )
+        self.assertEqual(processed, 80)
+        self.assertEqual(rebuilt, incremental)
+
+    def test_rebuild_keeps_history_of_expired_readings(self):
+        """Test rebuilding after raw readings expired keeps their hourly and daily rollups"""
+        record_readings([
+            {'zone_id': 1, 'moisture': 40.0, 'ph': 6.5, 'timestamp': datetime(2025, 6, day, hour, 30)}
+            for day in (1, 2, 3) for hour in (6, 18)
+        ], db_session=self.test_session)
+        # Retention removed the raw readings of June 1st and part of June 2nd
+        self.test_session.query(SensorReading).filter(
+            SensorReading.timestamp < datetime(2025, 6, 2, 12)
+        ).delete()
+        self.test_session.commit()
+
+        processed = rebuild_rollups(db_session=self.test_session)
+
+        self.assertEqual(processed, 3)
+        self.assertEqual(self.rollup(86400, 1, datetime(2025, 6, 1)).count, 2)
+        self.assertEqual(self.rollup(3600, 1, datetime(2025, 6, 1, 6)).count, 1)
+        # The day straddling the oldest remaining reading keeps its full count
+        self.assertEqual(self.rollup(86400, 1, datetime(2025, 6, 2)).count, 2)
+        self.assertEqual(self.rollup(86400, 1, datetime(2025, 6, 3)).count, 2)
+        self.assertEqual(self.rollup(3600, 1, datetime(2025, 6, 2, 18)).count, 1)
+
+    def test_select_history_resolution(self):
+        """Test the finest resolution that fits the point budget is chosen"""
+        self.assertEqual(select_history_resolution(24 * 3600, 2000), 60)
+        self.assertEqual(select_history_resolution(7 * 86400, 500), 3600)
+        self.assertEqual(select_history_resolution(365 * 86400, 500), 86400)
+        self.assertEqual(select_history_resolution(10 * 365 * 86400, 500), 86400)
+
+    def test_history_uses_raw_readings_for_short_ranges(self):
+        """Test short ranges within the budget return raw readings"""
+        record_readings([
+            {'zone_id': 1, 'moisture': 40.0 + i, 'ph': 6.5, 'timestamp': self.base_time + timedelta(seconds=30 * i)}
+            for i in range(10)
+        ], db_session=self.test_session)
+
+        history = get_sensor_history(
+            1, self.base_time, self.base_time + timedelta(hours=1),
+            max_points=100, db_session=self.test_session
+        )
+
+        self.assertEqual(history['resolution'], 0)
+        self.assertEqual(len(history['points']), 10)
+        self.assertEqual(history['points'][0]['moisture_mean'], 40.0)
+
+    def test_history_uses_rollups_for_long_ranges(self):
+        """Test long ranges are served from a rollup within the point budget"""
+        record_readings([
+            {'zone_id': 1, 'moisture': 50.0, 'ph': 6.5, 'timestamp': self.base_time + timedelta(minutes=10 * i)}
+            for i in range(6 * 24 * 30)
+        ], db_session=self.test_session)
+
+        history = get_sensor_history(
+            1, self.base_time, self.base_time + timedelta(days=30),
+            max_points=1000, db_session=self.test_session
+        )
+
+        self.assertEqual(history['resolution'], 3600)
+        self.assertLessEqual(len(history['points']), 1000)
+        self.assertEqual(history['points'][0]['count'], 6)
+        self.assertEqual(sum(point['count'] for point in history['points']), 6 * 24 * 30)
+
+    def test_history_filters_by_zone(self):
+        """Test history only includes the requested zone"""
+        record_readings([
+            {'zone_id': 1, 'moisture': 40.0, 'ph': 6.5, 'timestamp': self.base_time},
+            {'zone_id': 2, 'moisture': 80.0, 'ph': 6.5, 'timestamp': self.base_time},
+        ], db_session=self.test_session)
+
+        history = get_sensor_history(
+            2, self.base_time - timedelta(days=365), self.base_time + timedelta(days=1),
+            max_points=500, db_session=self.test_session
+        )
+
+        self.assertEqual(history['resolution'], 86400)
+        self.assertEqual(len(history['points']), 1)
+        self.assertEqual(history['points'][0]['moisture_mean'], 80.0)
+
+    def test_chart_uses_raw_readings_for_short_ranges(self):
+        """Test a day of readings within the row budget is charted from raw readings"""
+        record_readings([
+            {'zone_id': 1, 'moisture': 40.0 + i % 5, 'ph': 6.5, 'timestamp': self.base_time + timedelta(minutes=i)}
+            for i in range(1440)
+        ], db_session=self.test_session)
+
+        chart = get_chart_series(1, self.base_time, self.base_time + timedelta(days=1),
+                                 width=200, db_session=self.test_session)
+
+        self.assertEqual(chart['resolution'], 0)
+        times, values = chart['moisture']
+        self.assertLessEqual(len(times), 200)
+        self.assertEqual((values.min(), values.max()), (40.0, 44.0))
+        self.assertEqual(times[0], np.datetime64(self.base_time, 's'))
+
+    def test_chart_keeps_spikes_over_long_ranges(self):
+        """Test a short spike stays visible on a year-long chart served from rollups"""
+        spike = self.base_time + timedelta(days=200, minutes=3)
+        record_readings([
+            {'zone_id': 1, 'moisture': 50.0, 'ph': 6.5, 'timestamp': self.base_time + timedelta(hours=i)}
+            for i in range(24 * 365)
+        ] + [{'zone_id': 1, 'moisture': 97.0, 'ph': 8.4, 'timestamp': spike}], db_session=self.test_session)
+
+        chart = get_chart_series(1, self.base_time, self.base_time + timedelta(days=365),
+                                 width=800, db_session=self.test_session)
+
+        self.assertEqual(chart['resolution'], 3600)
+        for name, peak in (('moisture', 97.0), ('ph', 8.4)):
+            times, values = chart[name]
+            self.assertLessEqual(len(times), 800)
+            self.assertEqual(values.max(), peak)
+
+    def test_chart_of_empty_range(self):
+        """Test a zone without readings gives empty series"""
+        chart = get_chart_series(3, self.base_time, self.base_time + timedelta(days=30),
+                                 db_session=self.test_session)
+
+        self.assertEqual(len(chart['moisture'][0]), 0)
+        self.assertEqual(len(chart['ph'][1]), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
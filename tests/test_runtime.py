@@ -0,0 +1,300 @@
+import unittest
+import asyncio
+import tempfile
+import os
+import signal
+import sys
+import threading
+from datetime import datetime, timedelta, timezone
+from unittest.mock import MagicMock
+
+# Add the project root to the path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from smart_gardening.core.zone import Zone
+from smart_gardening.db.database import Base, SensorReading, PumpLog, PumpState, ZoneModel
+from smart_gardening.db.repository import ZoneWatcher, load_zones
+from smart_gardening.db.writer import BackgroundWriter
+from smart_gardening.core.budget import WaterBudget
+from smart_gardening.runtime import ControlRuntime
+from smart_gardening.sensors.drivers import SensorBus, SimulatedDriver
+from smart_gardening.sensors.gateway import FakeGateway, GatewayDriver
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+
+class TestControlRuntime(unittest.TestCase):
+    """Test cases for the asyncio control loop runtime"""
+
+    def setUp(self):
+        """Set up test database and zones"""
+        self.temp_db = tempfile.NamedTemporaryFile(delete=False, suffix='.db')
+        self.db_path = self.temp_db.name
+        self.temp_db.close()
+
+        self.engine = create_engine(f'sqlite:///{self.db_path}')
+        Base.metadata.create_all(self.engine)
+        self.SessionLocal = sessionmaker(bind=self.engine)
+        self.test_session = self.SessionLocal()
+
+        self.zones = [
+            Zone(id=1, name="Zone 1", moisture_threshold=101, pump_status=False),
+            Zone(id=2, name="Zone 2", moisture_threshold=0, pump_status=False),
+        ]
+        self.pump_driver = MagicMock()
+
+    def tearDown(self):
+        """Clean up test database"""
+        self.test_session.close()
+        self.engine.dispose()
+        os.unlink(self.db_path)
+
+    def make_runtime(self, poll_interval=0.05, **kwargs):
+        # Same interval for every zone state gives a plain fixed-rate poll
+        options = dict(idle_interval=poll_interval, near_interval=poll_interval, active_interval=poll_interval,
+                       flush_size=500, flush_interval=0.1, session_factory=self.SessionLocal,
+                       pump_driver=self.pump_driver, verbose=False)
+        options.update(kwargs)
+        return ControlRuntime(self.zones, **options)
+
+    def test_runs_tasks_and_persists_everything_on_stop(self):
+        """Test readings and pump switches are written and the queue is drained on shutdown"""
+        runtime = self.make_runtime()
+
+        stats = asyncio.run(runtime.run(duration=0.3))
+
+        self.assertGreaterEqual(stats['polls'], 5)
+        self.assertEqual(stats['pending_rows'], 0)
+        self.assertEqual(stats['readings_written'], stats['sensor_reads'])
+        self.assertEqual(self.test_session.query(SensorReading).count(), stats['readings_written'])
+        self.assertEqual(stats['pump_starts'], 1)
+        self.pump_driver.assert_called_once_with([(1, True)])
+        self.assertEqual(self.test_session.query(PumpLog).filter_by(zone_id=1, status="ON").count(), 1)
+
+    def test_fixed_rate_compensates_for_work_time(self):
+        """Test slow polls do not stretch the polling period"""
+        runtime = self.make_runtime(poll_interval=0.1, sensors=SimulatedDriver(latency=0.04))
+
+        stats = asyncio.run(runtime.run(duration=1.05))
+
+        # Drifting by 40 ms per poll would only fit 8 polls
+        self.assertGreaterEqual(stats['polls'], 10)
+        self.assertEqual(stats['missed_polls'], 0)
+
+    def test_overruns_skip_missed_polls(self):
+        """Test polls that overrun the period skip ticks instead of bursting"""
+        runtime = self.make_runtime(poll_interval=0.05, sensors=SimulatedDriver(latency=0.12))
+
+        stats = asyncio.run(runtime.run(duration=0.5))
+
+        self.assertGreater(stats['missed_polls'], 0)
+        self.assertLessEqual(stats['polls'], 6)
+
+    def test_sigterm_stops_gracefully(self):
+        """Test SIGTERM cancels the loop and still flushes queued rows"""
+        runtime = self.make_runtime(flush_interval=60)
+
+        async def run_and_signal():
+            asyncio.get_running_loop().call_later(0.2, os.kill, os.getpid(), signal.SIGTERM)
+            return await runtime.run()
+
+        stats = asyncio.run(run_and_signal())
+
+        self.assertGreater(stats['readings_written'], 0)
+        self.assertEqual(stats['pending_rows'], 0)
+        self.assertEqual(self.test_session.query(SensorReading).count(), stats['readings_written'])
+
+    def test_maintenance_runs_cleanup_off_the_loop(self):
+        """Test the maintenance task removes expired rows while polling continues"""
+        self.test_session.add(SensorReading(zone_id=1, moisture=40.0, ph=6.5,
+                                            timestamp=datetime.utcnow() - timedelta(days=90)))
+        self.test_session.commit()
+        runtime = self.make_runtime(cleanup_interval=0.1)
+
+        stats = asyncio.run(runtime.run(duration=0.35))
+
+        self.assertGreaterEqual(stats['cleanups'], 1)
+        self.assertGreaterEqual(stats['polls'], 5)
+        cutoff = datetime.utcnow() - timedelta(days=60)
+        self.assertEqual(self.test_session.query(SensorReading).filter(SensorReading.timestamp < cutoff).count(), 0)
+
+    def test_zones_polled_at_state_dependent_rates(self):
+        """Test a running pump is polled far more often than an idle zone"""
+        runtime = self.make_runtime(idle_interval=10, near_interval=1, active_interval=0.02)
+
+        stats = asyncio.run(runtime.run(duration=0.5))
+
+        reads = {1: 0, 2: 0}
+        for reading in self.test_session.query(SensorReading).all():
+            reads[reading.zone_id] += 1
+        # Zone 1's pump starts on the first tick; zone 2 stays idle after its first read
+        self.assertEqual(reads[2], 1)
+        self.assertGreater(reads[1], 10)
+        self.assertEqual(stats['sensor_reads'], reads[1] + reads[2])
+
+    def test_persists_through_background_writer(self):
+        """Test rows go through the writer's bounded queue and its counters are reported"""
+        writer = BackgroundWriter(max_queue_size=1000, flush_size=500, flush_interval=0.1,
+                                  session_factory=self.SessionLocal)
+        runtime = self.make_runtime(writer=writer)
+
+        stats = asyncio.run(runtime.run(duration=0.3))
+
+        self.assertIs(runtime.writer, writer)
+        self.assertEqual(stats['dropped'], 0)
+        switches = stats['pump_starts'] + stats['pump_stops']
+        # Every switch queues a pump log and a pump state checkpoint
+        self.assertEqual(stats['enqueued'], stats['sensor_reads'] + 2 * switches)
+        self.assertEqual(stats['readings_written'] + stats['pump_logs_written'] + stats['pump_states_written'],
+                         stats['enqueued'])
+        self.assertGreater(stats['max_queue_depth'], 0)
+
+    def test_budget_defers_pump_starts(self):
+        """Test a zone that wants water waits while the pump budget is used up"""
+        runtime = self.make_runtime(budget=WaterBudget(max_pumps=0))
+
+        stats = asyncio.run(runtime.run(duration=0.2))
+
+        self.assertEqual(stats['pump_starts'], 0)
+        self.assertGreater(stats['pumps_deferred'], 0)
+        self.assertEqual(stats['pumps_waiting'], 1)
+        self.pump_driver.assert_not_called()
+
+    def test_failed_pump_batch_is_retried(self):
+        """Test a rejected pump batch is retried and logged once it goes through"""
+        self.pump_driver.side_effect = [IOError("bus busy"), None]
+        runtime = self.make_runtime()
+        runtime.dispatcher.backoff = 0.05
+
+        stats = asyncio.run(runtime.run(duration=0.4))
+
+        self.assertEqual(self.pump_driver.call_count, 2)
+        self.assertEqual(stats['pump_failures'], 1)
+        self.assertEqual(stats['pump_batches'], 1)
+        self.assertEqual(stats['pending_pump_commands'], 0)
+        self.assertEqual(self.test_session.query(PumpLog).count(), 1)
+
+    def test_stalled_writer_does_not_block_the_loop(self):
+        """Test a full writer queue drops rows instead of freezing polling"""
+        stalled = threading.Event()
+
+        def stalled_session():
+            stalled.wait()
+            return self.SessionLocal()
+
+        writer = BackgroundWriter(max_queue_size=5, flush_size=500, flush_interval=0.1, put_timeout=1.0,
+                                  session_factory=stalled_session)
+        runtime = self.make_runtime(writer=writer)
+        # The database comes back only after the run ends, so shutdown can drain the queue
+        threading.Timer(0.5, stalled.set).start()
+
+        stats = asyncio.run(runtime.run(duration=0.3))
+
+        self.assertGreaterEqual(stats['polls'], 5)
+        self.assertGreater(stats['dropped'], 0)
+        # Readings and pump logs are tried once; a dropped pump state checkpoint is retried every tick
+        self.assertGreaterEqual(stats['enqueued'] + stats['dropped'], stats['sensor_reads'] + 2 * stats['pump_starts'])
+
+    def test_reads_through_gateway_driver(self):
+        """Test zones are read in batches through a TCP gateway driver"""
+        async def run_with_gateway():
+            gateway = await FakeGateway(seed=3).start()
+            try:
+                runtime = self.make_runtime(sensors=GatewayDriver('127.0.0.1', gateway.port))
+                return await runtime.run(duration=0.3), gateway.transactions
+            finally:
+                await gateway.stop()
+
+        stats, transactions = asyncio.run(run_with_gateway())
+
+        self.assertGreater(stats['sensor_reads'], 0)
+        self.assertEqual(stats['failed_reads'], 0)
+        # Each poll is one transaction; one more may have been cut short by shutdown
+        self.assertGreaterEqual(transactions, stats['polls'])
+        self.assertLessEqual(transactions, stats['polls'] + 1)
+        self.assertEqual(self.test_session.query(SensorReading).count(), stats['sensor_reads'])
+
+    def test_slow_driver_times_out_without_stalling_others(self):
+        """Test a driver that times out only costs its own zones their readings"""
+        slow = SimulatedDriver(latency=1.0, timeout=0.02)
+        runtime = self.make_runtime(sensors=SensorBus(SimulatedDriver(), routes={2: slow}))
+
+        stats = asyncio.run(runtime.run(duration=0.3))
+
+        zone_ids = {row[0] for row in self.test_session.query(SensorReading.zone_id).distinct()}
+        self.assertEqual(zone_ids, {1})
+        self.assertGreater(stats['sensor_timeouts'], 0)
+        self.assertEqual(stats['failed_reads'], stats['sensor_timeouts'])
+        self.assertGreaterEqual(stats['polls'], 5)
+
+    def test_checkpoints_pump_state_on_switch(self):
+        """Test a started pump is checkpointed with its start time"""
+        runtime = self.make_runtime()
+
+        stats = asyncio.run(runtime.run(duration=0.3))
+
+        self.assertEqual(stats['pump_states_written'], 1)
+        state = self.test_session.get(PumpState, 1)
+        self.assertTrue(state.pump_on)
+        self.assertIsNotNone(state.pump_start)
+        self.assertIsNone(self.test_session.get(PumpState, 2))
+
+    def test_warm_start_stops_pump_past_max_runtime(self):
+        """Test a pump left running before a restart is still stopped at its max runtime"""
+        started = datetime.utcnow() - timedelta(minutes=40)
+        self.test_session.add(ZoneModel(id=1, name="Zone 1", moisture_threshold=101))
+        self.test_session.add(PumpState(zone_id=1, pump_on=True, pump_start=started))
+        self.test_session.commit()
+        self.zones = load_zones(self.test_session)
+        self.assertEqual(self.zones[0].pump_start_time.timestamp(),
+                         started.replace(tzinfo=timezone.utc).timestamp())
+
+        runtime = self.make_runtime()
+        stats = asyncio.run(runtime.run(duration=0.3))
+
+        # Stopped once, and the fresh last watering time keeps it from restarting
+        self.pump_driver.assert_called_once_with([(1, False)])
+        self.assertEqual(stats['pump_starts'], 0)
+        self.test_session.expire_all()
+        self.assertFalse(self.test_session.get(PumpState, 1).pump_on)
+        self.assertGreater(self.test_session.get(ZoneModel, 1).last_watered, started)
+
+    def test_hot_reload_adds_updates_and_removes_zones(self):
+        """Test zones changed in the database are picked up while the runtime runs"""
+        self.test_session.add_all([
+            ZoneModel(id=1, name="Zone 1", moisture_threshold=101),
+            ZoneModel(id=2, name="Zone 2", moisture_threshold=0),
+        ])
+        self.test_session.commit()
+        watcher = ZoneWatcher(self.SessionLocal)
+        self.zones = watcher.load()
+        runtime = self.make_runtime(watcher=watcher, reload_interval=0.05)
+
+        def edit_zones():
+            with self.SessionLocal() as db_session:
+                db_session.add(ZoneModel(id=3, name="Zone 3", moisture_threshold=0))
+                db_session.get(ZoneModel, 2).moisture_threshold = 101
+                db_session.delete(db_session.get(ZoneModel, 1))
+                db_session.commit()
+
+        async def run_and_edit():
+            task = asyncio.create_task(runtime.run(duration=0.6))
+            await asyncio.sleep(0.2)
+            await asyncio.to_thread(edit_zones)
+            return await task
+
+        stats = asyncio.run(run_and_edit())
+
+        self.assertEqual((stats['zones_added'], stats['zones_updated'], stats['zones_removed']), (1, 1, 1))
+        self.assertEqual([zone.id for zone in runtime.zones], [2, 3])
+        self.assertEqual(runtime.table.moisture_threshold.tolist(), [101, 0])
+        # Zone 1's pump was switched off on removal, zone 2 started after its threshold was raised
+        self.pump_driver.assert_any_call([(1, True)])
+        self.pump_driver.assert_any_call([(1, False)])
+        self.pump_driver.assert_any_call([(2, True)])
+        self.assertGreater(self.test_session.query(SensorReading).filter_by(zone_id=3).count(), 0)
+        self.assertFalse(self.test_session.get(PumpState, 1).pump_on)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,105 @@
+import unittest
+import os
+import sys
+
+import numpy as np
+
+# Add the project root to the path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from smart_gardening.core.scheduler import PollScheduler
+from smart_gardening.core.zone_table import ZoneTable
+
+
+class TestPollScheduler(unittest.TestCase):
+    """Test cases for the per-zone poll scheduler"""
+
+    def setUp(self):
+        """Set up an idle, a near-threshold and a watering zone"""
+        self.table = ZoneTable(3, moisture_threshold=40)
+        self.table.update_readings([70.0, 42.0, 30.0], 6.5)
+        self.table.pump_on[2] = True
+        self.scheduler = PollScheduler(3, idle_interval=300, near_interval=30, active_interval=0.5, near_margin=5)
+
+    def test_intervals_follow_zone_state(self):
+        """Test running pumps poll fastest and zones far above threshold slowest"""
+        intervals = self.scheduler.intervals(self.table, np.arange(3))
+
+        self.assertEqual(intervals.tolist(), [300, 30, 0.5])
+
+    def test_pop_due_and_reschedule(self):
+        """Test zones come back due after their own interval"""
+        rows = self.scheduler.pop_due(0.0)
+        self.assertEqual(sorted(rows.tolist()), [0, 1, 2])
+        self.assertIsNone(self.scheduler.next_due())
+
+        self.scheduler.reschedule(self.table, rows, 0.01)
+
+        self.assertEqual(self.scheduler.next_due(), 0.5)
+        self.assertEqual(self.scheduler.pop_due(0.4).tolist(), [])
+        self.assertEqual(self.scheduler.pop_due(0.5).tolist(), [2])
+        self.assertEqual(self.scheduler.pop_due(30).tolist(), [1])
+        self.assertEqual(len(self.scheduler), 1)
+
+    def test_reschedule_does_not_drift(self):
+        """Test the next due time is based on the previous due time, not on when work finished"""
+        self.scheduler.reschedule(self.table, self.scheduler.pop_due(0.0), 0.2)
+
+        self.assertEqual(self.scheduler.due[2], 0.5)
+        self.assertEqual(self.scheduler.missed, 0)
+
+    def test_late_zones_skip_missed_reads(self):
+        """Test a zone more than one interval late is rescheduled from now"""
+        self.scheduler.reschedule(self.table, self.scheduler.pop_due(0.0), 2.0)
+
+        self.assertEqual(self.scheduler.due[2], 2.5)
+        self.assertEqual(self.scheduler.missed, 1)
+
+    def test_expedite_after_pump_start(self):
+        """Test a zone whose pump just started is polled at the active interval"""
+        self.scheduler.reschedule(self.table, self.scheduler.pop_due(0.0), 0.0)
+        self.assertEqual(self.scheduler.due[0], 300)
+
+        self.table.pump_on[0] = True
+        self.scheduler.expedite(self.table, [0], 10.0)
+
+        self.assertEqual(self.scheduler.due[0], 10.5)
+        self.assertIn(0, self.scheduler.pop_due(10.5).tolist())
+        # The superseded entry at t=300 is ignored
+        self.assertNotIn(0, self.scheduler.pop_due(300).tolist())
+
+    def test_resized_keeps_due_times(self):
+        """Test zones kept through a reload stay on schedule and new zones are due at once"""
+        self.scheduler.reschedule(self.table, self.scheduler.pop_due(0.0), 0.0)
+
+        # Row 1 was removed, rows 0 and 2 became 0 and 1, and a new zone is row 2
+        resized = self.scheduler.resized([0, 2], 3, start=5.0)
+
+        self.assertEqual(resized.due.tolist(), [300, 0.5, 5.0])
+        self.assertEqual(resized.pop_due(5.0).tolist(), [1, 2])
+        self.assertEqual(resized.next_due(), 300)
+
+    def test_reads_per_hour_drop(self):
+        """Test an hour of mostly idle zones needs far fewer reads than fixed 30 s polling"""
+        zones = 1000
+        table = ZoneTable(zones, moisture_threshold=40)
+        table.update_readings(np.full(zones, 70.0), 6.5)
+        table.pump_on[:2] = True
+        scheduler = PollScheduler(zones, idle_interval=300, near_interval=30, active_interval=0.5)
+
+        reads = 0
+        now = 0.0
+        while now < 3600:
+            rows = scheduler.pop_due(now)
+            reads += len(rows)
+            scheduler.reschedule(table, rows, now)
+            now = scheduler.next_due()
+
+        fixed_rate_reads = zones * 3600 // 30
+        self.assertLess(reads, fixed_rate_reads / 2)
+        # Watering zones still get sub-second feedback
+        self.assertGreaterEqual(reads, 2 * 3600 / 0.5)
+
+
+if __name__ == '__main__':
+    unittest.main()
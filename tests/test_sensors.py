@@ -1,13 +1,18 @@
 import unittest
+import asyncio
 import sys
 import os
 from unittest.mock import patch, MagicMock
 
+import numpy as np
+
 # Add the project root to the path
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from smart_gardening.sensors.moisture_sensor import MoistureSensor
 from smart_gardening.sensors.ph_sensor import PHSensor
+from smart_gardening.sensors.drivers import SensorBus, SimulatedDriver
+from smart_gardening.sensors.gateway import FakeGateway, GatewayDriver, GatewayError
 
 
 class TestMoistureSensor(unittest.TestCase):
@@ -225,5 +230,69 @@ class TestSensorIntegration(unittest.TestCase):
             self.assertIsInstance(reading, (int, float))
 
 
+class TestSensorDrivers(unittest.TestCase):
+    """Test cases for the async batch sensor drivers"""
+
+    def test_simulated_driver_reads_batch(self):
+        """Test one read_many call returns aligned moisture and pH arrays"""
+        driver = SimulatedDriver(seed=1)
+
+        moisture, ph = asyncio.run(driver.read_many(["A", "B", "C"]))
+
+        self.assertEqual(moisture.shape, (3,))
+        self.assertEqual(ph.shape, (3,))
+        self.assertTrue(np.all((moisture >= 20) & (moisture <= 80)))
+        self.assertTrue(np.all((ph >= 5.5) & (ph <= 7.5)))
+        self.assertEqual(driver.transactions, 1)
+
+    def test_bus_limits_concurrency_and_batch_size(self):
+        """Test the bus splits zones into batches and runs at most max_concurrency at once"""
+        async def read():
+            gateway = await FakeGateway(latency=0.05, seed=2).start()
+            try:
+                driver = GatewayDriver('127.0.0.1', gateway.port, max_concurrency=2, batch_size=10)
+                result = await SensorBus(driver).read(list(range(55)))
+                return result, gateway
+            finally:
+                await gateway.stop()
+
+        (moisture, ph), gateway = asyncio.run(read())
+
+        self.assertFalse(np.isnan(moisture).any())
+        self.assertFalse(np.isnan(ph).any())
+        self.assertEqual(gateway.transactions, 6)
+        self.assertEqual(gateway.max_in_flight, 2)
+
+    def test_bus_routes_zones_and_isolates_timeouts(self):
+        """Test zones on a timed-out driver come back NaN while others are read"""
+        slow = SimulatedDriver(latency=1.0, timeout=0.01)
+        bus = SensorBus(SimulatedDriver(), routes={"B": slow})
+
+        moisture, ph = asyncio.run(bus.read(["A", "B", "C"]))
+
+        self.assertEqual(np.isnan(moisture).tolist(), [False, True, False])
+        self.assertEqual(bus.stats()['timeouts'], 1)
+        self.assertEqual(bus.stats()['failed_reads'], 1)
+
+    def test_gateway_channel_errors_are_nan(self):
+        """Test channels the gateway reports as ERR are unread and bad requests raise"""
+        async def read():
+            gateway = await FakeGateway(failing_channels=["B"]).start()
+            try:
+                driver = GatewayDriver('127.0.0.1', gateway.port)
+                result = await driver.read_many(["A", "B"])
+                with self.assertRaises(GatewayError):
+                    await driver.read_many([])
+                return result
+            finally:
+                await gateway.stop()
+
+        moisture, ph = asyncio.run(read())
+
+        self.assertFalse(np.isnan(moisture[0]))
+        self.assertTrue(np.isnan(moisture[1]))
+        self.assertTrue(np.isnan(ph[1]))
+
+
 if __name__ == '__main__':
     unittest.main() 
\ No newline at end of file
@@ -1,13 +1,19 @@
 import unittest
 import sys
 import os
+import time
+from datetime import datetime, timedelta
 from unittest.mock import patch, MagicMock
 
+import numpy as np
+
 # Add the project root to the path
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from smart_gardening.simulator.simulator import SensorSimulator
+from smart_gardening.simulator.simulator import SensorSimulator, SoilModel
+from smart_gardening.core.clock import VirtualClock
 from smart_gardening.core.zone import Zone
+from smart_gardening.core.zone_table import ZoneTable
 
 
 class TestSensorSimulator(unittest.TestCase):
@@ -144,5 +150,173 @@ class TestSensorSimulator(unittest.TestCase):
             self.assertLessEqual(zone.ph, 14)
 
 
+class TestBatchSimulator(unittest.TestCase):
+    """Test cases for the NumPy batch mode of SensorSimulator"""
+
+    def test_simulate_fills_zone_table(self):
+        """Test simulate() fills a ZoneTable's arrays in place"""
+        table = ZoneTable(1000)
+        moisture = table.moisture
+        simulator = SensorSimulator(table, seed=1)
+
+        simulator.simulate()
+
+        self.assertIs(table.moisture, moisture)
+        self.assertTrue(((table.moisture >= 20) & (table.moisture <= 80)).all())
+        self.assertTrue(((table.ph >= 5.5) & (table.ph <= 7.5)).all())
+        self.assertTrue((table.moisture == table.moisture.round(2)).all())
+
+    def test_seed_is_reproducible(self):
+        """Test the same seed generates the same readings"""
+        first = SensorSimulator(ZoneTable(50), seed=42)
+        second = SensorSimulator(ZoneTable(50), seed=42)
+
+        first.simulate()
+        second.simulate()
+
+        self.assertEqual(first.zones.moisture.tolist(), second.zones.moisture.tolist())
+        self.assertEqual(first.zones.ph.tolist(), second.zones.ph.tolist())
+
+    def test_simulate_batch_returns_arrays(self):
+        """Test the batch mode returns arrays without touching Zone objects"""
+        zones = [Zone(id=1, moisture=45, ph=6.8)]
+        simulator = SensorSimulator(zones, seed=3)
+
+        moisture, ph = simulator.simulate_batch(size=200000)
+
+        self.assertEqual(moisture.shape, (200000,))
+        self.assertEqual(ph.shape, (200000,))
+        self.assertEqual(zones[0].moisture, 45)
+
+    def test_get_arrays_and_frame(self):
+        """Test readings can be fetched as columns or a DataFrame"""
+        zones = [
+            Zone(id=1, name="Zone 1", moisture=45, ph=6.8, pump_status="OFF"),
+            Zone(id=2, name="Zone 2", moisture=35, ph=7.2, pump_status=True),
+        ]
+        simulator = SensorSimulator(zones)
+
+        arrays = simulator.get_arrays()
+        self.assertEqual(arrays['moisture'].tolist(), [45.0, 35.0])
+        self.assertEqual(arrays['pump_status'].tolist(), [False, True])
+
+        frame = simulator.get_frame()
+        self.assertEqual(list(frame.columns), ['zone', 'moisture', 'ph', 'pump_status'])
+        self.assertEqual(frame['zone'].tolist(), ["Zone 1", "Zone 2"])
+
+        table_frame = SensorSimulator(ZoneTable.from_zones(zones)).get_frame()
+        self.assertEqual(table_frame['ph'].tolist(), [6.8, 7.2])
+
+
+class TestSoilModel(unittest.TestCase):
+    """Test cases for the stateful soil moisture model"""
+
+    def setUp(self):
+        """Set up a small table of zones"""
+        self.zones = [
+            Zone(id=1, name="Zone 1", moisture_threshold=40, moisture=60, ph=6.5, pump_status=False),
+            Zone(id=2, name="Zone 2", moisture_threshold=40, moisture=60, ph=6.0, pump_status=False),
+        ]
+        self.table = ZoneTable.from_zones(self.zones)
+        self.model = SoilModel(self.table, seed=7, sensor_noise=0.0)
+
+    def test_moisture_dries_without_pump(self):
+        """Test soil moisture decays through evaporation while pumps are off"""
+        self.model.step(6 * 3600)
+
+        self.assertLess(self.zones[0].moisture, 60)
+        self.assertAlmostEqual(self.zones[0].moisture, 60 * (1 - 0.02) ** 6, delta=0.5)
+
+    def test_moisture_reacts_to_start_and_stop_pump(self):
+        """Test a running pump raises moisture and stopping it lets the soil dry again"""
+        self.zones[0].start_pump()
+        self.model.step(10 * 60)
+        watered = self.zones[0].moisture
+
+        self.assertGreater(watered, 65)
+        self.assertLess(self.zones[1].moisture, 60)
+
+        self.zones[0].stop_pump()
+        self.model.step(3600)
+        self.assertLess(self.zones[0].moisture, watered)
+
+    def test_zero_rates_use_limiting_cases(self):
+        """Test zero evaporation gives linear inflow and zero pH reversion a plain random walk"""
+        model = SoilModel(self.table, seed=7, sensor_noise=0.0, evaporation_per_hour=0,
+                          inflow_per_minute=1.0, ph_reversion_per_hour=0, ph_volatility=0.01)
+        self.zones[0].start_pump()
+
+        with np.errstate(all='raise'):
+            model.step(10 * 60)
+
+        self.assertAlmostEqual(self.zones[0].moisture, 70.0, places=6)
+        self.assertEqual(self.zones[1].moisture, 60.0)
+        self.assertTrue(np.all(np.isfinite(self.table.ph)))
+
+        # Spread of the pH walk after one hour is the per-sqrt-hour volatility
+        ph = np.empty(5000)
+        for i in range(len(ph)):
+            model.soil_ph[:] = 6.5
+            model.step(3600)
+            ph[i] = model.soil_ph[1]
+        self.assertAlmostEqual(ph.std(), 0.01, delta=0.0005)
+
+    def test_moisture_stays_within_bounds(self):
+        """Test a pump left on saturates instead of exceeding 100%"""
+        self.table.pump_on[:] = True
+        self.model.step(24 * 3600)
+
+        self.assertTrue((self.table.moisture <= 100).all())
+
+    def test_ph_drifts_towards_water_ph_while_watering(self):
+        """Test irrigation pulls pH towards the water's pH"""
+        self.zones[1].start_pump()
+        self.model.step(24 * 3600)
+
+        self.assertGreater(self.zones[1].ph, 6.3)
+
+    def test_season_with_virtual_clock(self):
+        """Test a season for thousands of zones runs in seconds and keeps zones watered"""
+        table = ZoneTable(2000, moisture_threshold=40)
+        table.update_readings(50.0, 6.5)
+        model = SoilModel(table, seed=1)
+        clock = VirtualClock(datetime(2025, 4, 1))
+
+        started = time.perf_counter()
+        stats = model.run(clock, 30 * 86400, tick_seconds=600)
+        elapsed = time.perf_counter() - started
+
+        self.assertEqual(clock.now(), datetime(2025, 5, 1))
+        self.assertEqual(stats['ticks'], 30 * 144)
+        self.assertGreater(stats['pump_starts'], 0)
+        self.assertGreater(table.moisture.mean(), 30)
+        self.assertLess(elapsed, 10)
+
+
+class TestVirtualClock(unittest.TestCase):
+    """Test cases for the virtual clock"""
+
+    def test_sleep_advances_without_waiting(self):
+        """Test sleep() moves virtual time but returns immediately"""
+        clock = VirtualClock(datetime(2025, 1, 1))
+
+        started = time.perf_counter()
+        clock.sleep(3600)
+
+        self.assertLess(time.perf_counter() - started, 0.5)
+        self.assertEqual(clock.now(), datetime(2025, 1, 1, 1))
+        self.assertEqual(clock.time(), datetime(2025, 1, 1, 1).timestamp())
+
+    def test_speed_scales_real_wait(self):
+        """Test sleep() waits seconds / speed of real time"""
+        clock = VirtualClock(datetime(2025, 1, 1), speed=1000)
+
+        started = time.perf_counter()
+        clock.sleep(100)
+
+        self.assertGreaterEqual(time.perf_counter() - started, 0.09)
+        self.assertEqual(clock.now(), datetime(2025, 1, 1) + timedelta(seconds=100))
+
+
 if __name__ == '__main__':
     unittest.main() 
\ No newline at end of file
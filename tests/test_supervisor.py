@@ -0,0 +1,182 @@
+import unittest
+import os
+import signal
+import sys
+import tempfile
+import time
+
+# Add the project root to the path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from smart_gardening.core.zone import Zone
+from smart_gardening.db.database import Base, PumpLog, SensorReading, ZoneModel, create_db_engine
+from smart_gardening.supervisor import ShardSupervisor, partition_zones, shard_for, split_budget
+from sqlalchemy.orm import sessionmaker
+
+
+class TestShardPartitioning(unittest.TestCase):
+    """Test cases for hashing zones onto shards"""
+
+    def test_shard_for_is_stable(self):
+        """Test a zone id always maps to the same shard, whatever its type"""
+        self.assertEqual(shard_for(42, 4), shard_for("42", 4))
+        self.assertEqual(shard_for("A", 3), shard_for("A", 3))
+        self.assertTrue(all(0 <= shard_for(zone_id, 5) < 5 for zone_id in range(100)))
+
+    def test_partition_covers_every_zone_once(self):
+        """Test every zone lands in exactly one shard and the shards are balanced"""
+        zones = [Zone(id=i, name=f"Zone {i}") for i in range(400)]
+
+        partitions = partition_zones(zones, 4)
+
+        ids = sorted(zone.id for partition in partitions for zone in partition)
+        self.assertEqual(ids, list(range(400)))
+        for partition in partitions:
+            self.assertGreater(len(partition), 60)
+
+    def test_split_budget_never_exceeds_global_limits(self):
+        """Test the shards' pump and flow limits add up to at most the global ones"""
+        partitions = [[None] * 3, [None] * 5, [], [None] * 4]
+
+        budgets = split_budget(partitions, max_pumps=7, max_flow=65.0, flow_rate=10.0)
+
+        self.assertEqual(sum(budget.max_pumps for budget in budgets), 7)
+        self.assertEqual(budgets[2].max_pumps, 0)
+        flows = [budget.max_flow or 0.0 for budget in budgets]
+        self.assertLessEqual(sum(flows), 65.0)
+        self.assertTrue(all(flow % 10.0 == 0 for flow in flows))
+
+    def test_split_budget_warns_when_a_shard_gets_nothing(self):
+        """Test a global cap smaller than the number of shards is reported"""
+        with self.assertWarns(UserWarning):
+            budgets = split_budget([[None], [None], [None]], max_pumps=2)
+
+        self.assertEqual(sorted(budget.max_pumps for budget in budgets), [0, 1, 1])
+
+
+class TestShardSupervisor(unittest.TestCase):
+    """Test cases for the multi-process shard supervisor"""
+
+    def setUp(self):
+        """Set up a test database shared by the workers"""
+        self.temp_db = tempfile.NamedTemporaryFile(delete=False, suffix='.db')
+        self.db_path = self.temp_db.name
+        self.temp_db.close()
+        self.database_url = f'sqlite:///{self.db_path}'
+
+        self.engine = create_db_engine(self.database_url)
+        Base.metadata.create_all(self.engine)
+        self.test_session = sessionmaker(bind=self.engine)()
+        self.zones = [Zone(id=i, name=f"Zone {i}", moisture_threshold=0) for i in range(1, 9)]
+
+    def tearDown(self):
+        """Clean up test database"""
+        self.test_session.close()
+        self.engine.dispose()
+        for suffix in ('', '-wal', '-shm'):
+            if os.path.exists(self.db_path + suffix):
+                os.unlink(self.db_path + suffix)
+
+    def make_supervisor(self, **kwargs):
+        options = dict(shards=2, database_url=self.database_url, report_interval=0.1, restart_delay=0.1,
+                       runtime_options=dict(idle_interval=0.05, near_interval=0.05, active_interval=0.05,
+                                            flush_size=500, flush_interval=0.1, verbose=False))
+        options.update(kwargs)
+        return ShardSupervisor(self.zones, **options)
+
+    def test_workers_write_every_shard(self):
+        """Test each shard's worker polls its own zones and totals match the database"""
+        supervisor = self.make_supervisor()
+
+        stats = supervisor.run(duration=3.0, check_interval=0.1)
+
+        self.assertEqual(len(stats['shards']), 2)
+        for shard in stats['shards']:
+            self.assertGreater(shard['readings_written'], 0)
+            self.assertEqual(shard['restarts'], 0)
+            self.assertFalse(shard['alive'])
+        totals = stats['totals']
+        self.assertEqual(totals['readings_written'], totals['sensor_reads'])
+        self.assertEqual(self.test_session.query(SensorReading).count(), totals['readings_written'])
+        zone_ids = {row[0] for row in self.test_session.query(SensorReading.zone_id).distinct()}
+        self.assertEqual(zone_ids, {zone.id for zone in self.zones})
+
+    def test_pump_cap_is_global_across_shards(self):
+        """Test two shards together never run more pumps than MAX_CONCURRENT_PUMPS"""
+        for zone in self.zones:
+            zone.moisture_threshold = 101
+        supervisor = self.make_supervisor(max_pumps=3)
+
+        stats = supervisor.run(duration=3.0, check_interval=0.1)
+
+        self.assertEqual(len([shard for shard in stats['shards'] if shard['zones']]), 2)
+        # Every zone wants water and no pump reaches its maximum runtime
+        self.assertEqual(stats['totals']['pump_starts'], 3)
+        self.assertEqual(self.test_session.query(PumpLog).filter_by(status="ON").count(), 3)
+
+    def test_only_one_shard_runs_cleanup(self):
+        """Test retention cleanup is left to a single shard"""
+        supervisor = self.make_supervisor(shards=3)
+
+        intervals = [supervisor._shard_options(shard).get('cleanup_interval', 'default')
+                     for shard in range(3) if supervisor.partitions[shard]]
+
+        self.assertEqual(intervals.count(None), len(intervals) - 1)
+        self.assertIsNone(supervisor._shard_options((supervisor.maintenance_shard + 1) % 3)['cleanup_interval'])
+
+    def test_crashed_worker_is_restarted(self):
+        """Test a killed worker is restarted and its earlier counters are kept"""
+        supervisor = self.make_supervisor().start()
+        try:
+            # Workers are spawned, so wait for the first report instead of a fixed time
+            deadline = time.monotonic() + 10
+            while time.monotonic() < deadline and not supervisor.stats()['shards'][0]['sensor_reads']:
+                time.sleep(0.1)
+                supervisor.poll()
+            before = supervisor.stats()['shards'][0]['sensor_reads']
+            pid = supervisor.stats()['shards'][0]['pid']
+            os.kill(pid, signal.SIGKILL)
+
+            deadline = time.monotonic() + 10
+            while time.monotonic() < deadline:
+                time.sleep(0.1)
+                supervisor.poll()
+                shard = supervisor.stats()['shards'][0]
+                if shard['restarts'] and shard['alive'] and shard['last_report'] is not None:
+                    break
+        finally:
+            supervisor.stop()
+
+        shard = supervisor.stats()['shards'][0]
+        self.assertEqual(shard['restarts'], 1)
+        self.assertEqual(shard['last_exitcode'], 0)
+        self.assertNotEqual(shard['pid'], pid)
+        self.assertGreater(shard['sensor_reads'], before)
+
+    def test_reloading_workers_follow_the_database(self):
+        """Test workers load their zones from the database and pick up a zone added later"""
+        self.test_session.add_all(ZoneModel(id=zone.id, name=zone.name, moisture_threshold=0) for zone in self.zones)
+        self.test_session.commit()
+        self.zones = []
+        supervisor = self.make_supervisor(reload_interval=0.1).start()
+        try:
+            deadline = time.monotonic() + 10
+            while time.monotonic() < deadline and \
+                    self.test_session.query(SensorReading.zone_id).distinct().count() < 8:
+                time.sleep(0.1)
+            self.test_session.add(ZoneModel(id=9, name="Zone 9", moisture_threshold=0))
+            self.test_session.commit()
+
+            deadline = time.monotonic() + 10
+            while time.monotonic() < deadline and not self.test_session.query(SensorReading).filter_by(zone_id=9).count():
+                time.sleep(0.1)
+        finally:
+            supervisor.stop()
+
+        zone_ids = {row[0] for row in self.test_session.query(SensorReading.zone_id).distinct()}
+        self.assertEqual(zone_ids, set(range(1, 10)))
+        self.assertEqual(len([shard for shard in supervisor.stats()['shards'] if shard['pid']]), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,141 @@
+import unittest
+import tempfile
+import os
+import sys
+import threading
+import time
+from unittest.mock import patch
+
+# Add the project root to the path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from smart_gardening.db.database import Base, SensorReading, PumpLog
+from smart_gardening.db.writer import BackgroundWriter
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+
+class TestBackgroundWriter(unittest.TestCase):
+    """Test cases for the write-behind sensor/pump log buffer"""
+
+    def setUp(self):
+        """Set up test database"""
+        self.temp_db = tempfile.NamedTemporaryFile(delete=False, suffix='.db')
+        self.db_path = self.temp_db.name
+        self.temp_db.close()
+
+        self.engine = create_engine(f'sqlite:///{self.db_path}')
+        Base.metadata.create_all(self.engine)
+
+        self.SessionFactory = sessionmaker(autocommit=False, autoflush=False, bind=self.engine)
+        self.test_session = self.SessionFactory()
+
+    def tearDown(self):
+        """Clean up test database"""
+        self.test_session.close()
+        self.engine.dispose()
+        os.unlink(self.db_path)
+
+    def test_stop_drains_queue(self):
+        """Test stopping the writer persists everything that was enqueued"""
+        writer = BackgroundWriter(flush_size=1000, flush_interval=3600,
+                                  session_factory=self.SessionFactory).start()
+
+        for zone_id in range(1, 51):
+            writer.enqueue_reading(zone_id, 40.0, 6.5)
+        writer.enqueue_pump_log(1, "ON")
+        writer.enqueue_pump_log(1, "OFF")
+        writer.stop()
+
+        self.assertEqual(self.test_session.query(SensorReading).count(), 50)
+        self.assertEqual(self.test_session.query(PumpLog).count(), 2)
+
+        stats = writer.stats()
+        self.assertEqual(stats['readings_written'], 50)
+        self.assertEqual(stats['pump_logs_written'], 2)
+        self.assertEqual(stats['flushes'], 1)
+        self.assertEqual(stats['queue_depth'], 0)
+
+    def test_flushes_in_batches_of_flush_size(self):
+        """Test a full batch is written without waiting for the interval"""
+        writer = BackgroundWriter(flush_size=10, flush_interval=3600,
+                                  session_factory=self.SessionFactory).start()
+
+        for zone_id in range(1, 26):
+            writer.enqueue_reading(zone_id, 40.0, 6.5)
+        writer.stop()
+
+        stats = writer.stats()
+        self.assertEqual(stats['flushes'], 3)
+        self.assertEqual(stats['readings_written'], 25)
+        self.assertGreater(stats['max_flush_latency'], 0.0)
+        self.assertGreaterEqual(stats['max_flush_latency'], stats['avg_flush_latency'])
+
+    def test_first_row_after_idle_waits_for_the_interval(self):
+        """Test a tick arriving after an idle period is written in one flush, not two"""
+        writer = BackgroundWriter(flush_size=1000, flush_interval=0.2,
+                                  session_factory=self.SessionFactory).start()
+        time.sleep(0.4)
+
+        for zone_id in range(1, 4):
+            writer.enqueue_reading(zone_id, 40.0, 6.5)
+            time.sleep(0.01)
+        time.sleep(0.4)
+        flushes = writer.stats()['flushes']
+        writer.stop()
+
+        self.assertEqual(flushes, 1)
+        self.assertEqual(writer.stats()['readings_written'], 3)
+
+    def test_back_pressure_drops_when_full(self):
+        """Test enqueue gives up after put_timeout when the queue stays full"""
+        writer = BackgroundWriter(max_queue_size=2, put_timeout=0.01,
+                                  session_factory=self.SessionFactory)
+
+        self.assertTrue(writer.enqueue_reading(1, 40.0, 6.5))
+        self.assertTrue(writer.enqueue_reading(2, 40.0, 6.5))
+        self.assertFalse(writer.enqueue_reading(3, 40.0, 6.5))
+
+        stats = writer.stats()
+        self.assertEqual(stats['enqueued'], 2)
+        self.assertEqual(stats['dropped'], 1)
+        self.assertEqual(stats['queue_depth'], 2)
+        self.assertEqual(stats['max_queue_depth'], 2)
+
+        writer.start()
+        writer.stop()
+        self.assertEqual(self.test_session.query(SensorReading).count(), 2)
+
+    def test_enqueue_does_not_wait_for_commit(self):
+        """Test producers return immediately while a flush is blocked on the database"""
+        release = threading.Event()
+
+        def slow_record_batch(readings, pump_logs, db_session=None, flush_size=None, pump_states=()):
+            release.wait(5)
+            return len(readings), len(pump_logs), len(pump_states)
+
+        with patch('smart_gardening.db.writer.record_batch', side_effect=slow_record_batch):
+            writer = BackgroundWriter(flush_size=1, flush_interval=3600,
+                                      session_factory=self.SessionFactory).start()
+            writer.enqueue_reading(1, 40.0, 6.5)
+            for zone_id in range(2, 6):
+                self.assertTrue(writer.enqueue_reading(zone_id, 40.0, 6.5))
+            release.set()
+            writer.stop()
+
+        self.assertEqual(writer.stats()['readings_written'], 5)
+
+    def test_failed_flush_is_counted(self):
+        """Test a batch the database rejects is reported as a failed flush"""
+        writer = BackgroundWriter(flush_size=10, flush_interval=3600,
+                                  session_factory=self.SessionFactory).start()
+        writer.enqueue_reading(None, 40.0, 6.5)
+        writer.stop()
+
+        stats = writer.stats()
+        self.assertEqual(stats['failed_flushes'], 1)
+        self.assertEqual(stats['readings_written'], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,108 @@
+import unittest
+import os
+import sys
+from datetime import datetime, timedelta
+
+import numpy as np
+
+# Add the project root to the path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from smart_gardening.core.zone import Zone
+from smart_gardening.core.zone_table import ZoneTable
+
+
+class TestZoneTable(unittest.TestCase):
+    """Test cases for the vectorized zone table"""
+
+    def setUp(self):
+        """Set up zones covering each automation branch"""
+        self.now = datetime(2025, 6, 1, 12, 0, 0)
+        self.zones = [
+            Zone(id=1, name="Dry", moisture_threshold=40, moisture=25, ph=6.5, pump_status=False),
+            Zone(id=2, name="Wet", moisture_threshold=40, moisture=60, ph=8.0, pump_status=False),
+            Zone(id=3, name="Recently watered", moisture_threshold=40, moisture=25, ph=5.0, pump_status=False),
+            Zone(id=4, name="Running long", moisture_threshold=40, moisture=25, ph=6.5, pump_status=True),
+            Zone(id=5, name="Running, now wet", moisture_threshold=40, moisture=45, ph=6.5, pump_status=True),
+        ]
+        self.zones[2].last_watering_time = self.now - timedelta(hours=1)
+        self.zones[3].pump_start_time = self.now - timedelta(minutes=35)
+        self.zones[4].pump_start_time = self.now - timedelta(minutes=5)
+
+    def test_masks_match_zone_methods(self):
+        """Test vectorized masks agree with the per-zone methods"""
+        expected_activate = [not z.pump_status and z.needs_watering() and z.last_watering_time is None
+                             for z in self.zones]
+        expected_ph_alarm = [z.ph_out_of_range() for z in self.zones]
+
+        table = ZoneTable.from_zones(self.zones)
+
+        self.assertEqual(table.activate_mask(self.now).tolist(), expected_activate)
+        self.assertEqual(table.deactivate_mask(self.now).tolist(), [False, False, False, True, True])
+        self.assertEqual(table.ph_out_of_range().tolist(), expected_ph_alarm)
+
+    def test_zone_is_view_over_row(self):
+        """Test reads and writes through a bound zone hit the table arrays"""
+        table = ZoneTable.from_zones(self.zones)
+        zone = self.zones[1]
+
+        zone.moisture = 12.5
+        self.assertEqual(table.moisture[1], 12.5)
+
+        table.ph[1] = 7.1
+        self.assertEqual(zone.ph, 7.1)
+        self.assertIs(zone.table, table)
+        self.assertEqual(zone.ph_range, (6.0, 7.5))
+        self.assertEqual(self.zones[3].pump_start_time, self.now - timedelta(minutes=35))
+
+    def test_start_and_stop_pumps(self):
+        """Test pumps switch state with one shared timestamp"""
+        table = ZoneTable.from_zones(self.zones)
+
+        to_stop = table.deactivate_mask(self.now)
+        to_start = table.activate_mask(self.now)
+        table.stop_pumps(to_stop, self.now)
+        table.start_pumps(to_start, self.now)
+
+        self.assertEqual(table.pump_on.tolist(), [True, False, False, False, False])
+        self.assertEqual(self.zones[0].pump_start_time, self.now)
+        self.assertEqual(self.zones[3].last_watering_time, self.now)
+        self.assertIsNone(self.zones[3].pump_start_time)
+
+    def test_zone_methods_work_when_bound(self):
+        """Test the scalar Zone API keeps working on a bound zone"""
+        table = ZoneTable.from_zones(self.zones)
+        zone = self.zones[0]
+
+        self.assertTrue(zone.should_activate_pump())
+        zone.start_pump()
+        self.assertTrue(table.pump_on[0])
+        zone.moisture = 50
+        self.assertTrue(zone.should_deactivate_pump())
+        zone.stop_pump()
+        self.assertFalse(table.pump_on[0])
+        self.assertFalse(np.isnan(table.last_watered[0]))
+
+    def test_string_pump_status_and_missing_readings(self):
+        """Test "ON"/"OFF" statuses convert and missing readings never trigger pumps"""
+        table = ZoneTable.from_zones([Zone(id=1, pump_status="OFF", moisture=None, ph=None),
+                                      Zone(id=2, pump_status="ON")])
+
+        self.assertEqual(table.pump_on.tolist(), [False, True])
+        self.assertFalse(table.activate_mask(self.now)[0])
+        self.assertFalse(table.ph_out_of_range()[0])
+        self.assertIsNone(table.zone(0).moisture)
+
+    def test_large_table(self):
+        """Test a table built directly from arrays evaluates every zone at once"""
+        table = ZoneTable(100000, moisture_threshold=40)
+        table.update_readings(np.linspace(0, 100, 100000), np.full(100000, 6.5))
+
+        mask = table.activate_mask(self.now)
+
+        self.assertEqual(int(mask.sum()), int((table.moisture < 40).sum()))
+        self.assertEqual(table.zone(5).moisture, table.moisture[5])
+
+
+if __name__ == '__main__':
+    unittest.main()